@@ -0,0 +1,234 @@
+"""Benchmark the write stage of render output write profiles.
+
+Run from the Silhouette Python console to compare the write throughput of
+the Create Render write profiles of the project settings on a local disk:
+
+    from ayon_silhouette.api import benchmark
+    benchmark.benchmark_write_profiles(fx.activeNode())
+
+The Output node is rendered once into a local cache. Each profile then
+writes the cached frames with a copy of the Output node that reads them
+through a Source node, so the node graph upstream of the Output node is
+not processed again and the timings measure the writing of the frames.
+
+"""
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import clique
+import fx
+from tools.renderer import Renderer
+from tools.progress import CommandLineProgress
+
+from ayon_core.pipeline import get_current_project_name
+from ayon_core.settings import get_project_settings
+
+from . import lib, render
+
+log = logging.getLogger(__name__)
+
+
+def _get_directory_size(directory: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(directory):
+        for filename in files:
+            total += os.path.getsize(os.path.join(root, filename))
+    return total
+
+
+def get_write_profiles(
+    project_name: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Return the Output node properties of the render write profiles.
+
+    The profiles are read from the Create Render write profiles settings
+    and named by their position and filters.
+
+    Arguments:
+        project_name (Optional[str]): Project to read the settings of.
+            Defaults to the current project.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Property values per profile name.
+
+    """
+    if project_name is None:
+        project_name = get_current_project_name()
+    settings = get_project_settings(project_name)
+    profiles = (
+        settings["silhouette"]["create"]["CreateRender"]["write_profiles"]
+    )
+    write_profiles = {}
+    for index, profile in enumerate(profiles, start=1):
+        filters = [
+            value
+            for key in (
+                "product_types", "product_names", "task_types", "task_names"
+            )
+            for value in profile[key]
+        ]
+        name = f"{index:02d}_{'_'.join(filters) or 'any'}"
+        write_profiles[name] = lib.get_write_profile_properties(profile)
+    return write_profiles
+
+
+def _render(session: fx.Session, node: fx.Node) -> float:
+    """Render a node and return the duration in seconds."""
+    start = time.perf_counter()
+    finished = Renderer().render(
+        {"session": session, "nodes": [node]},
+        progress=CommandLineProgress()
+    )
+    seconds = time.perf_counter() - start
+    if not finished:
+        raise RuntimeError(f"Render of {node.label} was interrupted.")
+    return seconds
+
+
+def _get_sequence_path(directory: str) -> str:
+    """Return the `head[start-end]tail` path of the frames in a folder."""
+    collections, remainder = clique.assemble(
+        os.listdir(directory), patterns=[clique.PATTERNS["frames"]])
+    if collections:
+        collection = collections[0]
+        frames = list(collection.indexes)
+        start = str(frames[0]).zfill(collection.padding)
+        end = str(frames[-1]).zfill(collection.padding)
+        filename = collection.format(f"{{head}}[{start}-{end}]{{tail}}")
+    elif remainder:
+        filename = remainder[0]
+    else:
+        raise RuntimeError(f"No frames rendered in: {directory}")
+    return os.path.join(directory, filename)
+
+
+@contextlib.contextmanager
+def _cached_source_node(
+    session: fx.Session,
+    path: str
+) -> Iterator[fx.Node]:
+    """Temporarily add a Source node reading `path` to the session."""
+    project = fx.activeProject()
+    source = fx.Source(path)
+    project.addItem(source)
+    node = fx.Node("SourceNode")
+    session.addNode(node)
+    try:
+        node.property("source").value = source
+        yield node
+    finally:
+        session.removeNode(node)
+        project.removeItem(source)
+
+
+@contextlib.contextmanager
+def _write_node(
+    session: fx.Session,
+    output_node: fx.Node,
+    source_node: fx.Node
+) -> Iterator[fx.Node]:
+    """Temporarily add a copy of the Output node writing the source."""
+    node = output_node.clone()
+    session.addNode(node)
+    try:
+        primary_input = node.primaryInput
+        allowed_types = set(primary_input.dataTypes)
+        for output in source_node.outputs:
+            if allowed_types.intersection(output.dataTypes):
+                output.connect(primary_input)
+                break
+        else:
+            raise RuntimeError(
+                f"Unable to connect {source_node.label} to {node.label}.")
+        yield node
+    finally:
+        session.removeNode(node)
+
+
+def benchmark_write_profiles(
+    output_node: fx.Node,
+    profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+    directory: Optional[str] = None,
+    session: Optional[fx.Session] = None,
+    keep_files: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """Measure the write throughput of the Output node per write profile.
+
+    The Output node's render range is rendered once with its current
+    settings into a cache folder, which is not timed. Each profile then
+    writes the cached frames into its own folder. All added nodes and
+    sources are removed afterwards and the Output node is left unchanged.
+
+    Arguments:
+        output_node (fx.Node): The Output node to benchmark.
+        profiles (Optional[Dict[str, Dict[str, Any]]]): Property values per
+            profile name, as set by `lib.set_node_properties`. Defaults to
+            the write profiles of the project settings, see
+            `get_write_profiles`.
+        directory (Optional[str]): Local directory to render into. Defaults
+            to a new temporary directory.
+        session (Optional[fx.Session]): Session of the Output node.
+            Defaults to the active session.
+        keep_files (bool): Keep the rendered files instead of removing them.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per profile the write `seconds`,
+            written `bytes`, number of `files` and throughput in `mb_per_s`.
+
+    """
+    if profiles is None:
+        profiles = get_write_profiles()
+    if not profiles:
+        raise ValueError("No write profiles to benchmark.")
+    if session is None:
+        session = fx.activeSession()
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="ayon_silhouette_benchmark_")
+
+    cache_dir = os.path.join(directory, "_cache")
+    with render.render_path_override(output_node, cache_dir):
+        seconds = _render(session, output_node)
+    log.info(f"Rendered the frames to write in {seconds:.2f}s")
+
+    results = {}
+    try:
+        with lib.undo_chunk("Benchmark write profiles"), \
+                _cached_source_node(
+                    session, _get_sequence_path(cache_dir)) as source_node:
+            for name, properties in profiles.items():
+                profile_dir = os.path.join(directory, name)
+                with _write_node(
+                    session, output_node, source_node
+                ) as write_node:
+                    lib.set_node_properties(write_node, properties)
+                    with render.render_path_override(
+                        write_node, profile_dir
+                    ):
+                        seconds = _render(session, write_node)
+
+                size = _get_directory_size(profile_dir)
+                results[name] = {
+                    "seconds": seconds,
+                    "bytes": size,
+                    "files": len(os.listdir(profile_dir)),
+                    "mb_per_s": (
+                        size / (1024 ** 2) / seconds if seconds else 0.0
+                    ),
+                }
+                log.info(
+                    f"Profile '{name}': {results[name]['files']} files, "
+                    f"{size / (1024 ** 2):.1f} MB in {seconds:.2f}s "
+                    f"({results[name]['mb_per_s']:.1f} MB/s)"
+                )
+                if not keep_files:
+                    shutil.rmtree(profile_dir, ignore_errors=True)
+    finally:
+        if not keep_files:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return results
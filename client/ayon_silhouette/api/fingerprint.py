@@ -0,0 +1,148 @@
+"""Content fingerprints of Silhouette objects.
+
+A fingerprint is a hash of the data that ends up in an export, so that an
+unchanged export can be detected without exporting it again.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+import fx
+
+from . import lib
+
+FINGERPRINT_ALGORITHM = "blake2b"
+FINGERPRINT_VERSION = 2
+
+
+def _new_hash():
+    return hashlib.new(FINGERPRINT_ALGORITHM, digest_size=16)
+
+
+def _format_number(value) -> str:
+    # Fixed precision so that float noise below the precision of the
+    # exported files does not change the fingerprint
+    return f"{float(value):.6f}"
+
+
+def _format_value(value) -> str:
+    """Return a stable text for a single property value."""
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return _format_number(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    if hasattr(value, "x") and hasattr(value, "y"):
+        coordinates = [value.x, value.y]
+        if hasattr(value, "z"):
+            coordinates.append(value.z)
+        return "({})".format(",".join(map(_format_number, coordinates)))
+    if all(hasattr(value, attr) for attr in ("r", "g", "b")):
+        channels = [value.r, value.g, value.b]
+        if hasattr(value, "a"):
+            channels.append(value.a)
+        return "({})".format(",".join(map(_format_number, channels)))
+    return f"{type(value).__name__}:{value}"
+
+
+def _update_value(hasher, value):
+    if isinstance(value, (list, tuple)):
+        hasher.update(b"[")
+        for item in value:
+            _update_value(hasher, item)
+        hasher.update(b"]")
+        return
+
+    points = getattr(value, "points", None)
+    if points is not None:
+        hasher.update(
+            f"path:{_format_value(bool(value.closed))}:"
+            f"{_format_value(value.type)}".encode("utf-8"))
+        _update_value(hasher, list(points))
+        return
+
+    hasher.update(_format_value(value).encode("utf-8"))
+    hasher.update(b";")
+
+
+def _update_object(hasher, obj: fx.Object, include_ids: bool = True):
+    header = f"{obj.type}|{obj.label}"
+    if include_ids:
+        header = f"{obj.id}|{header}"
+    hasher.update(f"{header}\n".encode("utf-8"))
+    properties = obj.properties
+    if isinstance(properties, dict):
+        properties = properties.values()
+    for prop in sorted(properties, key=lambda p: p.id):
+        if not include_ids and prop.id == "objects":
+            # Child objects of layers are referenced by their ids
+            continue
+        hasher.update(f"{prop.id}=".encode("utf-8"))
+        if prop.constant:
+            _update_value(hasher, prop.value)
+        else:
+            for frame, value in lib.iter_property_keyframes(prop):
+                hasher.update(
+                    f"@{_format_number(frame)}:".encode("utf-8"))
+                _update_value(hasher, value)
+        hasher.update(b"\n")
+
+
+def get_objects_fingerprint(
+    objects: Iterable[fx.Object],
+    session: Optional[fx.Session] = None,
+    settings: Optional[Dict[str, Any]] = None
+) -> str:
+    """Return a fingerprint of the exported objects and export settings.
+
+    The fingerprint includes the objects' ids, labels, and the constant
+    values or keyframes of all their properties. The session's resolution
+    and frame range are included when `session` is provided, since the
+    exported files depend on them.
+
+    Arguments:
+        objects (Iterable[fx.Object]): The objects to export.
+        session (Optional[fx.Session]): The session of the objects.
+        settings (Optional[Dict[str, Any]]): JSON serializable export
+            settings and any other inputs that affect the exported files,
+            like the frame range.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+
+    """
+    hasher = _new_hash()
+    hasher.update(f"v{FINGERPRINT_VERSION}\n".encode())
+    if session is not None:
+        hasher.update(
+            f"{session.width}x{session.height}|"
+            f"{_format_value(session.pixelAspect)}|"
+            f"{_format_value(session.frameRate)}|"
+            f"{_format_value(session.startFrame)}|"
+            f"{','.join(map(_format_value, session.workRange))}\n".encode()
+        )
+    if settings:
+        hasher.update(
+            json.dumps(settings, sort_keys=True, default=str).encode())
+
+    for obj in sorted(objects, key=lambda o: o.id):
+        _update_object(hasher, obj)
+    return hasher.hexdigest()
+
+
+def get_object_fingerprint(obj: fx.Object) -> str:
+    """Return a fingerprint of the object's own content.
+
+    Unlike `get_objects_fingerprint` this excludes the object's id and child
+    objects, so that the same object imported from different files compares
+    equal if its content is the same.
+    """
+    hasher = _new_hash()
+    hasher.update(f"v{FINGERPRINT_VERSION}\n".encode())
+    _update_object(hasher, obj, include_ids=False)
+    return hasher.hexdigest()
@@ -0,0 +1,329 @@
+"""Minimal image header readers for rendered and loaded media.
+
+These readers only read the few header bytes needed to identify the file
+format, its data window and whether the file was written completely. They
+do not depend on Silhouette and avoid spawning external processes.
+"""
+import os
+import struct
+from typing import Any, BinaryIO, Dict, List, Optional
+
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+PNG_IEND = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+DPX_MAGIC_BIG_ENDIAN = b"SDPX"
+DPX_MAGIC_LITTLE_ENDIAN = b"XPDS"
+
+# EXR version field flags
+EXR_FLAG_TILED = 0x200
+EXR_FLAG_LONG_NAMES = 0x400
+EXR_FLAG_NON_IMAGE = 0x800
+EXR_FLAG_MULTIPART = 0x1000
+
+# Number of scanlines stored per chunk for each EXR compression
+EXR_SCANLINES_PER_CHUNK = {
+    0: 1,    # NONE
+    1: 1,    # RLE
+    2: 1,    # ZIPS
+    3: 16,   # ZIP
+    4: 32,   # PIZ
+    5: 16,   # PXR24
+    6: 32,   # B44
+    7: 32,   # B44A
+    8: 32,   # DWAA
+    9: 256,  # DWAB
+}
+
+
+class ImageHeaderError(ValueError):
+    """Raised when an image header is invalid or the file is incomplete."""
+
+
+class _Reader:
+    """Small helper to read little-endian values from a binary stream."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+
+    def read(self, size: int) -> bytes:
+        data = self.f.read(size)
+        if len(data) != size:
+            raise ImageHeaderError("Unexpected end of file in header.")
+        return data
+
+    def read_null_terminated(self, max_length: int = 256) -> bytes:
+        chars = bytearray()
+        while True:
+            char = self.read(1)
+            if char == b"\x00":
+                return bytes(chars)
+            chars += char
+            if len(chars) > max_length:
+                raise ImageHeaderError("Header string exceeds max length.")
+
+    def read_int32(self) -> int:
+        return struct.unpack("<i", self.read(4))[0]
+
+
+def _parse_exr_chlist(value: bytes) -> List[str]:
+    """Return channel names from an EXR `chlist` attribute value."""
+    channels = []
+    position = 0
+    while position < len(value) and value[position] != 0:
+        end = value.index(b"\x00", position)
+        channels.append(value[position:end].decode("utf-8", "replace"))
+        # Skip name terminator, pixel type, pLinear, reserved and sampling
+        position = end + 1 + 16
+    return channels
+
+
+def _parse_exr_attribute(attr_type: bytes, value: bytes) -> Any:
+    if attr_type == b"box2i":
+        return list(struct.unpack("<4i", value))
+    if attr_type == b"compression":
+        return value[0]
+    if attr_type == b"chlist":
+        return _parse_exr_chlist(value)
+    if attr_type == b"string":
+        return value.decode("utf-8", "replace")
+    if attr_type == b"stringvector":
+        strings = []
+        position = 0
+        while position + 4 <= len(value):
+            length = struct.unpack_from("<i", value, position)[0]
+            position += 4
+            strings.append(
+                value[position:position + length].decode("utf-8", "replace"))
+            position += length
+        return strings
+    if attr_type == b"int":
+        return struct.unpack("<i", value)[0]
+    return None
+
+
+# Only these attributes are decoded, all others are skipped
+_EXR_ATTRIBUTES = {
+    "channels",
+    "chunkCount",
+    "compression",
+    "dataWindow",
+    "displayWindow",
+    "multiView",
+    "name",
+    "type",
+    "view",
+}
+
+
+def _read_exr_part_header(reader: _Reader) -> Optional[Dict[str, Any]]:
+    """Read one EXR header, returns None on the end of headers marker."""
+    header: Dict[str, Any] = {}
+    while True:
+        name = reader.read_null_terminated()
+        if not name:
+            return header or None
+        attr_type = reader.read_null_terminated()
+        size = reader.read_int32()
+        if size < 0:
+            raise ImageHeaderError("Invalid EXR attribute size.")
+        key = name.decode("utf-8", "replace")
+        if key in _EXR_ATTRIBUTES:
+            header[key] = _parse_exr_attribute(attr_type, reader.read(size))
+        else:
+            reader.f.seek(size, os.SEEK_CUR)
+
+
+def _get_exr_chunk_count(header: Dict[str, Any], flags: int) -> Optional[int]:
+    """Return number of chunks for an EXR part if it can be determined."""
+    if "chunkCount" in header:
+        return header["chunkCount"]
+    if flags & EXR_FLAG_TILED:
+        # Tiled images require the tile description and level mode to
+        # compute the chunk count, which is not supported
+        return None
+    lines_per_chunk = EXR_SCANLINES_PER_CHUNK.get(header.get("compression"))
+    data_window = header.get("dataWindow")
+    if lines_per_chunk is None or data_window is None:
+        return None
+    height = data_window[3] - data_window[1] + 1
+    return -(-height // lines_per_chunk)  # ceil division
+
+
+def read_exr_header(path: str, check_complete: bool = True) -> Dict[str, Any]:
+    """Read the header(s) of an OpenEXR file.
+
+    Arguments:
+        path (str): Path to the EXR file.
+        check_complete (bool): When enabled, validate the chunk offset
+            tables and the last chunk to detect incomplete or truncated
+            files.
+
+    Returns:
+        Dict[str, Any]: Format information with the data window of the
+            first part as `dataWindow` and all parts' headers as `parts`.
+
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        reader = _Reader(f)
+        if reader.read(4) != EXR_MAGIC:
+            raise ImageHeaderError("Not an OpenEXR file.")
+        version_field = reader.read_int32()
+        flags = version_field & ~0xff
+        multipart = bool(flags & EXR_FLAG_MULTIPART)
+
+        parts = []
+        while True:
+            header = _read_exr_part_header(reader)
+            if header is None:
+                break
+            parts.append(header)
+            if not multipart:
+                # Single part files have no end of headers marker
+                break
+        if not parts:
+            raise ImageHeaderError("EXR file has no headers.")
+
+        if check_complete and not flags & EXR_FLAG_NON_IMAGE:
+            _check_exr_complete(reader, parts, flags, multipart, file_size)
+
+    return {
+        "format": "exr",
+        "dataWindow": parts[0].get("dataWindow"),
+        "multipart": multipart,
+        "parts": parts,
+    }
+
+
+def _check_exr_complete(
+    reader: _Reader,
+    parts: List[Dict[str, Any]],
+    flags: int,
+    multipart: bool,
+    file_size: int
+):
+    """Validate EXR offset tables point to chunks that are fully written."""
+    offsets = []
+    for header in parts:
+        chunk_count = _get_exr_chunk_count(header, flags)
+        if chunk_count is None:
+            # Unable to locate the following offset tables reliably
+            return
+        offsets.extend(
+            struct.unpack(f"<{chunk_count}Q", reader.read(8 * chunk_count))
+        )
+
+    if not offsets:
+        return
+    if min(offsets) == 0:
+        raise ImageHeaderError(
+            "EXR offset table is incomplete, file was not fully written.")
+    last_offset = max(offsets)
+    if last_offset >= file_size:
+        raise ImageHeaderError("EXR is truncated, chunk offset beyond EOF.")
+
+    if flags & EXR_FLAG_TILED or any(
+        header.get("type", "scanlineimage") != "scanlineimage"
+        for header in parts
+    ):
+        # Tiled and deep chunks have different chunk headers, so only the
+        # offsets are checked
+        return
+
+    # Scanline chunk: [part number] + y coordinate + packed data size + data
+    reader.f.seek(last_offset)
+    if multipart:
+        reader.read_int32()
+    reader.read_int32()
+    data_size = reader.read_int32()
+    if reader.f.tell() + data_size > file_size:
+        raise ImageHeaderError("EXR is truncated, last chunk is incomplete.")
+
+
+def read_png_header(path: str, check_complete: bool = True) -> Dict[str, Any]:
+    """Read the header of a PNG file."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+        if len(header) < 24 or header[:8] != PNG_MAGIC:
+            raise ImageHeaderError("Not a PNG file.")
+        if header[12:16] != b"IHDR":
+            raise ImageHeaderError("PNG is missing IHDR chunk.")
+        width, height = struct.unpack(">II", header[16:24])
+        if check_complete:
+            f.seek(-len(PNG_IEND), os.SEEK_END)
+            if f.read(len(PNG_IEND)) != PNG_IEND:
+                raise ImageHeaderError("PNG is truncated, missing IEND.")
+
+    return {
+        "format": "png",
+        "dataWindow": [0, 0, width - 1, height - 1],
+    }
+
+
+def read_dpx_header(path: str, check_complete: bool = True) -> Dict[str, Any]:
+    """Read the header of a DPX file."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.read(780)
+    if len(header) < 780:
+        raise ImageHeaderError("DPX header is truncated.")
+    magic = header[:4]
+    if magic == DPX_MAGIC_BIG_ENDIAN:
+        endian = ">"
+    elif magic == DPX_MAGIC_LITTLE_ENDIAN:
+        endian = "<"
+    else:
+        raise ImageHeaderError("Not a DPX file.")
+
+    image_offset = struct.unpack_from(f"{endian}I", header, 4)[0]
+    total_size = struct.unpack_from(f"{endian}I", header, 16)[0]
+    width, height = struct.unpack_from(f"{endian}II", header, 772)
+    if check_complete:
+        if image_offset >= file_size:
+            raise ImageHeaderError("DPX is truncated, no image data.")
+        if total_size and file_size < total_size:
+            raise ImageHeaderError(
+                f"DPX is truncated, {file_size} of {total_size} bytes.")
+
+    return {
+        "format": "dpx",
+        "dataWindow": [0, 0, width - 1, height - 1],
+    }
+
+
+HEADER_READERS = {
+    ".exr": read_exr_header,
+    ".sxr": read_exr_header,
+    ".png": read_png_header,
+    ".dpx": read_dpx_header,
+}
+
+
+def read_image_header(
+    path: str, check_complete: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Read image header for supported formats.
+
+    Arguments:
+        path (str): Path to the image file.
+        check_complete (bool): Whether to validate the file is complete.
+
+    Returns:
+        Optional[Dict[str, Any]]: Header information, or None when the file
+            format is not supported.
+
+    Raises:
+        ImageHeaderError: When the header is invalid or the file is
+            incomplete.
+
+    """
+    ext = os.path.splitext(path)[-1].lower()
+    reader = HEADER_READERS.get(ext)
+    if reader is None:
+        return None
+    try:
+        return reader(path, check_complete=check_complete)
+    except (struct.error, IndexError, ValueError) as exc:
+        if isinstance(exc, ImageHeaderError):
+            raise
+        raise ImageHeaderError(f"Malformed header: {exc}") from exc
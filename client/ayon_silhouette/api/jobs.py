@@ -0,0 +1,196 @@
+"""Run extraction post-processing in the background during publishing.
+
+Extractors only perform the steps that require Silhouette (exporting,
+rendering) on the main thread and submit their post-processing, like
+computing checksums, compressing and writing sidecar files, to a thread
+pool shared by the publish context. The next extractor can then start its
+Silhouette work while the previous instance is still post-processed.
+
+The `WaitPostProcessing` plug-in waits for each instance's jobs before
+integration and applies their results on the main thread in the order they
+were submitted, so the published data does not depend on which job finished
+first. When post-processing fails, the queue of the publish is cancelled.
+A publish that fails elsewhere leaves its queue behind, so the queues of
+previous publishes are cancelled when the next publish starts, see
+`cancel_active_queues`.
+
+Jobs run in a background thread, so they must not call into `fx` or modify
+the instance. Return the result instead and apply it with `on_done`.
+"""
+import concurrent.futures
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pyblish.api
+
+log = logging.getLogger(__name__)
+
+CONTEXT_KEY = "silhouettePostProcess"
+DEFAULT_MAX_WORKERS = 4
+
+
+class PostProcessJob:
+    """A post-processing job submitted for an instance."""
+
+    def __init__(
+        self,
+        label: str,
+        future: concurrent.futures.Future,
+        on_done: Optional[Callable[[Any], None]] = None
+    ):
+        self.label = label
+        self.future = future
+        self.on_done = on_done
+
+
+class PostProcessQueue:
+    """Thread pool with the pending post-processing jobs per instance."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._jobs: Dict[str, List[PostProcessJob]] = {}
+        self._pools: List[Any] = []
+        self._lock = threading.Lock()
+        _active_queues.add(self)
+
+    def submit(
+        self,
+        instance: pyblish.api.Instance,
+        label: str,
+        fn: Callable,
+        *args,
+        on_done: Optional[Callable[[Any], None]] = None,
+        **kwargs
+    ) -> concurrent.futures.Future:
+        """Submit a job for the instance.
+
+        Arguments:
+            instance (pyblish.api.Instance): The instance the job is for.
+            label (str): Label used in logs and error messages.
+            fn (Callable): The function to run in the background.
+            *args: Arguments for `fn`.
+            on_done (Optional[Callable[[Any], None]]): Called with the
+                result of `fn` on the main thread once the instance's jobs
+                are waited for.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            concurrent.futures.Future: The future of the job.
+
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ayon_silhouette_post"
+                )
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._jobs.setdefault(instance.id, []).append(
+                PostProcessJob(label, future, on_done))
+        log.debug(f"Submitted post-processing '{label}' for: {instance}")
+        return future
+
+    def add_pool(self, pool):
+        """Cancel the pool together with the queue.
+
+        Arguments:
+            pool (render.ProcessPool): Pool of processes started for the
+                publish outside of the queue.
+
+        """
+        with self._lock:
+            self._pools.append(pool)
+
+    def has_jobs(self, instance: pyblish.api.Instance) -> bool:
+        return bool(self._jobs.get(instance.id))
+
+    def wait(
+        self, instance: pyblish.api.Instance
+    ) -> List[Tuple[str, BaseException]]:
+        """Wait for all jobs of the instance and apply their results.
+
+        Results are applied in submission order. A job's `on_done` is not
+        called when the job failed.
+
+        Returns:
+            List[Tuple[str, BaseException]]: Label and error of failed jobs.
+
+        """
+        with self._lock:
+            jobs = self._jobs.pop(instance.id, [])
+
+        errors = []
+        for job in jobs:
+            try:
+                result = job.future.result()
+                if job.on_done is not None:
+                    job.on_done(result)
+            except Exception as exc:
+                errors.append((job.label, exc))
+
+        with self._lock:
+            if not self._jobs and self._executor is not None:
+                # Release the idle threads, a new pool is created when more
+                # jobs are submitted
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        return errors
+
+    def cancel(self):
+        """Cancel all jobs that did not start yet and the added pools."""
+        with self._lock:
+            for jobs in self._jobs.values():
+                for job in jobs:
+                    job.future.cancel()
+            self._jobs.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            pools, self._pools = self._pools, []
+        for pool in pools:
+            pool.cancel()
+
+
+# Queues of all publishes that were not cancelled yet
+_active_queues: "weakref.WeakSet[PostProcessQueue]" = weakref.WeakSet()
+
+
+def cancel_active_queues():
+    """Cancel the post-processing of all previous publishes.
+
+    A publish that failed outside of `WaitPostProcessing` does not cancel
+    its queue, so this is called when a new publish starts.
+    """
+    for queue in list(_active_queues):
+        queue.cancel()
+        _active_queues.discard(queue)
+
+
+def get_post_process_queue(
+    context: pyblish.api.Context
+) -> PostProcessQueue:
+    """Return the post-processing queue of the publish context."""
+    queue = context.data.get(CONTEXT_KEY)
+    if queue is None:
+        queue = PostProcessQueue()
+        context.data[CONTEXT_KEY] = queue
+    return queue
+
+
+def submit_post_process(
+    instance: pyblish.api.Instance,
+    label: str,
+    fn: Callable,
+    *args,
+    on_done: Optional[Callable[[Any], None]] = None,
+    **kwargs
+) -> concurrent.futures.Future:
+    """Submit a post-processing job for the instance.
+
+    See `PostProcessQueue.submit`.
+    """
+    queue = get_post_process_queue(instance.context)
+    return queue.submit(instance, label, fn, *args, on_done=on_done, **kwargs)
@@ -1,18 +1,20 @@
 """Library functions for Silhouette."""
+import collections
 import contextlib
 import json
 import logging
 import os
 import platform
+import shutil
 import zipfile
-from typing import Optional, Iterator, List, Tuple, Dict
+from typing import Optional, Iterator, List, Tuple, Dict, Set
 
 from qtpy import QtCore, QtWidgets
 import fx
 import tools.window
 
 from ayon_core.lib import NumberDef
-from ayon_core.pipeline import get_current_project_name
+from ayon_core.pipeline import Anatomy, get_current_project_name
 from ayon_core.pipeline.context_tools import get_current_task_entity
 from ayon_core.settings import get_project_settings
 
@@ -27,6 +29,32 @@ def get_main_window():
     return tools.window.get_main_window()
 
 
+# Anatomy per project name, to avoid querying it again on each load
+_anatomy_cache: Dict[str, Anatomy] = {}
+
+
+def get_project_anatomy(project_entity: dict) -> Anatomy:
+    """Return the cached Anatomy for the project.
+
+    The cache is cleared by the host when the current context changes, see
+    `clear_anatomy_cache`.
+    """
+    project_name = project_entity["name"]
+    anatomy = _anatomy_cache.get(project_name)
+    if anatomy is None:
+        anatomy = Anatomy(
+            project_name=project_name,
+            project_entity=project_entity
+        )
+        _anatomy_cache[project_name] = anatomy
+    return anatomy
+
+
+def clear_anatomy_cache():
+    """Discard the cached Anatomy of all projects."""
+    _anatomy_cache.clear()
+
+
 def collect_animation_defs(create_context, fps=False):
     """Get the basic animation attribute definitions for the publisher.
 
@@ -97,6 +125,28 @@ def maintained_selection(preserve_active_node=True):
             fx.activate(previous_active_node)
 
 
+def restore_selection(selection: Optional[Tuple[Optional[fx.Node], list]]):
+    """Restore a selection stored as (active node, selected objects)."""
+    if selection is None:
+        return
+    active_node, selected = selection
+    fx.select(selected)
+    if active_node:
+        fx.activate(active_node)
+
+
+def ensure_selection(node: fx.Node, objects: list):
+    """Activate `node` and select `objects` unless already the case.
+
+    This avoids re-applying the same selection, which triggers UI updates,
+    for consecutive exports of the same objects.
+    """
+    if fx.activeNode() != node:
+        fx.activate(node)
+    if set(fx.selection()) != set(objects):
+        fx.select(objects)
+
+
 @contextlib.contextmanager
 def undo_chunk(label=""):
     """Open undo chunk during context.
@@ -115,6 +165,83 @@ def undo_chunk(label=""):
         fx.endUndo()
 
 
+class LoadBatch:
+    """Consecutive loads sharing one selection restore.
+
+    The selection and active node are stored once when the batch starts and
+    restored once when it finishes. New nodes are positioned next to the
+    previously loaded node, or the active node for the first one.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.active_node = fx.activeNode()
+        self.selection = fx.selection()
+        self.nodes: List[fx.Node] = []
+
+    def add_node(self, node: fx.Node):
+        """Position a new node next to the previously loaded node."""
+        previous = self.nodes[-1] if self.nodes else self.active_node
+        if previous is not None:
+            node.setState("graph.pos", fx.trees.nextPos(previous))
+        else:
+            set_new_node_position(node)
+        self.nodes.append(node)
+
+    def finish(self):
+        fx.select(self.selection)
+        if self.active_node:
+            fx.activate(self.active_node)
+
+
+_load_batch: Optional[LoadBatch] = None
+
+
+def _finish_load_batch():
+    global _load_batch
+    batch, _load_batch = _load_batch, None
+    if batch is not None:
+        log.debug(
+            f"Finishing load batch '{batch.label}' "
+            f"with {len(batch.nodes)} new nodes")
+        batch.finish()
+
+
+@contextlib.contextmanager
+def batched_load(label: str = "Load"):
+    """Load in an undo chunk, sharing the selection restore of a batch.
+
+    The loader calls each loader plug-in once per representation in a loop
+    on the main thread. The first load starts a `LoadBatch` and the batch
+    is finished with a zero timeout timer, which fires when control returns
+    to the Qt event loop after all loads of the loop finished.
+
+    Each load is its own undo chunk, which is opened and closed within the
+    load so that no undo chunk stays open while the event loop runs.
+
+    Without a GUI, each load is its own batch that finishes directly.
+
+    Yields:
+        LoadBatch: The current load batch.
+
+    """
+    global _load_batch
+    if not fx.gui or QtWidgets.QApplication.instance() is None:
+        batch = LoadBatch(label)
+        try:
+            with undo_chunk(label):
+                yield batch
+        finally:
+            batch.finish()
+        return
+
+    if _load_batch is None:
+        _load_batch = LoadBatch(label)
+        QtCore.QTimer.singleShot(0, _finish_load_batch)
+    with undo_chunk(label):
+        yield _load_batch
+
+
 def imprint(node, data: Optional[dict], key="AYON"):
     """Write `data` to `node` as userDefined attributes
 
@@ -213,6 +340,42 @@ def set_new_node_position(node):
     node.setState("graph.pos", pos)
 
 
+def parse_property_value(value: str):
+    """Parse a settings string value for a node property.
+
+    Values are parsed as JSON so numbers, booleans and lists can be defined
+    in settings. Any value that is not valid JSON is used as string.
+    """
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
+
+
+def get_write_profile_properties(profile: dict) -> Dict[str, object]:
+    """Return the Output node property values of a render write profile.
+
+    See the Create Render write profiles settings.
+    """
+    return {
+        item["name"]: parse_property_value(item["value"])
+        for item in profile["properties"]
+    }
+
+
+def set_node_properties(node: fx.Node, properties: Dict[str, object]):
+    """Set property values on a node by property id.
+
+    Properties that do not exist on the node are skipped with a warning.
+    """
+    for key, value in properties.items():
+        prop = node.property(key)
+        if prop is None:
+            log.warning(f"Node {node.label} has no property: {key}")
+            continue
+        prop.value = value
+
+
 def set_resolution_from_entity(session, task_entity):
     """Set resolution and pixel aspect from task entity attributes.
 
@@ -360,6 +523,293 @@ def iter_children(
         yield from iter_children(child, prefix=label)
 
 
+# Separator of the first and last object id of an id range enum value,
+# object ids never contain it since it separates instance ids too
+ID_RANGE_SEPARATOR = "|"
+
+# Maximum number of objects per id range item of compact enum items
+ID_RANGE_SIZE = 100
+
+
+def encode_id_range(first_id: str, last_id: str) -> str:
+    """Return the enum value of the sibling objects from first to last."""
+    return f"{first_id}{ID_RANGE_SEPARATOR}{last_id}"
+
+
+def decode_id_range(value: str) -> Optional[Tuple[str, str]]:
+    """Return the first and last object id of an id range enum value.
+
+    Returns None if the value is a single object id.
+    """
+    first_id, separator, last_id = value.partition(ID_RANGE_SEPARATOR)
+    if not separator:
+        return None
+    return first_id, last_id
+
+
+def resolve_objects(
+        node: fx.Node,
+        object_ids: List[str],
+        object_types: Tuple[type, ...],
+        include_parent_layers: bool = False,
+        expand_layers: bool = False
+) -> Tuple[List[fx.Object], List[str]]:
+    """Resolve object ids to the objects in the node's hierarchy.
+
+    The node's hierarchy is walked once to map all ids to their objects and
+    parents, instead of calling `fx.findObject` and climbing the parents for
+    each id separately.
+
+    Arguments:
+        node (fx.Node): The node containing the objects.
+        object_ids (List[str]): The ids of the objects to resolve.
+        object_types (Tuple[type, ...]): The object types to resolve. Ids
+            of objects of other types are considered stale.
+        include_parent_layers (bool): Also include the parent layers of the
+            resolved objects, so their hierarchy is preserved on export.
+        expand_layers (bool): Resolve layer ids and id ranges to all their
+            descendants of `object_types`, as used by compact enum items.
+            See `get_child_enum_items`.
+
+    Returns:
+        Tuple[List[fx.Object], List[str]]: The resolved objects followed by
+            their parent layers, and the ids that were not found.
+
+    """
+    objects_by_id: Dict[str, fx.Object] = {}
+    parent_by_id: Dict[str, fx.Object] = {}
+    stack = [(child, None) for child in node.children or []]
+    while stack:
+        obj, parent = stack.pop()
+        objects_by_id[obj.id] = obj
+        if parent is not None:
+            parent_by_id[obj.id] = parent
+        for child in obj.children or []:
+            stack.append((child, obj))
+
+    def _expand(obj: fx.Object) -> List[fx.Object]:
+        expanded = [obj] if isinstance(obj, object_types) else []
+        if isinstance(obj, fx.Layer):
+            expanded.extend(
+                child for child, _label in iter_children(obj)
+                if isinstance(child, object_types)
+            )
+        return expanded
+
+    objects = []
+    stale_ids = []
+    for object_id in object_ids:
+        id_range = decode_id_range(object_id) if expand_layers else None
+        if id_range is not None:
+            siblings = _get_id_range_siblings(
+                node, id_range, objects_by_id, parent_by_id)
+            if siblings is None:
+                stale_ids.append(object_id)
+                continue
+            for sibling in siblings:
+                objects.extend(_expand(sibling))
+            continue
+
+        obj = objects_by_id.get(object_id)
+        if expand_layers and isinstance(obj, fx.Layer):
+            objects.extend(_expand(obj))
+            continue
+        if obj is None or not isinstance(obj, object_types):
+            stale_ids.append(object_id)
+            continue
+        objects.append(obj)
+
+    if expand_layers:
+        # Remove duplicates from overlapping layers, ranges and objects
+        unique = {}
+        for obj in objects:
+            unique.setdefault(obj.id, obj)
+        objects = list(unique.values())
+
+    if include_parent_layers:
+        seen = {obj.id for obj in objects}
+        layers = []
+        for obj in list(objects):
+            parent = parent_by_id.get(obj.id)
+            while isinstance(parent, fx.Layer) and parent.id not in seen:
+                seen.add(parent.id)
+                layers.append(parent)
+                parent = parent_by_id.get(parent.id)
+        objects.extend(layers)
+
+    return objects, stale_ids
+
+
+def _get_id_range_siblings(
+        node: fx.Node,
+        id_range: Tuple[str, str],
+        objects_by_id: Dict[str, fx.Object],
+        parent_by_id: Dict[str, fx.Object]
+) -> Optional[List[fx.Object]]:
+    """Return the siblings from the first to the last object of an id range.
+
+    Returns None if either object no longer exists or they no longer share
+    their parent.
+    """
+    first_id, last_id = id_range
+    if first_id not in objects_by_id or last_id not in objects_by_id:
+        return None
+    parent = parent_by_id.get(first_id)
+    if parent_by_id.get(last_id) is not parent:
+        return None
+
+    siblings = list((parent or node).children or [])
+    indices = [
+        index for index, sibling in enumerate(siblings)
+        if sibling.id in (first_id, last_id)
+    ]
+    return siblings[indices[0]:indices[-1] + 1]
+
+
+# Cached enum items and labels of the matching children per node id,
+# object type and compact threshold, see `get_child_enum_items`
+_child_enum_items_cache: Dict[
+    Tuple[str, type, int], Tuple[List[dict], Dict[str, str]]
+] = {}
+
+
+def invalidate_child_enum_items():
+    """Discard the cached enum items of `get_child_enum_items`.
+
+    This is called when the publisher collects the instances again, and
+    when the host opens a project or creates a session.
+    """
+    _child_enum_items_cache.clear()
+
+
+def get_child_enum_items(
+        node: fx.Node,
+        object_type: type,
+        compact_threshold: int = 0,
+        selected_ids: Optional[List[str]] = None
+) -> List[dict]:
+    """Return `EnumDef` items for the children of a type in the node.
+
+    The items are cached per node until `invalidate_child_enum_items` is
+    called, so the repeated requests of the publisher between two resets
+    do not walk the node's hierarchy. Children added or removed in the
+    meantime are listed once the publisher is refreshed, like new nodes.
+
+    When the node has more matching children than `compact_threshold`, the
+    items are compact: one item per top-level layer containing matching
+    children, and the matching children outside any layer are listed as id
+    ranges of up to `ID_RANGE_SIZE` consecutive children, see
+    `encode_id_range`. Children in `selected_ids` are always listed, so
+    values stored before the node exceeded the threshold stay valid. Use
+    `resolve_objects` with `expand_layers=True` to resolve the selected
+    values.
+
+    Arguments:
+        node (fx.Node): The node to list the children for.
+        object_type (type): The type of children to list, e.g. `fx.Shape`.
+        compact_threshold (int): Number of matching children above which
+            compact items are returned. Zero to never use compact items.
+        selected_ids (Optional[List[str]]): Ids of the currently selected
+            children.
+
+    Returns:
+        List[dict]: Items with `label` and `value`, empty if no children of
+            the type exist.
+
+    """
+    key = (node.id, object_type, compact_threshold)
+    cached = _child_enum_items_cache.get(key)
+    if cached is None:
+        cached = _build_child_enum_items(
+            node, object_type, compact_threshold)
+        _child_enum_items_cache[key] = cached
+    items, labels_by_id = cached
+
+    # Keep selected children that are not listed valid as values
+    values = {item["value"] for item in items}
+    extra_items = [
+        {"label": labels_by_id[child_id], "value": child_id}
+        for child_id in selected_ids or []
+        if child_id not in values and child_id in labels_by_id
+    ]
+    if extra_items:
+        items = items + extra_items
+    return items
+
+
+def _build_child_enum_items(
+        node: fx.Node,
+        object_type: type,
+        compact_threshold: int
+) -> Tuple[List[dict], Dict[str, str]]:
+    children = list(iter_children(node))
+    labels_by_id = {
+        child.id: label for child, label in children
+        if isinstance(child, object_type)
+    }
+    if not compact_threshold or len(labels_by_id) <= compact_threshold:
+        items = [
+            {"label": label, "value": child_id}
+            for child_id, label in labels_by_id.items()
+        ]
+        return items, labels_by_id
+
+    items = []
+    run: List[fx.Object] = []
+
+    def _add_run():
+        # Consecutive matching children outside layers, in the order of
+        # `iter_children`
+        for start in range(0, len(run), ID_RANGE_SIZE):
+            chunk = run[start:start + ID_RANGE_SIZE]
+            if len(chunk) == 1:
+                items.append({"label": chunk[0].label, "value": chunk[0].id})
+                continue
+            items.append({
+                "label": (
+                    f"{chunk[0].label} - {chunk[-1].label} ({len(chunk)})"),
+                "value": encode_id_range(chunk[0].id, chunk[-1].id)
+            })
+        run.clear()
+
+    for child in reversed(node.children or []):
+        if isinstance(child, fx.Layer):
+            _add_run()
+            count = sum(
+                1 for sub, _label in iter_children(child)
+                if isinstance(sub, object_type)
+            )
+            if count:
+                items.append({
+                    "label": f"{child.label} ({count})",
+                    "value": child.id
+                })
+        elif isinstance(child, object_type):
+            run.append(child)
+        else:
+            _add_run()
+    _add_run()
+    return items, labels_by_id
+
+
+def iter_property_keyframes(
+        prop: fx.Property) -> Iterator[Tuple[float, object]]:
+    """Yield (frame, value) for each keyframe of an animated property.
+
+    Keyframes are read one at a time so that properties with many keyframes
+    can be processed without collecting all values in memory.
+
+    Arguments:
+        prop (fx.Property): The property to read the keyframes from.
+
+    Yields:
+        Tuple[float, object]: The keyframe frame and value.
+
+    """
+    for frame in prop.keys:
+        yield frame, prop.getValue(frame)
+
+
 class _ZipFile(zipfile.ZipFile):
     """Extended check for windows invalid characters."""
 
@@ -436,6 +886,20 @@ def unzip(source, destination):
     log.debug(f"Extracted '{source}' to '{destination}'")
 
 
+def link_or_copy(source: str, destination: str):
+    """Hardlink `source` to `destination`, or copy if linking fails.
+
+    Linking fails for example when the files are on different filesystems.
+    An existing `destination` file is replaced.
+    """
+    if os.path.exists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
 def get_connections(
     node: fx.Node,
     inputs=True,
@@ -469,6 +933,123 @@ def get_output_port_by_name(
     )
 
 
+class SessionGraph:
+    """Snapshot of the node connections in a session.
+
+    The snapshot is built once from the session's nodes and their connected
+    input ports and can then answer dependency queries without walking the
+    `connectedInputs`/`connectedOutputs` of the nodes again. Query results
+    are memoized on the instance, so a snapshot must be discarded whenever
+    the session graph changes.
+
+    """
+    def __init__(self, session: fx.Session):
+        self.session = session
+        self.nodes: List[fx.Node] = list(session.nodes)
+
+        # Connections from destination (input) ports to source (output) ports
+        self.connections: Dict[fx.Port, fx.Port] = {}
+
+        self._inputs: Dict[fx.Node, List[fx.Node]] = {
+            node: [] for node in self.nodes
+        }
+        self._outputs: Dict[fx.Node, List[fx.Node]] = {
+            node: [] for node in self.nodes
+        }
+        for node in self.nodes:
+            # Collecting only the inputs of all nodes also collects all the
+            # outputs, because every connection has an input end
+            for destination in node.connectedInputs:
+                source = destination.source
+                self.connections[destination] = source
+                source_node = source.node
+                if source_node not in self._inputs[node]:
+                    self._inputs[node].append(source_node)
+                outputs = self._outputs.setdefault(source_node, [])
+                if node not in outputs:
+                    outputs.append(node)
+
+        self._topological_order: Optional[List[fx.Node]] = None
+        self._upstream: Dict[fx.Node, frozenset] = {}
+        self._downstream: Dict[fx.Node, frozenset] = {}
+
+    def inputs(self, node: fx.Node) -> List[fx.Node]:
+        """Return the nodes directly connected to the inputs of `node`."""
+        return list(self._inputs.get(node, []))
+
+    def outputs(self, node: fx.Node) -> List[fx.Node]:
+        """Return the nodes directly connected to the outputs of `node`."""
+        return list(self._outputs.get(node, []))
+
+    def topological_order(self) -> List[fx.Node]:
+        """Return all nodes ordered so that inputs come before their outputs.
+
+        Nodes without dependencies between them keep the order of
+        `session.nodes`. Should the graph contain a cycle then the nodes
+        that are part of it are appended at the end in session order.
+        """
+        if self._topological_order is not None:
+            return list(self._topological_order)
+
+        in_degree = {
+            node: len(inputs) for node, inputs in self._inputs.items()
+        }
+        ready = collections.deque(
+            node for node in self.nodes if not in_degree[node]
+        )
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for output in self._outputs.get(node, []):
+                in_degree[output] -= 1
+                if not in_degree[output]:
+                    ready.append(output)
+
+        if len(order) != len(self.nodes):
+            visited = set(order)
+            order.extend(node for node in self.nodes if node not in visited)
+
+        self._topological_order = order
+        return list(order)
+
+    def upstream(self, node: fx.Node) -> Set[fx.Node]:
+        """Return all nodes that feed into `node`, excluding itself."""
+        return set(self._closure(node, self._inputs, self._upstream))
+
+    def downstream(self, node: fx.Node) -> Set[fx.Node]:
+        """Return all nodes that `node` feeds into, excluding itself."""
+        return set(self._closure(node, self._outputs, self._downstream))
+
+    @staticmethod
+    def _closure(
+        node: fx.Node,
+        edges: Dict[fx.Node, List[fx.Node]],
+        memo: Dict[fx.Node, frozenset]
+    ) -> frozenset:
+        """Return the memoized transitive closure of `node` along `edges`."""
+        if node in memo:
+            return memo[node]
+
+        result = set()
+        queue = collections.deque(edges.get(node, []))
+        while queue:
+            current = queue.popleft()
+            if current in result:
+                continue
+            if current in memo:
+                # Reuse a previously computed closure of this branch
+                result.add(current)
+                result.update(memo[current])
+                continue
+            result.add(current)
+            queue.extend(edges.get(current, []))
+
+        result.discard(node)
+        memo[node] = frozenset(result)
+        return memo[node]
+
+
 @undo_chunk("Transfer connections")
 def transfer_connections(
     source: fx.Node,
@@ -510,16 +1091,12 @@ def copy_session_nodes(
     Returns:
         List[fx.Node]: The cloned nodes in the destination session.
     """
-    connections = {}
-    for node in source_session.nodes:
-        # We skip outputs because we are iterating all nodes
-        # so we could automatically also collect the outputs if we
-        # collect all their inputs
-        connections.update(get_connections(node, outputs=False))
+    graph = SessionGraph(source_session)
+    connections = graph.connections
 
     # Create clones of the nodes from the source session
     source_node_to_clone_node: Dict[fx.Node, fx.Node] = {
-        node: node.clone() for node in source_session.nodes
+        node: node.clone() for node in graph.nodes
     }
 
     # Add all clones to the destination session
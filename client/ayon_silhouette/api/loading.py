@@ -0,0 +1,138 @@
+"""Prepare loads in the background and apply them on the main thread.
+
+Loading a representation consists of I/O-bound preparation, like resolving
+paths and probing the media, and applying the result to the Silhouette
+project, which must happen on the main thread. The `LoadDispatcher` runs
+the preparation of all requested loads concurrently in a thread pool and
+queues each result back to the main thread, so the UI stays responsive and
+shows the progress. Failed loads are reported to the artist once all
+submitted loads finished.
+"""
+import concurrent.futures
+import logging
+from typing import Any, Callable, List, Optional
+
+from qtpy import QtCore, QtWidgets
+
+from . import lib
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class LoadDispatcher(QtCore.QObject):
+    """Run load preparation in a thread pool and apply it on the main thread.
+
+    The dispatcher must be created on the main thread. Prepared results are
+    emitted with a queued signal from the worker threads, so they are applied
+    on the main thread by the Qt event loop.
+    """
+
+    _prepared = QtCore.Signal(object)
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="ayon_silhouette_load"
+        )
+        self._prepared.connect(self._on_prepared, QtCore.Qt.QueuedConnection)
+        self._pending = 0
+        self._failed: List[str] = []
+        self._total = 0
+        self._done = 0
+        self._progress: Optional[QtWidgets.QProgressDialog] = None
+
+    def submit(
+        self,
+        label: str,
+        prepare: Callable[[], Any],
+        apply: Callable[[Any], None],
+        show_progress: bool = True,
+        executor: Optional[concurrent.futures.Executor] = None
+    ):
+        """Submit a load.
+
+        Arguments:
+            label (str): Label of the load for logs and the undo chunk.
+            prepare (Callable[[], Any]): Runs in a background thread and must
+                not call into `fx`.
+            apply (Callable[[Any], None]): Called with the result of
+                `prepare` on the main thread.
+            show_progress (bool): Show the load in the progress dialog.
+                Disable for background jobs the artist did not wait for,
+                like prefetching media.
+            executor (Optional[concurrent.futures.Executor]): Executor to
+                run `prepare` in. Defaults to the dispatcher's thread pool,
+                use a separate executor for long running background jobs so
+                they do not hold up loads.
+
+        """
+        self._pending += 1
+        if show_progress:
+            self._total += 1
+            self._update_progress()
+        future = (executor or self._executor).submit(prepare)
+        future.add_done_callback(
+            lambda _future: self._prepared.emit(
+                (label, _future, apply, show_progress))
+        )
+
+    def _on_prepared(self, item):
+        label, future, apply, show_progress = item
+        try:
+            result = future.result()
+            with lib.batched_load(label):
+                apply(result)
+        except Exception as exc:
+            log.error(f"Failed to load '{label}'", exc_info=True)
+            self._failed.append(f"{label}: {exc}")
+        finally:
+            self._pending -= 1
+            if show_progress:
+                self._done += 1
+                self._update_progress()
+            if not self._pending and self._failed:
+                self._report_failed()
+
+    def _report_failed(self):
+        failed, self._failed = self._failed, []
+        message_box = QtWidgets.QMessageBox(lib.get_main_window())
+        message_box.setIcon(QtWidgets.QMessageBox.Warning)
+        message_box.setWindowTitle("AYON")
+        message_box.setText(
+            f"Failed to load {len(failed)} item(s), see the details.")
+        message_box.setDetailedText("\n".join(failed))
+        message_box.show()
+
+    def _update_progress(self):
+        if self._done >= self._total:
+            # All loads finished
+            if self._progress is not None:
+                self._progress.close()
+                self._progress = None
+            self._total = 0
+            self._done = 0
+            return
+
+        if self._progress is None:
+            self._progress = QtWidgets.QProgressDialog(
+                "Loading...", None, 0, 0, lib.get_main_window())
+            self._progress.setWindowTitle("AYON")
+            self._progress.setMinimumDuration(500)
+        self._progress.setMaximum(self._total)
+        self._progress.setValue(self._done)
+        self._progress.setLabelText(
+            f"Loading {self._done + 1} of {self._total}...")
+
+
+_dispatcher: Optional[LoadDispatcher] = None
+
+
+def get_load_dispatcher() -> LoadDispatcher:
+    """Return the shared load dispatcher, creating it if needed."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = LoadDispatcher()
+    return _dispatcher
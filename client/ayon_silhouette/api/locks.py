@@ -0,0 +1,71 @@
+"""Inter-process locks for the local caches shared by Silhouette sessions.
+
+The caches keep their index in a JSON file next to the cached files. Each
+read-modify-write of such a file is done while holding an exclusive lock
+on a separate lock file, so concurrent sessions on the same workstation
+do not overwrite each other's changes.
+"""
+import contextlib
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def file_lock(
+    path: str,
+    timeout: float = 30.0,
+    poll_interval: float = 0.05
+):
+    """Hold an exclusive lock on the lock file `path` during the context.
+
+    The lock is released by the operating system if the process dies, so a
+    crashed session never leaves the cache locked. The lock is held per
+    open file, so threads of the same process exclude each other too.
+
+    Arguments:
+        path (str): Path of the lock file, created if it does not exist.
+        timeout (float): Seconds to wait for the lock.
+        poll_interval (float): Seconds between attempts to get the lock.
+
+    Raises:
+        TimeoutError: When the lock is not acquired within `timeout`.
+
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a+b") as f:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(f):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock: {path}")
+            time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(f)
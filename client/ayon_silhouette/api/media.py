@@ -0,0 +1,251 @@
+"""Probe media files for their parts (subimages) for loading.
+
+OpenEXR part names are read directly from the file headers. Other formats
+are probed with OIIO, which spawns a process that reads the headers, often
+over the network. The part names are therefore cached on disk per
+workstation, keyed by the file path, size and modification time, so the
+same published file is only probed once.
+"""
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from ayon_core.lib.transcoding import get_oiio_info_for_input
+
+from . import locks
+from .image_headers import ImageHeaderError, read_image_header
+
+log = logging.getLogger(__name__)
+
+EXR_EXTENSIONS = {".exr", ".sxr"}
+
+CACHE_FILENAME = "subimage_cache.json"
+CACHE_MAX_ENTRIES = 5000
+# Only refresh the access time of cache hits after this many seconds, so
+# that reading from the cache does not write the cache file each time
+CACHE_TOUCH_INTERVAL = 24 * 60 * 60
+# Seconds to collect changes before writing them to the cache file
+CACHE_FLUSH_DELAY = 5.0
+
+
+def get_cache_dir() -> str:
+    """Return the local directory for the media caches."""
+    return os.environ.get(
+        "AYON_SILHOUETTE_MEDIA_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "ayon_silhouette")
+    )
+
+
+class SubimageCache:
+    """Persistent cache of the part names per media file.
+
+    The cache is a JSON file mapping `path|size|mtime_ns` to the last
+    access time and part names. It is read once per session and kept in
+    memory. Changes are written back in batches, at most every
+    `flush_delay` seconds and when the session ends, by merging them into
+    the current file content while holding an inter-process file lock, so
+    concurrent sessions keep each other's entries. The file is replaced
+    atomically and the least recently used entries are evicted above
+    `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        flush_delay: float = CACHE_FLUSH_DELAY
+    ):
+        if path is None:
+            path = os.path.join(get_cache_dir(), CACHE_FILENAME)
+        self.path = path
+        self.max_entries = max_entries
+        self.flush_delay = flush_delay
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, list]] = None
+        self._changes: Dict[str, list] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.path}.lock"
+
+    @staticmethod
+    def get_key(filepath: str) -> Optional[str]:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        path = os.path.normcase(os.path.abspath(filepath))
+        return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    def _read(self) -> Dict[str, list]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            log.debug(f"Ignoring unreadable subimage cache: {exc}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, entries: Dict[str, list]):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".subimage_cache_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            log.debug(f"Unable to write subimage cache: {exc}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _get_entries(self) -> Dict[str, list]:
+        # Must be called while holding `_lock`
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _add_change(self, key: str, entry: list):
+        # Must be called while holding `_lock`
+        self._get_entries()[key] = entry
+        self._changes[key] = entry
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def get(self, filepath: str) -> Optional[List[str]]:
+        """Return the cached part names for the file, if any."""
+        key = self.get_key(filepath)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._get_entries().get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if now - entry[0] > CACHE_TOUCH_INTERVAL:
+                self._add_change(key, [now, entry[1]])
+        return entry[1]
+
+    def set(self, filepath: str, part_names: List[str]):
+        """Store the part names for the file."""
+        key = self.get_key(filepath)
+        if key is None:
+            return
+        with self._lock:
+            self._add_change(key, [time.time(), part_names])
+
+    def flush(self):
+        """Merge the pending changes into the cache file."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            changes, self._changes = self._changes, {}
+        if not changes:
+            return
+
+        try:
+            with locks.file_lock(self.lock_path):
+                entries = self._read()
+                for key, entry in changes.items():
+                    current = entries.get(key)
+                    if current is None or current[0] < entry[0]:
+                        entries[key] = entry
+                if len(entries) > self.max_entries:
+                    # Evict least recently used entries
+                    keys = sorted(entries, key=lambda key: entries[key][0])
+                    for key in keys[:len(entries) - self.max_entries]:
+                        del entries[key]
+                self._write(entries)
+        except (OSError, TimeoutError) as exc:
+            log.debug(f"Unable to update subimage cache: {exc}")
+            return
+
+        with self._lock:
+            # Also use the entries written by other sessions
+            entries.update(self._changes)
+            self._entries = entries
+
+
+def probe_part_names_oiio(filepath: str) -> List[str]:
+    """Return the part names of a media file using OIIO."""
+    names = []
+    for info in get_oiio_info_for_input(filepath, subimages=True):
+        attribs = info.get("attribs", {})
+        names.append(
+            attribs.get("name", attribs.get("oiio:subimage_name", "")))
+    return names
+
+
+def probe_part_names(filepath: str) -> List[str]:
+    """Return the part names of a media file.
+
+    OpenEXR headers are parsed directly, which only reads the header bytes
+    of the file. Other formats, or headers that fail to parse, fall back to
+    probing with OIIO.
+    """
+    ext = os.path.splitext(filepath)[-1].lower()
+    if ext in EXR_EXTENSIONS:
+        try:
+            header = read_image_header(filepath, check_complete=False)
+        except (ImageHeaderError, OSError) as exc:
+            log.debug(f"Falling back to OIIO to probe {filepath}: {exc}")
+        else:
+            return [
+                part.get("name", part.get("view", ""))
+                for part in header["parts"]
+            ]
+    return probe_part_names_oiio(filepath)
+
+
+_subimage_cache: Optional[SubimageCache] = None
+_subimage_cache_lock = threading.Lock()
+
+
+def get_subimage_cache() -> SubimageCache:
+    """Return the shared subimage cache, creating it on first use."""
+    global _subimage_cache
+    with _subimage_cache_lock:
+        if _subimage_cache is None:
+            _subimage_cache = SubimageCache()
+            atexit.register(_subimage_cache.flush)
+        return _subimage_cache
+
+
+def get_part_names(
+    filepath: str,
+    probe: Callable[[str], List[str]] = probe_part_names
+) -> List[str]:
+    """Return the part names of a media file, using the persistent cache.
+
+    Arguments:
+        filepath (str): Path to the media file, e.g. the first frame.
+        probe (Callable[[str], List[str]]): Function to probe the part names
+            on a cache miss.
+
+    Returns:
+        List[str]: The name of each part, empty strings for unnamed parts.
+
+    """
+    cache = get_subimage_cache()
+    part_names = cache.get(filepath)
+    if part_names is not None:
+        log.debug(f"Using cached part names for: {filepath}")
+        return part_names
+
+    part_names = probe(filepath)
+    cache.set(filepath, part_names)
+    return part_names
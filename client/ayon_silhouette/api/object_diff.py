@@ -0,0 +1,259 @@
+"""Update the objects of a node with only the changes of a new import.
+
+The fingerprints of the objects as imported from a file are stored on the
+node by their label path when loading, see `store_object_fingerprints`. On
+update, the new file is imported into a scratch node and the fingerprints
+of its objects are compared with the stored ones, so only objects whose
+content changed in the file are replaced. Changed layers are updated in
+place instead, so their children are compared separately. Objects that are
+unchanged in the file are kept as they are, including any edits of the
+artist. Objects no longer in the file are removed, while objects the
+artist added are kept.
+"""
+import collections
+from typing import Dict, Iterable, List, Optional, Union
+
+import fx
+
+from . import lib
+from .fingerprint import get_object_fingerprint
+
+Parent = Union[fx.Node, fx.Object]
+
+OBJECT_FINGERPRINTS_KEY = "AYON_object_fingerprints"
+
+
+def get_objects_property(parent: Parent) -> fx.Property:
+    """Return the property holding the child objects of a node or layer."""
+    if isinstance(parent, fx.Node):
+        return parent.objects
+    return parent.property("objects")
+
+
+def _get_children_by_label(
+    children: Iterable[fx.Object]
+) -> Dict[str, fx.Object]:
+    """Return the children by label.
+
+    Children with the same label are matched in order by suffixing their
+    occurrence, e.g. `Shape`, `Shape#2`.
+    """
+    counts = collections.Counter()
+    children_by_label = {}
+    for child in children or []:
+        counts[child.label] += 1
+        label = child.label
+        if counts[label] > 1:
+            label = f"{label}#{counts[label]}"
+        children_by_label[label] = child
+    return children_by_label
+
+
+def _join_path(prefix: str, label: str) -> str:
+    return f"{prefix} > {label}" if prefix else label
+
+
+def get_object_fingerprints(
+    objects: Iterable[fx.Object],
+    prefix: str = ""
+) -> Dict[str, str]:
+    """Return the fingerprints of the objects and their descendants.
+
+    Arguments:
+        objects (Iterable[fx.Object]): The top-level objects.
+        prefix (str): Label path of the objects' parent.
+
+    Returns:
+        Dict[str, str]: The fingerprint per label path.
+
+    """
+    fingerprints = {}
+    for label, obj in _get_children_by_label(objects).items():
+        path = _join_path(prefix, label)
+        fingerprints[path] = f"{obj.type}|{get_object_fingerprint(obj)}"
+        if obj.children:
+            fingerprints.update(
+                get_object_fingerprints(obj.children, prefix=path))
+    return fingerprints
+
+
+def store_object_fingerprints(
+    node: fx.Node,
+    objects: Optional[Iterable[fx.Object]] = None
+):
+    """Store the fingerprints of the objects imported into the node.
+
+    Arguments:
+        node (fx.Node): The node the objects were imported into.
+        objects (Optional[Iterable[fx.Object]]): The imported top-level
+            objects, defaults to all of the node's children.
+
+    """
+    if objects is None:
+        objects = node.children
+    lib.imprint(
+        node, get_object_fingerprints(objects), key=OBJECT_FINGERPRINTS_KEY)
+
+
+def _get_child_index(parent: Parent, child: fx.Object) -> int:
+    return [obj.id for obj in parent.children].index(child.id)
+
+
+def _insert_object(
+    obj: fx.Object,
+    source: Parent,
+    destination: Parent,
+    index: int
+):
+    """Move the object into `destination` at the child index.
+
+    Objects can only be appended to the objects property, so the children
+    from the index onwards are taken out and appended again after it.
+    """
+    objects = get_objects_property(destination)
+    following = list(destination.children or [])[index:]
+    if following:
+        objects.removeObjects(following)
+    get_objects_property(source).removeObjects([obj])
+    objects.addObjects([obj] + following)
+
+
+def _copy_properties(source: fx.Object, destination: fx.Object):
+    """Set the property values and keyframes of `source` on `destination`.
+
+    The child objects are not copied.
+    """
+    properties = source.properties
+    if isinstance(properties, dict):
+        properties = properties.values()
+    for prop in properties:
+        if prop.id == "objects":
+            continue
+        destination_prop = destination.property(prop.id)
+        if destination_prop is None:
+            continue
+        for frame in list(destination_prop.keys or []):
+            destination_prop.removeKey(frame)
+        if prop.constant:
+            destination_prop.value = prop.value
+        else:
+            for frame, value in lib.iter_property_keyframes(prop):
+                destination_prop.setValue(value, frame)
+
+
+def _update_children(
+    parent: Parent,
+    new_parent: Parent,
+    old_fingerprints: Optional[Dict[str, str]],
+    new_fingerprints: Dict[str, str],
+    changes: Dict[str, List[str]],
+    prefix: str = ""
+):
+    children = _get_children_by_label(parent.children)
+    # Added objects are inserted after the previous object of the file to
+    # keep the stacking order of the file
+    index = 0
+    for label, new_child in _get_children_by_label(
+            new_parent.children).items():
+        path = _join_path(prefix, label)
+        child = children.pop(label, None)
+        if old_fingerprints is None:
+            # Without the fingerprints of the previous file, compare with
+            # the current objects instead
+            changed = child is None or new_fingerprints[path] != (
+                f"{child.type}|{get_object_fingerprint(child)}")
+        else:
+            changed = new_fingerprints[path] != old_fingerprints.get(path)
+
+        if not changed:
+            changes["unchanged"].append(path)
+            if child is not None and new_child.children:
+                _update_children(
+                    child, new_child, old_fingerprints, new_fingerprints,
+                    changes, prefix=path)
+        elif child is None:
+            _insert_object(new_child, new_parent, parent, index)
+            child = new_child
+            changes["added"].append(path)
+        elif isinstance(child, fx.Layer) and isinstance(new_child, fx.Layer):
+            # Keep the layer so only its changed children are replaced
+            _copy_properties(new_child, child)
+            changes["changed"].append(path)
+            _update_children(
+                child, new_child, old_fingerprints, new_fingerprints,
+                changes, prefix=path)
+        else:
+            child_index = _get_child_index(parent, child)
+            get_objects_property(parent).removeObjects([child])
+            _insert_object(new_child, new_parent, parent, child_index)
+            child = new_child
+            changes["changed"].append(path)
+
+        if child is not None:
+            index = _get_child_index(parent, child) + 1
+
+    # Remove the objects that are no longer in the file, but keep objects
+    # that were added by the artist
+    removed = {
+        label: child for label, child in children.items()
+        if old_fingerprints is None
+        or _join_path(prefix, label) in old_fingerprints
+    }
+    if removed:
+        get_objects_property(parent).removeObjects(list(removed.values()))
+        for label in removed:
+            changes["removed"].append(_join_path(prefix, label))
+
+
+def update_changed_objects(
+    session: fx.Session,
+    node: fx.Node,
+    import_file,
+    node_type: str
+) -> Dict[str, List[str]]:
+    """Update the node's objects with only the changes of a new import.
+
+    An object is replaced when its content changed between the previous and
+    the new file. A replaced object keeps its position among its siblings
+    and added objects are inserted after the preceding object of the file.
+    A changed layer is kept and its properties are updated in place, after
+    which its children are updated the same way. Objects removed by the
+    artist are only added again if they changed in the file.
+
+    Nodes without stored fingerprints, e.g. loaded before they were stored,
+    compare the new file with the current objects instead.
+
+    Arguments:
+        session (fx.Session): The session of the node.
+        node (fx.Node): The node to update.
+        import_file (Callable[[], None]): Imports the file into the active
+            node.
+        node_type (str): Node type of the scratch node to import into.
+
+    Returns:
+        Dict[str, List[str]]: The label paths of the objects that were
+            "added", "changed", "removed" and left "unchanged".
+
+    """
+    old_fingerprints = lib.read(node, key=OBJECT_FINGERPRINTS_KEY)
+    scratch = fx.Node(node_type)
+    session.addNode(scratch)
+    try:
+        fx.activate(scratch)
+        import_file()
+
+        new_fingerprints = get_object_fingerprints(scratch.children)
+        changes = {
+            "added": [],
+            "changed": [],
+            "removed": [],
+            "unchanged": [],
+        }
+        _update_children(
+            node, scratch, old_fingerprints, new_fingerprints, changes)
+    finally:
+        session.removeNode(scratch)
+        fx.activate(node)
+
+    lib.imprint(node, new_fingerprints, key=OBJECT_FINGERPRINTS_KEY)
+    return changes
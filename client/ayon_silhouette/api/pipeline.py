@@ -5,7 +5,7 @@ from pathlib import Path
 from functools import partial
 
 import pyblish.api
-from qtpy import QtCore
+from qtpy import QtCore, QtWidgets
 
 from ayon_core.host import HostBase, IWorkfileHost, ILoadHost, IPublishHost
 from ayon_core.tools.utils import host_tools
@@ -16,6 +16,7 @@ from ayon_core.pipeline import (
     # AYON_CONTAINER_ID,
     AYON_INSTANCE_ID,
     get_current_context,
+    get_current_project_name,
     registered_host
 )
 from ayon_core.pipeline.load import any_outdated_containers
@@ -23,7 +24,7 @@ from ayon_core.lib import emit_event, register_event_callback
 from ayon_core.pipeline.context_tools import get_current_task_entity
 from ayon_core.settings import get_current_project_settings
 from ayon_core.tools.workfile_template_build import open_template_ui
-from . import lib
+from . import lib, prefetch, proxies, sources
 from .workfile_template_builder import (
     SilhouetteTemplateBuilder,
     create_placeholder,
@@ -89,6 +90,7 @@ class SilhouetteHost(HostBase, IWorkfileHost, ILoadHost, IPublishHost):
 
         register_event_callback("open", on_open)
         register_event_callback("init", on_init)
+        register_event_callback("taskChanged", on_task_changed)
 
     def _install_menu(self):
         project_settings = get_current_project_settings()
@@ -167,6 +169,19 @@ class SilhouetteHost(HostBase, IWorkfileHost, ILoadHost, IPublishHost):
             action.setToolTip("Set active session resolution")
             action.triggered.connect(_on_set_resolution)
 
+        action = menu.addAction("Revert Sources to Network Paths")
+        action.setToolTip(
+            "Revert sources prefetched to the local cache to their original "
+            "network paths"
+        )
+        action.triggered.connect(lambda: prefetch.revert_to_network_paths())
+
+        action = menu.addAction("Report Duplicate Sources")
+        action.setToolTip(
+            "Report sources in the project that load the same media"
+        )
+        action.triggered.connect(_on_report_duplicate_sources)
+
         menu.addSeparator()
 
         # region Workfile templates
@@ -211,6 +226,15 @@ class SilhouetteHost(HostBase, IWorkfileHost, ILoadHost, IPublishHost):
         hook.add("post_save", partial(emit_event, "save"))
         hook.add("post_load", partial(emit_event, "open"))
         hook.add("session_created", partial(emit_event, "new"))
+
+        # Discard cached object enumerations when the sessions get replaced
+        for hook_name in ("post_load", "session_created"):
+            hook.add(hook_name, _on_invalidate_child_enum_items)
+
+        # Projects are saved with the paths of local copies and proxies, so
+        # validate them when the project is opened
+        hook.add("post_load", _on_restore_prefetched_sources)
+        hook.add("post_load", _on_restore_proxy_sources)
         # TODO: Detect a "save into another context" similar to Maya
 
     def open_workfile(self, filepath):
@@ -366,8 +390,16 @@ def iter_containers(project=None, session=None):
     # List all sources in project with `AYON` property
     for source in project.sources:
         data = parse_container(source, project=project)
-        if data:
-            yield data
+        if not data:
+            continue
+        yield data
+
+        # Additional loads that reuse the same source
+        for reference in sources.iter_reference_containers(source):
+            reference["schema"] = data["schema"]
+            reference["_item"] = source
+            reference["_project"] = project
+            yield reference
 
     if session is None:
         session = fx.activeSession()
@@ -436,6 +468,11 @@ def on_open():
     defer(_process)
 
 
+def on_task_changed():
+    # Query the anatomy again in case the project or its roots changed
+    lib.clear_anatomy_cache()
+
+
 def on_init():
     # The deferred timeout is to ensure if Silhouette was launched with a
     # startup file through AYON that Silhouette runs that first before this
@@ -449,6 +486,46 @@ def on_init():
     defer(_generate_default_session, timeout=500)
 
 
+def _on_invalidate_child_enum_items(*args, **kwargs):
+    lib.invalidate_child_enum_items()
+
+
+def _on_restore_prefetched_sources(*args, **kwargs):
+    loader_settings = get_current_project_settings()["silhouette"]["load"]
+    settings = loader_settings.get("SourceLoader", {})
+    if not settings.get("prefetch_to_local_cache") or not fx.gui:
+        prefetch.revert_to_network_paths()
+        return
+    cache = prefetch.get_prefetch_cache(
+        int(settings["prefetch_cache_size_gb"] * 1024 ** 3))
+    prefetch.restore_prefetched_sources(cache)
+
+
+def _on_restore_proxy_sources(*args, **kwargs):
+    loader_settings = get_current_project_settings()["silhouette"]["load"]
+    settings = loader_settings.get("SourceLoader", {})
+    if not settings.get("generate_proxies") or not fx.gui:
+        proxies.revert_proxy_sources()
+        return
+    cache = proxies.get_proxy_cache(
+        get_current_project_name(),
+        max_workers=settings["proxy_max_workers"]
+    )
+    proxies.restore_proxy_sources(cache)
+
+
+def _on_report_duplicate_sources():
+    """Show the sources in the active project that load the same media."""
+    report = sources.report_duplicate_sources()
+    summary, _, details = report.partition("\n\n")
+    message_box = QtWidgets.QMessageBox(lib.get_main_window())
+    message_box.setWindowTitle("Duplicate Sources")
+    message_box.setText(summary)
+    if details:
+        message_box.setDetailedText(details)
+    message_box.exec_()
+
+
 def _on_set_resolution():
     """Set active session resolution based on current task attributes."""
     session = fx.activeSession()
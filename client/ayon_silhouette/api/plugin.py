@@ -1,4 +1,7 @@
+import re
 import uuid
+from typing import List
+
 import fx
 
 from ayon_silhouette.api.pipeline import parse_container
@@ -11,7 +14,7 @@ from ayon_core.pipeline import (
 )
 from ayon_core.pipeline.load import LoadError
 from ayon_core.lib import BoolDef
-from . import lib
+from . import lib, object_diff
 
 INSTANCES_DATA_KEY = "AYON_instances"
 
@@ -83,6 +86,10 @@ class SilhouetteCreator(Creator):
         if not session:
             return
 
+        if pre_create_data.get("create_per_node"):
+            return self._create_per_node(
+                session, instance_data, pre_create_data)
+
         instance_node = None
         use_selection = pre_create_data.get("use_selection")
         selected_nodes = []
@@ -121,6 +128,13 @@ class SilhouetteCreator(Creator):
             instance_node.label = session.uniqueLabel(product_name)
         fx.activate(instance_node)
 
+        return self._create_instance(
+            instance_node, product_name, instance_data)
+
+    def _create_instance(
+        self, instance_node: fx.Node, product_name: str, instance_data: dict
+    ) -> CreatedInstance:
+        """Create and imprint the instance on the node."""
         # Use the uniqueness of the node in Silhouette as part of the instance
         # id, but because we support multiple instances per node, we also add
         # an uuid within the node to make duplicates of nodes still unique in
@@ -147,7 +161,79 @@ class SilhouetteCreator(Creator):
 
         return instance
 
+    def _create_per_node(
+        self,
+        session: fx.Session,
+        instance_data: dict,
+        pre_create_data: dict
+    ) -> List[CreatedInstance]:
+        """Create an instance on each selected or matching node at once.
+
+        Nodes of a valid type are imprinted directly. Without selection all
+        nodes of a valid type in the session are used. Nodes that already
+        have an instance of this creator are skipped. The product name of
+        each instance uses the variant followed by the node's label.
+        """
+        valid_node_types = self.valid_node_types or {self.create_node_type}
+        if pre_create_data.get("use_selection"):
+            candidates = [
+                node for node in fx.selection() if isinstance(node, fx.Node)]
+        else:
+            candidates = session.nodes
+
+        nodes = []
+        for node in candidates:
+            if node.type not in valid_node_types:
+                continue
+            instances_by_uuid = lib.read(node, key=INSTANCES_DATA_KEY) or {}
+            if any(
+                data.get("creator_identifier") == self.identifier
+                for data in instances_by_uuid.values()
+            ):
+                self.log.info(
+                    f"Skipping node with existing instance: {node.label}")
+                continue
+            nodes.append(node)
+
+        if not nodes:
+            raise CreatorError(
+                "No nodes found to create instances for. Valid node types "
+                f"are: {', '.join(sorted(valid_node_types))}"
+            )
+
+        create_context = self.create_context
+        project_name = create_context.get_current_project_name()
+        folder_entity = create_context.get_current_folder_entity()
+        task_entity = create_context.get_current_task_entity()
+        variant = instance_data.get("variant") or self.default_variant
+
+        instances = []
+        for node in nodes:
+            node_variant = variant + self._get_variant_suffix(node)
+            product_name = self.get_product_name(
+                project_name,
+                folder_entity,
+                task_entity,
+                node_variant,
+                create_context.host_name,
+            )
+            node_instance_data = dict(instance_data, variant=node_variant)
+            instances.append(
+                self._create_instance(node, product_name, node_instance_data)
+            )
+        self.log.info(f"Created {len(instances)} instances.")
+        return instances
+
+    def _get_variant_suffix(self, node: fx.Node) -> str:
+        """Return node label as valid variant suffix, e.g. `Roto1`."""
+        label = re.sub(r"[^a-zA-Z0-9]", "", node.label)
+        return label[:1].upper() + label[1:]
+
     def collect_instances(self):
+        # The publisher is refreshed, so list the current children of the
+        # instance nodes, see `lib.get_child_enum_items`
+        lib.invalidate_child_enum_items()
+
         shared_data = cache_instance_data(self.collection_shared_data)
         cached_instances = shared_data["silhouette_cached_instances"]
         for obj, instance_uuid, data in cached_instances.get(
@@ -216,7 +302,15 @@ class SilhouetteCreator(Creator):
         return [
             BoolDef("use_selection",
                     label="Use selection",
-                    default=True)
+                    default=True),
+            BoolDef("create_per_node",
+                    label="Create per node",
+                    default=False,
+                    tooltip=(
+                        "Create an instance on each selected node, or on "
+                        "all nodes of a valid type if use selection is "
+                        "disabled, using the node label in the variant."
+                    ))
         ]
 
     def _connect_input_to_first_matching_candidate(self, node, candidates):
@@ -248,6 +342,10 @@ class SilhouetteImportLoader(SilhouetteLoader):
     io_module: str
     node_type = "RotoNode"
 
+    # Replace only the changed objects on update instead of reimporting all
+    # objects, see `object_diff.update_changed_objects`
+    update_changed_objects_only = False
+
     options = [
         BoolDef(
             "use_selection",
@@ -260,8 +358,6 @@ class SilhouetteImportLoader(SilhouetteLoader):
         )
     ]
 
-    @lib.undo_chunk("Load")
-    @lib.maintained_selection()
     def load(self, context, name=None, namespace=None, options=None):
         """Merge the Alembic into the scene."""
         if not fx.activeProject():
@@ -271,17 +367,25 @@ class SilhouetteImportLoader(SilhouetteLoader):
         if options is None:
             options = {}
 
-        # Use selected node or create a new one to import to
+        # Consecutive loads share the selection restore and are laid out
+        # next to each other
+        with lib.batched_load("Load") as batch:
+            self._load(batch, context, name, namespace, options)
+
+    def _load(self, batch, context, name, namespace, options):
+        # Use selected node or create a new one to import to, using the
+        # selection from before the load batch started
         selection = [
-            _node for _node in fx.selection() if self.can_import_to_node(_node)
+            _node for _node in batch.selection
+            if self.can_import_to_node(_node)
         ]
         if options.get("use_selection", True) and selection:
             node = selection[0]
         else:
-            # Create a new node
+            # Create a new node, positioned next to the previous load
             node = fx.Node(self.node_type)
             fx.activeSession().addNode(node)
-            lib.set_new_node_position(node)
+            batch.add_node(node)
 
             # Label the newly generated using the product name
             node.label = context["product"]["name"]
@@ -289,6 +393,7 @@ class SilhouetteImportLoader(SilhouetteLoader):
         # Import the file
         fx.activate(node)
         filepath = self.filepath_from_context(context)
+        existing_ids = {child.id for child in node.children or []}
 
         try:
             fx.io_modules[self.io_module].importFile(filepath)
@@ -304,6 +409,13 @@ class SilhouetteImportLoader(SilhouetteLoader):
             raise
         self._process_loaded(context, node)
 
+        # Store the imported objects' content to update only the objects
+        # that changed in the file, see `object_diff`
+        object_diff.store_object_fingerprints(node, [
+            child for child in node.children or []
+            if child.id not in existing_ids
+        ])
+
         # property.hidden = True  # hide the attribute
         lib.imprint(node, data={
             "name": str(name),
@@ -320,14 +432,32 @@ class SilhouetteImportLoader(SilhouetteLoader):
     @lib.maintained_selection()
     def update(self, container, context):
         item: fx.Node = container["_item"]
+        filepath = self.filepath_from_context(context)
 
-        # Remove existing children
-        item.objects.removeObjects(item.children)
+        if self.update_changed_objects_only:
+            changes = object_diff.update_changed_objects(
+                container["_session"],
+                item,
+                lambda: fx.io_modules[self.io_module].importFile(filepath),
+                self.node_type
+            )
+            self.log.info(
+                f"Updated '{item.label}': {len(changes['added'])} added, "
+                f"{len(changes['changed'])} changed, "
+                f"{len(changes['removed'])} removed, "
+                f"{len(changes['unchanged'])} unchanged."
+            )
+            for change in ("added", "changed", "removed"):
+                for path in changes[change]:
+                    self.log.debug(f"{change.capitalize()}: {path}")
+        else:
+            # Remove existing children
+            item.objects.removeObjects(item.children)
 
-        # Import the file
-        fx.activate(item)
-        filepath = self.filepath_from_context(context)
-        fx.io_modules[self.io_module].importFile(filepath)
+            # Import the file
+            fx.activate(item)
+            fx.io_modules[self.io_module].importFile(filepath)
+            object_diff.store_object_fingerprints(item)
 
         # Update representation id
         data = lib.read(item)
@@ -0,0 +1,372 @@
+"""Prefetch loaded media to a local cache for smooth playback.
+
+The frames of a loaded source are copied from the network to a local cache
+directory in a background thread. Once copied, the source's path is
+remapped to the local copy on the main thread. The original network path
+is stored on the source in the `AYON_media` property, so it can be
+restored with `revert_to_network_paths`. The project is saved with the
+local path. When the project is opened, sources whose local copy is
+missing, e.g. on another workstation, are reverted to their network path
+and the others are fetched again, see `restore_prefetched_sources`.
+
+Local copies are validated against the network files' size and mtime and
+the least recently used copies are evicted above a size limit. Copies that
+are in use by a running process are never evicted.
+"""
+import concurrent.futures
+import contextlib
+import json
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+import fx
+
+from . import lib, loading, locks, media
+
+log = logging.getLogger(__name__)
+
+MEDIA_DATA_KEY = "AYON_media"
+INDEX_FILENAME = "index.json"
+
+# Source path with a frame range, e.g. `/path/plate.[1001-1100].exr`
+SOURCE_RANGE_PATTERN = re.compile(
+    r"^(?P<head>.*)\[(?P<start>\d+)-(?P<end>\d+)\](?P<tail>[^\[\]]*)$"
+)
+
+
+def get_prefetch_dir() -> str:
+    """Return the local directory to prefetch the media to."""
+    return os.environ.get(
+        "AYON_SILHOUETTE_PREFETCH_DIR",
+        os.path.join(media.get_cache_dir(), "prefetch")
+    )
+
+
+def get_source_files(path: str) -> List[str]:
+    """Return all file paths of a source path, expanding a frame range."""
+    match = SOURCE_RANGE_PATTERN.match(path)
+    if not match:
+        return [path]
+    padding = len(match.group("start"))
+    head, tail = match.group("head"), match.group("tail")
+    return [
+        f"{head}{frame:0{padding}d}{tail}"
+        for frame in range(int(match.group("start")),
+                           int(match.group("end")) + 1)
+    ]
+
+
+def _is_same_file(source: str, destination: str) -> bool:
+    try:
+        source_stat = os.stat(source)
+        destination_stat = os.stat(destination)
+    except OSError:
+        return False
+    # Allow for filesystems with a lower mtime resolution
+    return (
+        source_stat.st_size == destination_stat.st_size
+        and abs(source_stat.st_mtime - destination_stat.st_mtime) < 2
+    )
+
+
+def _is_process_running(pid: int) -> bool:
+    """Return whether a local process is running, assumed if unknown."""
+    if pid == os.getpid():
+        return True
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == "nt":
+        # `os.kill` would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _remove_files(paths: List[str]):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            log.debug(f"Unable to remove prefetched file: {exc}")
+
+
+class PrefetchCache:
+    """Local copies of media sequences with LRU eviction.
+
+    The files of a source are copied into a directory named by the hash of
+    the network source path including its frame range, so sources with
+    overlapping frame ranges never share files. The index stores per
+    network source path the local path, the size of its files, the last
+    access time and the ids of the processes using the copy. It is updated
+    under an inter-process lock and replaced atomically on each write.
+
+    The files are copied by the cache's own thread pool, so prefetching does
+    not hold up the preparation of loads.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_size: int = 100 * 1024 ** 3,
+        max_workers: int = 2
+    ):
+        self.directory = directory or get_prefetch_dir()
+        self.max_size = max_size
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="ayon_silhouette_prefetch"
+        )
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILENAME)
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.index_path}.lock"
+
+    def get_local_path(self, network_path: str) -> str:
+        """Return the local cache path for a network source path."""
+        key = hashlib.blake2b(
+            self.get_index_key(network_path).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        return os.path.join(
+            self.directory, key, os.path.basename(network_path))
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict[str, dict]):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".index_", suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def get_index_key(network_path: str) -> str:
+        return os.path.normcase(os.path.normpath(network_path))
+
+    def fetch(self, network_path: str) -> str:
+        """Copy the source's files to the local cache.
+
+        Files that already match the network file's size and mtime are not
+        copied again. The copy is registered as in use by this process until
+        it is released with `release`. This does not call into `fx` so it
+        can run in a background thread.
+
+        Returns:
+            str: The local source path.
+
+        """
+        local_path = self.get_local_path(network_path)
+        local_dir = os.path.dirname(local_path)
+        os.makedirs(local_dir, exist_ok=True)
+
+        size = 0
+        for network_file, local_file in zip(
+            get_source_files(network_path), get_source_files(local_path)
+        ):
+            if not _is_same_file(network_file, local_file):
+                self._copy(network_file, local_file)
+            size += os.path.getsize(local_file)
+
+        key = self.get_index_key(network_path)
+        with locks.file_lock(self.lock_path):
+            index = self._read_index()
+            pids = set(index.get(key, {}).get("pids", []))
+            pids.add(os.getpid())
+            index[key] = {
+                "local": local_path,
+                "size": size,
+                "atime": time.time(),
+                "pids": sorted(pids),
+            }
+            self._evict(index, keep=key)
+            self._write_index(index)
+        return local_path
+
+    @staticmethod
+    def _copy(network_file: str, local_file: str):
+        # Copy to a unique temporary file first so an interrupted copy is
+        # never mistaken for a complete file, also with concurrent fetches
+        fd, tmp_file = tempfile.mkstemp(
+            prefix=".", suffix=".tmp", dir=os.path.dirname(local_file))
+        os.close(fd)
+        try:
+            shutil.copy2(network_file, tmp_file)
+            os.replace(tmp_file, local_file)
+        except BaseException:
+            _remove_files([tmp_file])
+            raise
+
+    def release(self, network_path: str):
+        """Unregister this process as user of the source's local copy."""
+        key = self.get_index_key(network_path)
+        with locks.file_lock(self.lock_path):
+            index = self._read_index()
+            entry = index.get(key)
+            if not entry or os.getpid() not in entry.get("pids", []):
+                return
+            entry["pids"].remove(os.getpid())
+            self._write_index(index)
+
+    def _evict(self, index: Dict[str, dict], keep: str):
+        """Remove least recently used copies above the size limit.
+
+        Copies in use by a running process are kept, even if that exceeds
+        the size limit.
+        """
+        total = sum(entry.get("size", 0) for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k].get("atime", 0)):
+            if total <= self.max_size:
+                break
+            entry = index[key]
+            if key == keep or any(
+                _is_process_running(pid) for pid in entry.get("pids", [])
+            ):
+                continue
+
+            local_path = entry.get("local")
+            if local_path:
+                log.debug(f"Evicting prefetched media: {local_path}")
+                _remove_files(get_source_files(local_path))
+                with contextlib.suppress(OSError):
+                    os.rmdir(os.path.dirname(local_path))
+            total -= entry.get("size", 0)
+            del index[key]
+
+
+def _get_proxies():
+    # Imported on use since `proxies` imports this module
+    from . import proxies
+    return proxies
+
+
+def prefetch_source(source: fx.Source, cache: PrefetchCache):
+    """Prefetch the source's media and remap its path once copied.
+
+    A source showing a proxy keeps it, the local copy is then used when
+    switching to full resolution.
+    """
+    proxies = _get_proxies()
+    network_path = proxies.get_media_path(source)
+
+    def apply(local_path: str):
+        if proxies.get_media_path(source) != network_path:
+            # The source was updated or reverted in the meantime
+            return
+        lib.imprint(
+            source,
+            {"networkPath": network_path, "localPath": local_path},
+            key=MEDIA_DATA_KEY
+        )
+        path_property = source.property("path")
+        if not proxies.is_proxy_active(source) and (
+                path_property.value != local_path):
+            path_property.value = local_path
+        log.debug(f"Remapped source '{source.label}' to: {local_path}")
+
+    loading.get_load_dispatcher().submit(
+        f"Prefetch {source.label}",
+        lambda: cache.fetch(network_path),
+        apply,
+        show_progress=False,
+        executor=cache.executor
+    )
+
+
+def get_network_path(source: fx.Source) -> Optional[str]:
+    """Return the network path of a prefetched source, if prefetched."""
+    data = lib.read(source, key=MEDIA_DATA_KEY)
+    if data:
+        return data.get("networkPath")
+
+
+def revert_source(source: fx.Source):
+    """Restore the network path of a prefetched source."""
+    network_path = get_network_path(source)
+    if network_path:
+        if not _get_proxies().is_proxy_active(source):
+            source.property("path").value = network_path
+        lib.imprint(source, None, key=MEDIA_DATA_KEY)
+        if _cache is not None:
+            _cache.release(network_path)
+
+
+@lib.undo_chunk("Revert to network paths")
+def revert_to_network_paths(project: Optional[fx.Project] = None):
+    """Restore the network path of all prefetched sources in the project."""
+    if project is None:
+        project = fx.activeProject()
+    if not project:
+        return
+    for source in project.sources:
+        revert_source(source)
+
+
+def _is_local_copy_complete(source: fx.Source) -> bool:
+    data = lib.read(source, key=MEDIA_DATA_KEY) or {}
+    local_path = data.get("localPath")
+    return bool(local_path) and all(
+        map(os.path.isfile, get_source_files(local_path)))
+
+
+def restore_prefetched_sources(
+    cache: PrefetchCache,
+    project: Optional[fx.Project] = None
+):
+    """Validate the prefetched sources of an opened project.
+
+    Sources whose local copy is missing, e.g. because it was evicted or the
+    project was saved on another workstation, are reverted to their network
+    path. All prefetched sources are fetched again, which registers their
+    copy as in use and only copies files whose local copy is outdated or
+    missing.
+    """
+    if project is None:
+        project = fx.activeProject()
+    if not project:
+        return
+    for source in project.sources:
+        network_path = get_network_path(source)
+        if not network_path:
+            continue
+        if not _is_local_copy_complete(source):
+            revert_source(source)
+        prefetch_source(source, cache)
+
+
+_cache: Optional[PrefetchCache] = None
+
+
+def get_prefetch_cache(max_size: int) -> PrefetchCache:
+    """Return the shared prefetch cache with the given size limit."""
+    global _cache
+    if _cache is None:
+        _cache = PrefetchCache()
+    _cache.max_size = max_size
+    return _cache
@@ -0,0 +1,316 @@
+"""Generate lower resolution proxies of loaded sources in the background.
+
+Proxies are written with oiiotool by a local process pool into a cache
+directory per project. Once all frames of a source are written, the source
+is switched to the proxy on the main thread. The full resolution path is
+stored on the source in the `AYON_proxy` property, so renders can switch
+back to full resolution with `full_resolution_sources`. Like prefetched
+local copies, the project is saved with the proxy path. When the project
+is opened, sources whose proxy is missing are switched to full resolution
+until the proxy is generated again, see `restore_proxy_sources`.
+
+A source can be both prefetched and use a proxy. The proxy is shown and
+the local copy is used when switching to full resolution.
+
+A JSON index per project keeps the state of each proxy, so a proxy that
+was generated before is reused instead of being generated again.
+"""
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import fx
+
+from ayon_core.lib import get_oiio_tool_args
+from ayon_core.lib.transcoding import VIDEO_EXTENSIONS
+
+from . import lib, loading, locks, media, prefetch, render
+from .prefetch import get_source_files
+
+log = logging.getLogger(__name__)
+
+PROXY_DATA_KEY = "AYON_proxy"
+INDEX_FILENAME = "index.json"
+
+# Resize percentage per proxy scale
+PROXY_SCALES = {
+    "half": 50,
+    "quarter": 25,
+}
+
+
+def get_proxy_args(
+    oiiotool_args: List[str],
+    input_path: str,
+    scale: str,
+    output_path: str
+) -> List[str]:
+    """Return oiiotool arguments to write a proxy of an image.
+
+    All subimages are resized and written as half float EXR with DWAA
+    compression, which is lighter to decode than the full resolution media.
+    """
+    return list(oiiotool_args) + [
+        "-a", input_path,
+        "--resize", f"{PROXY_SCALES[scale]}%",
+        "-d", "half",
+        "--compression", "dwaa",
+        "-o", output_path,
+    ]
+
+
+class ProxyCache:
+    """Proxies of one project with a persistent index of their state.
+
+    Each source's proxy is generated by the cache's own thread pool, which
+    waits for the frames written by the process pool, so the generation
+    does not hold up the load dispatcher's workers.
+    """
+
+    def __init__(self, project_name: str, max_workers: int = 2):
+        self.directory = os.path.join(
+            media.get_cache_dir(), "proxies", project_name)
+        self.max_workers = max_workers
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="ayon_silhouette_proxy"
+        )
+        self._lock = threading.Lock()
+        self._pool: Optional[render.ProcessPool] = None
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILENAME)
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.index_path}.lock"
+
+    @staticmethod
+    def get_index_key(path: str, scale: str) -> str:
+        return f"{os.path.normcase(os.path.normpath(path))}|{scale}"
+
+    def get_proxy_path(self, path: str, scale: str) -> str:
+        """Return the proxy source path for a full resolution path."""
+        directory, filename = os.path.split(path)
+        key = hashlib.blake2b(
+            os.path.normcase(directory).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        filename = f"{os.path.splitext(filename)[0]}.exr"
+        return os.path.join(self.directory, f"{key}_{scale}", filename)
+
+    def read_index(self) -> Dict[str, dict]:
+        """Return the proxy state per full resolution path and scale."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _update_index(self, key: str, entry: dict):
+        with locks.file_lock(self.lock_path):
+            index = self.read_index()
+            index[key] = entry
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=".index_", suffix=".tmp", dir=self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+
+    def generate(self, path: str, scale: str) -> str:
+        """Write the proxy frames of a source path, waiting for completion.
+
+        Frames of a previously completed proxy are not written again. This
+        does not call into `fx` so it can run in a background thread.
+
+        Returns:
+            str: The proxy source path.
+
+        """
+        key = self.get_index_key(path, scale)
+        proxy_path = self.get_proxy_path(path, scale)
+        if self.read_index().get(key, {}).get("status") == "done":
+            if all(map(os.path.isfile, get_source_files(proxy_path))):
+                return proxy_path
+            log.debug(f"Proxy frames are missing, generating: {proxy_path}")
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = render.ProcessPool(self.max_workers)
+            pool = self._pool
+
+        os.makedirs(os.path.dirname(proxy_path), exist_ok=True)
+        oiiotool_args = get_oiio_tool_args("oiiotool")
+        files = list(zip(get_source_files(path), get_source_files(proxy_path)))
+        self._update_index(key, {
+            "proxy": proxy_path,
+            "status": "pending",
+            "frames": len(files),
+        })
+        futures = [
+            pool.submit(get_proxy_args(
+                oiiotool_args, input_path, scale, output_path))
+            for input_path, output_path in files
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            self._update_index(key, {
+                "proxy": proxy_path,
+                "status": "failed",
+                "frames": len(files),
+            })
+            raise
+
+        self._update_index(key, {
+            "proxy": proxy_path,
+            "status": "done",
+            "frames": len(files),
+        })
+        return proxy_path
+
+
+_caches: Dict[str, ProxyCache] = {}
+
+
+def get_proxy_cache(project_name: str, max_workers: int = 2) -> ProxyCache:
+    """Return the shared proxy cache of a project."""
+    cache = _caches.get(project_name)
+    if cache is None:
+        cache = ProxyCache(project_name, max_workers=max_workers)
+        _caches[project_name] = cache
+    return cache
+
+
+def get_media_path(source: fx.Source) -> str:
+    """Return the original media path of the source.
+
+    Sources remapped to a prefetched local copy or to a proxy return the
+    path they were loaded from.
+    """
+    path = prefetch.get_network_path(source)
+    if not path:
+        data = lib.read(source, key=PROXY_DATA_KEY) or {}
+        path = data.get("fullResPath")
+    return path or source.property("path").value
+
+
+def is_proxy_active(source: fx.Source) -> bool:
+    """Return whether the source currently shows its proxy."""
+    data = lib.read(source, key=PROXY_DATA_KEY) or {}
+    proxy_path = data.get("proxyPath")
+    return bool(proxy_path) and (
+        source.property("path").value == proxy_path)
+
+
+def get_full_resolution_path(source: fx.Source) -> str:
+    """Return the prefetched local copy or otherwise the media path."""
+    data = lib.read(source, key=prefetch.MEDIA_DATA_KEY) or {}
+    return data.get("localPath") or get_media_path(source)
+
+
+def generate_source_proxy(
+    source: fx.Source, cache: ProxyCache, scale: str = "half"
+):
+    """Generate a proxy of the source and switch the source to it."""
+    path = get_media_path(source)
+    if os.path.splitext(path)[-1].lower() in VIDEO_EXTENSIONS:
+        log.debug(f"Skipping proxy of video source: {source.label}")
+        return
+
+    def apply(proxy_path: str):
+        if get_media_path(source) != path:
+            # The source was updated in the meantime
+            return
+        lib.imprint(
+            source,
+            {"fullResPath": path, "proxyPath": proxy_path, "scale": scale},
+            key=PROXY_DATA_KEY
+        )
+        path_property = source.property("path")
+        if path_property.value != proxy_path:
+            path_property.value = proxy_path
+        log.debug(f"Switched source '{source.label}' to proxy: {proxy_path}")
+
+    loading.get_load_dispatcher().submit(
+        f"Proxy {source.label}",
+        lambda: cache.generate(path, scale),
+        apply,
+        show_progress=False,
+        executor=cache.executor
+    )
+
+
+def restore_proxy_sources(
+    cache: ProxyCache,
+    project: Optional[fx.Project] = None
+):
+    """Validate the proxies of the sources of an opened project.
+
+    Sources whose proxy is missing, e.g. because the project was saved on
+    another workstation, are switched to full resolution. The proxies of all
+    sources are generated again, which reuses the frames of completed
+    proxies, and the sources are switched to them once written.
+    """
+    if project is None:
+        project = fx.activeProject()
+    if not project:
+        return
+    for source in project.sources:
+        data = lib.read(source, key=PROXY_DATA_KEY)
+        if not data or not data.get("fullResPath"):
+            continue
+        if is_proxy_active(source) and not all(
+            map(os.path.isfile, get_source_files(data["proxyPath"]))
+        ):
+            source.property("path").value = get_full_resolution_path(source)
+        generate_source_proxy(
+            source, cache, scale=data.get("scale", "half"))
+
+
+def revert_proxy_sources(project: Optional[fx.Project] = None):
+    """Switch all sources using a proxy to full resolution permanently."""
+    if project is None:
+        project = fx.activeProject()
+    if not project:
+        return
+    for source in project.sources:
+        if not lib.read(source, key=PROXY_DATA_KEY):
+            continue
+        if is_proxy_active(source):
+            source.property("path").value = get_full_resolution_path(source)
+        lib.imprint(source, None, key=PROXY_DATA_KEY)
+
+
+@contextlib.contextmanager
+def full_resolution_sources(project: Optional[fx.Project] = None):
+    """Switch sources using proxies to full resolution during the context.
+
+    Prefetched sources are switched to their local copy.
+    """
+    if project is None:
+        project = fx.activeProject()
+
+    switched = []
+    try:
+        for source in project.sources if project else []:
+            if not is_proxy_active(source):
+                continue
+            path_property = source.property("path")
+            switched.append((path_property, path_property.value))
+            path_property.value = get_full_resolution_path(source)
+        if switched:
+            log.debug(
+                f"Switched {len(switched)} sources to full resolution.")
+        yield
+    finally:
+        for path_property, proxy_path in switched:
+            path_property.value = proxy_path
@@ -0,0 +1,972 @@
+"""Render helpers for Silhouette publishing."""
+import concurrent.futures
+import contextlib
+import errno
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import operator
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+from .image_headers import ImageHeaderError, read_image_header
+
+log = logging.getLogger(__name__)
+
+CHECKSUM_ALGORITHM = "blake2b"
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+def get_process_rss() -> Optional[int]:
+    """Return the current memory usage of this process in bytes.
+
+    Requires `psutil`, returns None if it is not available.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+
+def get_process_peak_rss() -> Optional[int]:
+    """Return the peak memory usage of this process in bytes.
+
+    This is the peak over the lifetime of the process as reported by the
+    `resource` module, so it includes anything before the render. Returns
+    None if the `resource` module is not available.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == "darwin":
+        return max_rss
+    return max_rss * 1024
+
+
+class RenderStatsProgress:
+    """Progress handler wrapper that records render statistics.
+
+    All calls the renderer makes on the wrapped progress handler, like
+    `PreviewProgressHandler` or `CommandLineProgress`, are passed through
+    unchanged. Each call is used as a sampling point for the memory usage
+    of the process, throttled to `sample_interval` seconds.
+
+    Without `psutil` the memory usage during the render can not be sampled
+    and only the peak memory usage of the whole process is recorded, as
+    `process_peak_rss`.
+
+    Call `start` before rendering and `stop` when it finished. The frame
+    timings are resolved afterwards from the rendered files, see
+    `get_frame_times`.
+
+    An `on_progress` callback is called at each sampling point, e.g. to
+    commit the frames rendered so far with a `FrameCommitter`.
+    """
+
+    _own_attributes = {
+        "_handler",
+        "_sample_interval",
+        "_on_progress",
+        "_last_sample",
+        "start_time",
+        "end_time",
+        "peak_rss",
+        "process_peak_rss",
+    }
+
+    def __init__(
+        self,
+        handler,
+        sample_interval: float = 0.25,
+        on_progress: Optional[Callable[[], None]] = None
+    ):
+        self._handler = handler
+        self._sample_interval = sample_interval
+        self._on_progress = on_progress
+        self._last_sample: float = 0.0
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.peak_rss: Optional[int] = None
+        self.process_peak_rss: Optional[int] = None
+
+    def __getattr__(self, name):
+        attr = getattr(self._handler, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def wrapper(*args, **kwargs):
+            self.sample()
+            return attr(*args, **kwargs)
+
+        return wrapper
+
+    def __setattr__(self, name, value):
+        if name in self._own_attributes:
+            super().__setattr__(name, value)
+        else:
+            setattr(self._handler, name, value)
+
+    def start(self):
+        self.start_time = time.time()
+        self.sample(force=True)
+
+    def stop(self):
+        self.end_time = time.time()
+        self.sample(force=True)
+
+    def sample(self, force: bool = False):
+        """Sample the process memory usage."""
+        now = time.monotonic()
+        if not force and now - self._last_sample < self._sample_interval:
+            return
+        self._last_sample = now
+
+        if self._on_progress is not None:
+            self._on_progress()
+
+        rss = get_process_rss()
+        if rss is None:
+            self.process_peak_rss = get_process_peak_rss()
+        elif self.peak_rss is None or rss > self.peak_rss:
+            self.peak_rss = rss
+
+
+def get_frame_times(
+    filepaths_by_frame: Iterable[Tuple[int, List[str]]],
+    start_time: float
+) -> Dict[int, float]:
+    """Return render duration per frame from the rendered files.
+
+    The completion time of a frame is the latest modification time of its
+    output files. Frames are expected to render in ascending order, so the
+    duration of a frame is the time since the previous frame completed, or
+    since `start_time` for the first frame.
+
+    Arguments:
+        filepaths_by_frame (Iterable[Tuple[int, List[str]]]): Output files
+            per frame in ascending frame order, see
+            `iter_filepaths_by_frame`.
+        start_time (float): Timestamp at which the render started.
+
+    Returns:
+        Dict[int, float]: Render duration in seconds per frame.
+
+    """
+    frame_times = {}
+    previous = start_time
+    for frame, filepaths in filepaths_by_frame:
+        mtimes = [
+            os.path.getmtime(path) for path in filepaths
+            if os.path.exists(path)
+        ]
+        if not mtimes:
+            continue
+        completed = max(mtimes)
+        frame_times[frame] = max(completed - previous, 0.0)
+        previous = max(completed, previous)
+    return frame_times
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of sorted `values`."""
+    index = max(int(round(percentile / 100.0 * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def compute_render_stats(
+    progress: RenderStatsProgress,
+    frame_times: Dict[int, float]
+) -> Dict[str, Any]:
+    """Return a summary of the render statistics.
+
+    Arguments:
+        progress (RenderStatsProgress): The progress handler used for the
+            render.
+        frame_times (Dict[int, float]): Render duration per frame.
+
+    Returns:
+        Dict[str, Any]: Frame time statistics in seconds and peak memory
+            usage in bytes. `peakMemory` is the peak during the render,
+            `processPeakMemory` the peak of the whole process when the
+            former could not be sampled.
+
+    """
+    stats: Dict[str, Any] = {
+        "frames": len(frame_times),
+        "totalTime": None,
+        "frameTimeMin": None,
+        "frameTimeMedian": None,
+        "frameTimeP95": None,
+        "frameTimeMax": None,
+        "peakMemory": progress.peak_rss,
+        "processPeakMemory": progress.process_peak_rss,
+    }
+    if progress.start_time is not None and progress.end_time is not None:
+        stats["totalTime"] = progress.end_time - progress.start_time
+
+    if frame_times:
+        values = sorted(frame_times.values())
+        stats.update({
+            "frameTimeMin": values[0],
+            "frameTimeMedian": statistics.median(values),
+            "frameTimeP95": _percentile(values, 95),
+            "frameTimeMax": values[-1],
+        })
+        slowest = max(frame_times, key=frame_times.get)
+        stats["slowestFrame"] = slowest
+
+    return stats
+
+
+def write_render_stats(
+    path: str,
+    stats: Dict[str, Any],
+    frame_times: Dict[int, float]
+):
+    """Write the render statistics to a JSON sidecar file."""
+    data = dict(stats)
+    data["frameTimes"] = {
+        str(frame): duration for frame, duration in frame_times.items()
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+    log.debug(f"Written render statistics to: {path}")
+
+
+class FrameSequence:
+    """Compact description of a frame sequence on disk.
+
+    A path of a frame is `{head}{frame:0{padding}d}{tail}`. The frames are
+    described by inclusive (start, end) ranges so that sequences with gaps
+    are supported without listing each frame.
+
+    Arguments:
+        head (str): Path up to the frame number.
+        padding (int): Minimum number of digits of the frame number.
+        tail (str): Path after the frame number.
+        ranges (List[Tuple[int, int]]): Inclusive frame ranges.
+
+    """
+
+    def __init__(
+        self,
+        head: str,
+        padding: int,
+        tail: str,
+        ranges: List[Tuple[int, int]]
+    ):
+        self.head = head
+        self.padding = padding
+        self.tail = tail
+        self.ranges = list(ranges)
+
+    def __repr__(self):
+        ranges = ", ".join(
+            str(start) if start == end else f"{start}-{end}"
+            for start, end in self.ranges
+        )
+        return (
+            f"<FrameSequence {self.head}{'#' * self.padding}{self.tail} "
+            f"[{ranges}]>"
+        )
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    @classmethod
+    def from_output(cls, output, start: int, end: int) -> "FrameSequence":
+        """Describe the frames of a render output.
+
+        Only the first and last frame paths are built through the output's
+        `buildPath` and the frame token is detected from their difference.
+
+        Arguments:
+            output: The render output with a `buildPath(frame)` method.
+            start (int): First frame.
+            end (int): Last frame.
+
+        Returns:
+            FrameSequence: The frame sequence.
+
+        """
+        first = output.buildPath(start)
+        if start == end:
+            return cls.from_path(first, start, end)
+
+        last = output.buildPath(end)
+        prefix = os.path.commonprefix([first, last])
+        suffix = os.path.commonprefix([first[::-1], last[::-1]])[::-1]
+        # Shared leading or trailing digits belong to the frame number
+        while prefix and prefix[-1].isdigit():
+            prefix = prefix[:-1]
+        while suffix and suffix[0].isdigit():
+            suffix = suffix[1:]
+
+        token = first[len(prefix):len(first) - len(suffix)]
+        last_token = last[len(prefix):len(last) - len(suffix)]
+        if (
+            not token.isdigit()
+            or not last_token.isdigit()
+            or int(token) != start
+            or int(last_token) != end
+        ):
+            return cls.from_path(first, start, end)
+        return cls(prefix, len(token), suffix, [(start, end)])
+
+    @classmethod
+    def from_path(cls, path: str, start: int, end: int) -> "FrameSequence":
+        """Describe frames `start` to `end` from the path of frame `start`.
+
+        The rightmost occurrence of the start frame number in the file name
+        is considered to be the frame token.
+        """
+        directory, filename = os.path.split(path)
+        matches = [
+            match for match in re.finditer(r"\d+", filename)
+            if int(match.group()) == start
+        ]
+        if not matches:
+            raise ValueError(f"Frame {start} not found in path: {path}")
+        match = matches[-1]
+        head = os.path.join(directory, filename[:match.start()])
+        tail = filename[match.end():]
+        return cls(head, len(match.group()), tail, [(start, end)])
+
+    def relocated(self, directory: str) -> "FrameSequence":
+        """Return the same sequence inside another directory."""
+        return FrameSequence(
+            os.path.join(directory, os.path.basename(self.head)),
+            self.padding,
+            self.tail,
+            self.ranges
+        )
+
+    def frames(self) -> Iterator[int]:
+        for start, end in self.ranges:
+            yield from range(start, end + 1)
+
+    def path(self, frame: int) -> str:
+        return f"{self.head}{frame:0{self.padding}d}{self.tail}"
+
+    def paths(self) -> Iterator[str]:
+        for frame in self.frames():
+            yield self.path(frame)
+
+    def filenames(self) -> List[str]:
+        """Return the file names of all frames, e.g. for representations."""
+        head = os.path.basename(self.head)
+        return [
+            f"{head}{frame:0{self.padding}d}{self.tail}"
+            for frame in self.frames()
+        ]
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(self.head)
+
+    @property
+    def printf_pattern(self) -> str:
+        """Path with a printf frame token, e.g. `/path/beauty.%04d.exr`."""
+        token = f"%0{self.padding}d" if self.padding > 1 else "%d"
+        return f"{self.head}{token}{self.tail}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "head": self.head,
+            "padding": self.padding,
+            "tail": self.tail,
+            "ranges": [list(frame_range) for frame_range in self.ranges],
+        }
+
+
+def iter_filepaths_by_frame(
+    sequences: List[FrameSequence]
+) -> Iterator[Tuple[int, List[str]]]:
+    """Yield the paths of all sequences per frame in ascending order.
+
+    The paths are built while iterating, so the frames of the sequences do
+    not need to be expanded up front.
+    """
+    def _iter_paths(sequence: FrameSequence):
+        for frame in sequence.frames():
+            yield frame, sequence.path(frame)
+
+    paths = heapq.merge(
+        *(_iter_paths(sequence) for sequence in sequences),
+        key=operator.itemgetter(0)
+    )
+    for frame, frame_paths in itertools.groupby(
+        paths, key=operator.itemgetter(0)
+    ):
+        yield frame, [path for _frame, path in frame_paths]
+
+
+@contextlib.contextmanager
+def render_path_override(output_node, directory: str):
+    """Temporarily render an output node into another directory.
+
+    The file name of the output node's path is preserved.
+    """
+    original_path = output_node.path.value
+    os.makedirs(directory, exist_ok=True)
+    output_node.path.value = os.path.join(
+        directory, os.path.basename(original_path))
+    try:
+        yield
+    finally:
+        output_node.path.value = original_path
+
+
+def commit_file(path: str, destination: str) -> str:
+    """Move a file into `destination` with an atomic rename.
+
+    When the destination is on another filesystem the file is copied to a
+    temporary file in the destination first, which is then renamed, so the
+    file still appears in the destination either completely or not at all.
+
+    Returns:
+        str: The committed file path.
+
+    """
+    target = os.path.join(destination, os.path.basename(path))
+    try:
+        os.replace(path, target)
+        return target
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", dir=destination)
+    os.close(fd)
+    try:
+        shutil.copy2(path, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.remove(path)
+    return target
+
+
+def commit_frames(filepaths: List[str], destination: str) -> List[str]:
+    """Move rendered frames into `destination` with atomic renames.
+
+    Each frame appears in the destination either completely or not at all,
+    see `commit_file`. Frames that do not exist, for example because they
+    were already committed by a `FrameCommitter`, are not moved, but their
+    destination path is still returned so verification can report them as
+    missing. Emptied source directories are removed afterwards.
+
+    Arguments:
+        filepaths (List[str]): Rendered frame paths.
+        destination (str): Directory to commit the frames into.
+
+    Returns:
+        List[str]: The committed frame paths, in order of `filepaths`.
+
+    """
+    committed = []
+    source_dirs = set()
+    for path in filepaths:
+        if os.path.exists(path):
+            committed.append(commit_file(path, destination))
+            source_dirs.add(os.path.dirname(path))
+        else:
+            committed.append(
+                os.path.join(destination, os.path.basename(path)))
+
+    for source_dir in source_dirs:
+        try:
+            os.rmdir(source_dir)
+        except OSError:
+            log.debug(f"Keeping non-empty render folder: {source_dir}")
+    return committed
+
+
+class FrameCommitter:
+    """Commit the frames of a render directory while the render continues.
+
+    The renderer writes one file at a time, so every file in the render
+    directory that is older than the most recently modified file has been
+    written completely and is committed into the destination with
+    `commit_file`. Call `commit_finished` from the progress callbacks of
+    the render, see `RenderStatsProgress`, and commit the remaining frames
+    with `commit_frames` once the render finished.
+
+    Arguments:
+        directory (str): The directory the frames are rendered into.
+        destination (str): Directory to commit the frames into.
+
+    """
+
+    def __init__(self, directory: str, destination: str):
+        self.directory = directory
+        self.destination = destination
+        self.committed: List[str] = []
+
+    def commit_finished(self) -> List[str]:
+        """Commit the frames that were written completely.
+
+        Failures are logged and the frame is left in place so it can be
+        committed after the render, since raising would abort the render.
+
+        Returns:
+            List[str]: The frame paths committed by this call.
+
+        """
+        try:
+            with os.scandir(self.directory) as entries:
+                files = [
+                    (entry.stat().st_mtime, entry.path) for entry in entries
+                    if entry.is_file()
+                ]
+        except OSError:
+            return []
+        if len(files) < 2:
+            return []
+
+        latest = max(mtime for mtime, _path in files)
+        committed = []
+        for mtime, path in sorted(files):
+            if mtime >= latest:
+                continue
+            try:
+                committed.append(commit_file(path, self.destination))
+            except OSError as exc:
+                log.warning(f"Unable to commit rendered frame {path}: {exc}")
+        self.committed.extend(committed)
+        return committed
+
+
+def get_file_checksum(path: str) -> str:
+    """Return checksum of the file contents using `CHECKSUM_ALGORITHM`."""
+    checksum = hashlib.new(CHECKSUM_ALGORITHM, digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def verify_frame(path: str, checksum: bool = True) -> Dict[str, Any]:
+    """Verify a single rendered frame.
+
+    Checks whether the file exists, is not empty and, for supported formats,
+    whether its image header is valid and the file was written completely.
+
+    Arguments:
+        path (str): Path to the frame.
+        checksum (bool): Whether to compute the checksum of the file.
+
+    Returns:
+        Dict[str, Any]: Verification result with `path`, `size`, `checksum`
+            and `dataWindow`. On failure an `error` category and `message`
+            are included.
+
+    """
+    result: Dict[str, Any] = {"path": path}
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        result.update({"error": "missing", "message": "File does not exist"})
+        return result
+
+    result["size"] = size
+    if not size:
+        result.update({"error": "empty", "message": "File is empty"})
+        return result
+
+    try:
+        header = read_image_header(path)
+    except (ImageHeaderError, OSError) as exc:
+        result.update({"error": "invalid", "message": str(exc)})
+        return result
+    if header:
+        result["dataWindow"] = header.get("dataWindow")
+
+    if checksum:
+        result["checksum"] = get_file_checksum(path)
+    return result
+
+
+def verify_frames(
+    filepaths_by_frame: Iterable[Tuple[int, List[str]]],
+    max_workers: Optional[int] = None,
+    checksum: bool = True
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Verify rendered frames in a thread pool.
+
+    Reading headers and computing checksums is I/O bound and `hashlib`
+    releases the GIL for large buffers, so frames verify concurrently.
+
+    Arguments:
+        filepaths_by_frame (Iterable[Tuple[int, List[str]]]): Output files
+            per frame, see `iter_filepaths_by_frame`.
+        max_workers (Optional[int]): Maximum number of threads.
+        checksum (bool): Whether to compute checksums of the files.
+
+    Returns:
+        Dict[int, List[Dict[str, Any]]]: Verification results per frame.
+
+    """
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    futures = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        for frame, paths in filepaths_by_frame:
+            results[frame] = []
+            for path in paths:
+                future = executor.submit(verify_frame, path, checksum)
+                futures[future] = frame
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]].append(future.result())
+
+    for frame_results in results.values():
+        frame_results.sort(key=lambda result: result["path"])
+    return results
+
+
+def group_frame_ranges(frames: List[int]) -> List[Tuple[int, int]]:
+    """Return consecutive frames grouped as (start, end) ranges."""
+    ranges: List[Tuple[int, int]] = []
+    for frame in sorted(set(frames)):
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], frame)
+        else:
+            ranges.append((frame, frame))
+    return ranges
+
+
+def format_frame_ranges(frames: List[int]) -> str:
+    """Return frames formatted as compact ranges, e.g. `1001-1005, 1010`."""
+    return ", ".join(
+        str(start) if start == end else f"{start}-{end}"
+        for start, end in group_frame_ranges(frames)
+    )
+
+
+def get_bad_frames(
+    results: Dict[int, List[Dict[str, Any]]]
+) -> Dict[str, List[int]]:
+    """Return frames that failed verification grouped by error category."""
+    bad_frames: Dict[str, List[int]] = {}
+    for frame, frame_results in results.items():
+        for result in frame_results:
+            error = result.get("error")
+            if error:
+                bad_frames.setdefault(error, []).append(frame)
+    return bad_frames
+
+
+def write_frame_manifest(
+    path: str,
+    results: Dict[int, List[Dict[str, Any]]]
+):
+    """Write verification results as a frame manifest JSON file.
+
+    The manifest stores the size and checksum of each file by its file name
+    so it can be used to verify the integrity of the frames after they were
+    transferred, see `verify_frame_manifest`.
+    """
+    files = {}
+    for frame, frame_results in sorted(results.items()):
+        for result in frame_results:
+            files[os.path.basename(result["path"])] = {
+                "frame": frame,
+                "size": result.get("size"),
+                "checksum": result.get("checksum"),
+                "dataWindow": result.get("dataWindow"),
+            }
+
+    with open(path, "w") as f:
+        json.dump({
+            "algorithm": CHECKSUM_ALGORITHM,
+            "files": files
+        }, f, indent=4)
+    log.debug(f"Written frame manifest to: {path}")
+
+
+def parse_frame(filename: str, frames: Iterable[int]) -> Optional[int]:
+    """Return the frame number of a file name.
+
+    The rightmost number in the file name that is one of `frames` is
+    considered to be the frame number, so version numbers and unpadded
+    frame numbers are handled.
+
+    Arguments:
+        filename (str): The file name or path.
+        frames (Iterable[int]): The frames the file may belong to.
+
+    Returns:
+        Optional[int]: The frame number, or None if no number in the file
+            name is one of `frames`.
+
+    """
+    frames = set(frames)
+    for match in reversed(list(
+        re.finditer(r"\d+", os.path.basename(filename))
+    )):
+        frame = int(match.group())
+        if frame in frames:
+            return frame
+    return None
+
+
+def verify_frame_manifest(
+    manifest_path: str,
+    filepaths: Optional[List[str]] = None,
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """Verify files against a frame manifest written by
+    `write_frame_manifest`.
+
+    Arguments:
+        manifest_path (str): Path to the frame manifest.
+        filepaths (Optional[List[str]]): Paths of the files to verify, for
+            example after they were transferred and renamed on publish.
+            Each file is matched with the manifest's file of the same
+            extension by the frame number parsed from its file name, see
+            `parse_frame`. Defaults to the manifest's file names in the
+            directory of the manifest.
+        max_workers (Optional[int]): Maximum number of threads.
+
+    Returns:
+        List[str]: Manifest file names that are missing or do not match the
+            manifest.
+
+    """
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("algorithm") != CHECKSUM_ALGORITHM:
+        raise ValueError(
+            f"Unsupported checksum algorithm: {manifest.get('algorithm')}")
+
+    files = manifest["files"]
+    if filepaths is None:
+        directory = os.path.dirname(manifest_path)
+        filenames = sorted(
+            files, key=lambda filename: (files[filename]["frame"], filename))
+        filepaths_by_filename = {
+            filename: os.path.join(directory, filename)
+            for filename in filenames
+        }
+    else:
+        filenames, filepaths_by_filename = _match_manifest_files(
+            files, filepaths)
+
+    def _is_valid(filename: str) -> bool:
+        path = filepaths_by_filename.get(filename)
+        if path is None:
+            return False
+        expected = files[filename]
+        try:
+            if os.path.getsize(path) != expected["size"]:
+                return False
+        except OSError:
+            return False
+        if expected.get("checksum") is None:
+            return True
+        return get_file_checksum(path) == expected["checksum"]
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        valid = executor.map(_is_valid, filenames)
+        return [
+            filename for filename, is_valid in zip(filenames, valid)
+            if not is_valid
+        ]
+
+
+def _match_manifest_files(
+    files: Dict[str, Dict[str, Any]],
+    filepaths: List[str]
+) -> Tuple[List[str], Dict[str, str]]:
+    """Match file paths with the manifest's files by extension and frame.
+
+    Only the manifest's files with the extension of one of `filepaths` are
+    expected, since the manifest may describe multiple rendered outputs.
+
+    Returns:
+        Tuple[List[str], Dict[str, str]]: The expected manifest file names
+            in frame order and the matched file path per manifest file name.
+
+    """
+    def _get_ext(filename: str) -> str:
+        return os.path.splitext(filename)[-1].lower()
+
+    exts = {_get_ext(path) for path in filepaths}
+    filenames_by_key: Dict[Tuple[str, int], str] = {}
+    for filename, entry in files.items():
+        ext = _get_ext(filename)
+        if ext not in exts:
+            continue
+        key = (ext, entry["frame"])
+        if key in filenames_by_key:
+            raise ValueError(
+                f"Multiple manifest files for frame {entry['frame']}: "
+                f"{filenames_by_key[key]}, {filename}")
+        filenames_by_key[key] = filename
+
+    frames = {frame for _ext, frame in filenames_by_key}
+    filepaths_by_filename: Dict[str, str] = {}
+    for path in filepaths:
+        frame = parse_frame(path, frames)
+        filename = filenames_by_key.get((_get_ext(path), frame))
+        if filename is None:
+            raise ValueError(f"No frame manifest entry for file: {path}")
+        if filename in filepaths_by_filename:
+            raise ValueError(
+                f"Multiple files for frame {frame}: "
+                f"{filepaths_by_filename[filename]}, {path}")
+        filepaths_by_filename[filename] = path
+
+    filenames = sorted(
+        filenames_by_key.values(),
+        key=lambda filename: (files[filename]["frame"], filename))
+    return filenames, filepaths_by_filename
+
+
+class ProcessPool:
+    """Run external processes concurrently with a bounded number of workers.
+
+    Each submitted command runs in its own subprocess, waited on by a worker
+    thread. Running processes can be terminated with `cancel`.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers)
+        self._processes = set()
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    def submit(self, args: List[str]) -> concurrent.futures.Future:
+        """Submit a command to run, the future returns its output."""
+        return self._executor.submit(self._run, args)
+
+    def _run(self, args: List[str]) -> str:
+        with self._lock:
+            if self._cancelled:
+                raise concurrent.futures.CancelledError()
+            log.debug(f"Running: {subprocess.list2cmdline(args)}")
+            process = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            )
+            self._processes.add(process)
+        try:
+            output, _ = process.communicate()
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"Command failed with exit code {process.returncode}: "
+                f"{subprocess.list2cmdline(args)}\n{output}"
+            )
+        return output
+
+    def cancel(self):
+        """Cancel pending commands and terminate running processes."""
+        with self._lock:
+            self._cancelled = True
+            for process in self._processes:
+                process.terminate()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def get_review_args(
+    ffmpeg_args: List[str],
+    input_pattern: str,
+    start: int,
+    fps: float,
+    output_path: str
+) -> List[str]:
+    """Return ffmpeg arguments to encode an H.264 review from a sequence.
+
+    Arguments:
+        ffmpeg_args (List[str]): The ffmpeg executable arguments.
+        input_pattern (str): Input sequence path with printf frame token.
+        start (int): First frame of the sequence.
+        fps (float): Frame rate of the review.
+        output_path (str): Output movie path.
+
+    Returns:
+        List[str]: The full ffmpeg command.
+
+    """
+    args = list(ffmpeg_args) + ["-y", "-loglevel", "error"]
+    if os.path.splitext(input_pattern)[-1].lower() == ".exr":
+        # Convert linear EXR data to sRGB
+        args.extend(["-apply_trc", "iec61966_2_1"])
+    args.extend([
+        "-start_number", str(start),
+        "-framerate", str(fps),
+        "-i", input_pattern,
+        # H.264 with yuv420p requires even dimensions
+        "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+        "-c:v", "libx264",
+        "-pix_fmt", "yuv420p",
+        "-crf", "18",
+        output_path,
+    ])
+    return args
+
+
+def get_thumbnail_args(
+    oiiotool_args: List[str],
+    input_path: str,
+    height: int,
+    output_path: str
+) -> List[str]:
+    """Return oiiotool arguments to write a downscaled JPEG thumbnail.
+
+    Arguments:
+        oiiotool_args (List[str]): The oiiotool executable arguments.
+        input_path (str): Input image path.
+        height (int): Height of the thumbnail, width keeps the aspect ratio.
+        output_path (str): Output JPEG path.
+
+    Returns:
+        List[str]: The full oiiotool command.
+
+    """
+    args = list(oiiotool_args) + [input_path, "--ch", "R,G,B"]
+    if os.path.splitext(input_path)[-1].lower() == ".exr":
+        args.extend(["--colorconvert", "linear", "sRGB"])
+    args.extend(["--resize", f"0x{height}", "-o", output_path])
+    return args
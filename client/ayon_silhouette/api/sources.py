@@ -0,0 +1,178 @@
+"""Find and reuse Source items in the project that load the same media.
+
+Silhouette decodes and caches each Source item separately, so the same
+media loaded twice takes twice the memory. The `SourceIndex` maps the
+normalized media path and part of all sources in a project, so a repeated
+load can reuse the existing Source instead.
+
+Only Sources that were loaded as a container are reused, never Sources
+created manually. Additional loads of a reused Source are stored as
+reference entries in the `AYON_references` property of the Source and are
+listed as containers of their own. Since all nodes use the one Source,
+updating any of its containers updates the Source in place and all of its
+containers move to the new version together.
+"""
+import collections
+import logging
+import os
+import uuid
+from typing import Dict, Iterator, List, Optional
+
+import fx
+
+from . import lib, proxies
+
+log = logging.getLogger(__name__)
+
+REFERENCES_DATA_KEY = "AYON_references"
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def get_media_path(source: fx.Source) -> str:
+    """Return the original media path of the source.
+
+    Sources remapped to a prefetched local copy or to a proxy return the
+    path they were loaded from.
+    """
+    return proxies.get_media_path(source)
+
+
+def get_source_part(source: fx.Source) -> int:
+    """Return the part (subimage) index the source loads."""
+    data = lib.read(source) or {}
+    if "part" in data:
+        return int(data["part"])
+    prop = source.property("part")
+    if prop:
+        return int(prop.value)
+    return 0
+
+
+def get_source_key(path: str, part: int) -> str:
+    return f"{normalize_path(path)}|{part}"
+
+
+class SourceIndex:
+    """Sources of a project by their normalized media path and part."""
+
+    def __init__(self, project: fx.Project):
+        self._sources: Dict[str, List[fx.Source]] = (
+            collections.defaultdict(list)
+        )
+        for source in project.sources:
+            self.add(source)
+
+    def add(self, source: fx.Source):
+        key = get_source_key(get_media_path(source), get_source_part(source))
+        self._sources[key].append(source)
+
+    def find(self, path: str, part: int = 0) -> Optional[fx.Source]:
+        """Return the first container source loading the media part.
+
+        Sources that are not a container, like sources created manually,
+        are never returned.
+        """
+        for source in self._sources.get(get_source_key(path, part), []):
+            if lib.read(source):
+                return source
+
+    def get_duplicates(self) -> List[List[fx.Source]]:
+        """Return the groups of sources that load the same media part."""
+        return [
+            sources for sources in self._sources.values()
+            if len(sources) > 1
+        ]
+
+
+def get_references(source: fx.Source) -> Dict[str, dict]:
+    """Return the reference container entries of the source by id."""
+    return lib.read(source, key=REFERENCES_DATA_KEY) or {}
+
+
+def iter_reference_containers(source: fx.Source) -> Iterator[dict]:
+    """Yield the container data of the reference entries of the source."""
+    for reference_id, data in get_references(source).items():
+        data = dict(data)
+        data["objectName"] = f"{source.label} [{reference_id[:8]}]"
+        data["_referenceId"] = reference_id
+        yield data
+
+
+def add_container(source: fx.Source, data: dict):
+    """Register an additional container on an existing container source.
+
+    The data is added as a reference entry of the source.
+    """
+    if not lib.read(source):
+        raise ValueError(f"Source '{source.label}' is not a container.")
+
+    references = get_references(source)
+    references[uuid.uuid4().hex] = data
+    lib.imprint(source, references, key=REFERENCES_DATA_KEY)
+    log.debug(f"Reusing existing source '{source.label}'")
+
+
+def release_container(
+    source: fx.Source,
+    reference_id: Optional[str] = None
+) -> bool:
+    """Remove a container entry from the source.
+
+    Removing the primary container of a shared source promotes the first
+    reference entry to be the primary container.
+
+    Returns:
+        bool: Whether the source is still used by another container.
+
+    """
+    references = get_references(source)
+    if reference_id:
+        references.pop(reference_id, None)
+    elif references:
+        lib.imprint(source, references.pop(next(iter(references))))
+    else:
+        return False
+
+    lib.imprint(source, references or None, key=REFERENCES_DATA_KEY)
+    return True
+
+
+def set_representation(source: fx.Source, representation_id: str):
+    """Set the representation of all containers of the source."""
+    data = lib.read(source)
+    data["representation"] = representation_id
+    lib.imprint(source, data)
+
+    references = get_references(source)
+    if references:
+        for reference in references.values():
+            reference["representation"] = representation_id
+        lib.imprint(source, references, key=REFERENCES_DATA_KEY)
+
+
+def report_duplicate_sources(project: Optional[fx.Project] = None) -> str:
+    """Return a report of the sources loading the same media part."""
+    if project is None:
+        project = fx.activeProject()
+    if not project:
+        return "No active project."
+
+    duplicates = SourceIndex(project).get_duplicates()
+    redundant = sum(len(sources) - 1 for sources in duplicates)
+    references = sum(
+        len(get_references(source)) for source in project.sources)
+    lines = [
+        f"{redundant} redundant sources for {len(duplicates)} media in "
+        f"{len(project.sources)} sources.",
+        f"{references} loads reuse an existing source.",
+    ]
+    for sources in duplicates:
+        lines.append("")
+        lines.append(
+            f"{get_media_path(sources[0])} "
+            f"(part {get_source_part(sources[0])}):")
+        lines.extend(f"    {source.label}" for source in sources)
+    return "\n".join(lines)
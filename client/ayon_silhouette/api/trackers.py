@@ -0,0 +1,236 @@
+"""Native tracker exporters for After Effects and Nuke 5 formats.
+
+The tracker positions are evaluated by Silhouette for every output frame
+through the position property, so the interpolation of the keyframes
+matches the application and no GUI, selection or message box handling is
+required.
+
+Assumptions, which are not documented by Silhouette and are why the
+extractors can verify the output against the IO modules with
+`compare_tracker_files`:
+    - Output frames are the session's frame numbers of the work range,
+      e.g. 1001, like the IO modules export. Keyframes are stored relative
+      to the session start, so an output frame is sampled at
+      `frame - session.startFrame`.
+    - Tracker positions are in pixel coordinates with the origin at the
+      top left of the image, as written by the After Effects IO module.
+      The Nuke output flips the Y axis because Nuke's origin is at the
+      bottom left.
+"""
+import logging
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import fx
+
+log = logging.getLogger(__name__)
+
+# Number of tracks supported by a single Nuke 5 Tracker node
+NUKE_TRACKS_PER_NODE = 4
+
+
+def sample_tracker(
+    tracker: fx.Tracker,
+    frames: Sequence[float]
+) -> Tuple[List[float], List[float]]:
+    """Return the tracker's X and Y position for each frame.
+
+    Arguments:
+        tracker (fx.Tracker): The tracker to sample.
+        frames (Sequence[float]): The frames to sample, relative to the
+            session start like the keyframes.
+
+    Returns:
+        Tuple[List[float], List[float]]: X and Y positions.
+
+    """
+    prop = tracker.property("position")
+    if prop.constant:
+        value = prop.value
+        return [value.x] * len(frames), [value.y] * len(frames)
+
+    xs, ys = [], []
+    for frame in frames:
+        value = prop.getValue(frame)
+        xs.append(value.x)
+        ys.append(value.y)
+    return xs, ys
+
+
+def _format_number(value: float) -> str:
+    return f"{float(value):g}"
+
+
+def _get_frames(
+    session: fx.Session, frames: Optional[Iterable[int]] = None
+) -> Tuple[List[int], List[int]]:
+    """Return the output frames and the frames to sample them at.
+
+    Arguments:
+        session (fx.Session): The session of the trackers.
+        frames (Optional[Iterable[int]]): The output frames, defaults to
+            the session's work range.
+
+    Returns:
+        Tuple[List[int], List[int]]: The output frames and the frames
+            relative to the session start.
+
+    """
+    offset = int(session.startFrame)
+    if frames is None:
+        start, end = session.workRange
+        frames = range(int(start) + offset, int(end) + offset + 1)
+    frames = list(frames)
+    return frames, [frame - offset for frame in frames]
+
+
+def write_after_effects(
+    path: str,
+    trackers: List[fx.Tracker],
+    session: fx.Session,
+    frames: Optional[Iterable[int]] = None
+):
+    """Write trackers as After Effects keyframe data .txt file.
+
+    Arguments:
+        path (str): Output file path.
+        trackers (List[fx.Tracker]): The trackers to write.
+        session (fx.Session): The session of the trackers.
+        frames (Optional[Iterable[int]]): The output frames, defaults to
+            the session's work range.
+
+    """
+    frames, sample_frames = _get_frames(session, frames)
+    lines = [
+        "Adobe After Effects 8.0 Keyframe Data",
+        "",
+        f"\tUnits Per Second\t{_format_number(session.frameRate)}",
+        f"\tSource Width\t{session.width}",
+        f"\tSource Height\t{session.height}",
+        f"\tSource Pixel Aspect Ratio\t"
+        f"{_format_number(session.pixelAspect)}",
+        f"\tComp Pixel Aspect Ratio\t{_format_number(session.pixelAspect)}",
+        "",
+    ]
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lines))
+        f.write("\n")
+        for index, tracker in enumerate(trackers):
+            xs, ys = sample_tracker(tracker, sample_frames)
+            f.write(
+                f"Motion Trackers\t{tracker.label}\t"
+                f"Track Point #{index + 1}\tFeature Center\n"
+                "\tFrame\tX pixels\tY pixels\n"
+            )
+            for frame, x, y in zip(frames, xs, ys):
+                f.write(
+                    f"\t{frame}\t{_format_number(x)}\t"
+                    f"{_format_number(y)}\n"
+                )
+            f.write("\n")
+        f.write("\nEnd of Keyframe Data\n")
+
+
+def _format_nuke_curve(frames: List[int], values) -> str:
+    keys = " ".join(
+        f"x{frame} {_format_number(value)}"
+        for frame, value in zip(frames, values)
+    )
+    return f"{{curve {keys}}}"
+
+
+def write_nuke5(
+    path: str,
+    trackers: List[fx.Tracker],
+    session: fx.Session,
+    merge_up_to_four: bool = True,
+    frames: Optional[Iterable[int]] = None
+):
+    """Write trackers as Nuke 5 Tracker nodes to a .nk file.
+
+    Arguments:
+        path (str): Output file path.
+        trackers (List[fx.Tracker]): The trackers to write.
+        session (fx.Session): The session of the trackers.
+        merge_up_to_four (bool): Merge up to four trackers in a single
+            Tracker node, otherwise write a Tracker node per tracker.
+        frames (Optional[Iterable[int]]): The output frames, defaults to
+            the session's work range.
+
+    """
+    frames, sample_frames = _get_frames(session, frames)
+    height = session.height
+    per_node = NUKE_TRACKS_PER_NODE if merge_up_to_four else 1
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for start in range(0, len(trackers), per_node):
+            node_trackers = trackers[start:start + per_node]
+            f.write("Tracker3 {\n inputs 0\n")
+            for index, tracker in enumerate(node_trackers, 1):
+                xs, ys = sample_tracker(tracker, sample_frames)
+                ys = [height - y for y in ys]
+                if index > 1:
+                    f.write(f" enable{index} true\n")
+                f.write(
+                    f" track{index} {{"
+                    f"{_format_nuke_curve(frames, xs)} "
+                    f"{_format_nuke_curve(frames, ys)}}}\n"
+                )
+            name = node_trackers[0].label if per_node == 1 else (
+                f"Tracker{start // per_node + 1}")
+            f.write(f" name {name}\n}}\n")
+
+
+def _split_numbers(line: str) -> List[str]:
+    for char in "{}()\t":
+        line = line.replace(char, " ")
+    return line.split()
+
+
+def _words_match(word: str, golden_word: str, tolerance: float) -> bool:
+    if word == golden_word:
+        return True
+    try:
+        return math.isclose(
+            float(word), float(golden_word), abs_tol=tolerance)
+    except ValueError:
+        return False
+
+
+def compare_tracker_files(
+    path: str,
+    golden_path: str,
+    tolerance: float = 1e-3,
+    max_differences: int = 50
+) -> List[str]:
+    """Compare an exported tracker file against a golden file.
+
+    Lines are compared word by word, with numeric values compared using
+    `tolerance` so differences in float formatting are ignored.
+
+    Returns:
+        List[str]: Descriptions of the differences, empty if equal.
+
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    with open(golden_path, encoding="utf-8") as f:
+        golden_lines = [
+            line for line in f.read().splitlines() if line.strip()]
+
+    differences = []
+    if len(lines) != len(golden_lines):
+        differences.append(f"{len(lines)} lines != {len(golden_lines)}")
+    for number, (line, golden_line) in enumerate(
+            zip(lines, golden_lines), 1):
+        if len(differences) >= max_differences:
+            break
+        words = _split_numbers(line)
+        golden_words = _split_numbers(golden_line)
+        if len(words) == len(golden_words) and all(
+            _words_match(word, golden_word, tolerance)
+            for word, golden_word in zip(words, golden_words)
+        ):
+            continue
+        differences.append(f"line {number}: {line!r} != {golden_line!r}")
+    return differences
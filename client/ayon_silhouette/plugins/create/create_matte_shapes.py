@@ -15,18 +15,22 @@ class CreateMatteShapes(plugin.SilhouetteCreator):
 
     create_node_type = "RotoNode"
 
+    # Above this number of shapes the export selection lists layers
+    # instead of individual shapes
+    compact_items_threshold = 1000
+
     def get_attr_defs_for_instance(self, instance):
         node = instance.transient_data["instance_node"]
-        items = [
-            {"label": label, "value": shape.id}
-            for shape, label in lib.iter_children(node)
-            if isinstance(shape, fx.Shape)
-        ]
+        creator_attributes = instance.get("creator_attributes") or {}
+        items = lib.get_child_enum_items(
+            node, fx.Shape,
+            compact_threshold=self.compact_items_threshold,
+            selected_ids=creator_attributes.get("shapes"))
         if not items:
-            items.append({
+            items = [{
                 "label": "<No shapes found>",
                 "value": None
-            })
+            }]
 
         attr_defs = [
             EnumDef(
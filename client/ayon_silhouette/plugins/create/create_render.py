@@ -1,3 +1,4 @@
+from ayon_core.lib import filter_profiles
 from ayon_silhouette.api import (
     lib,
     plugin
@@ -13,19 +14,70 @@ class CreateRender(plugin.SilhouetteCreator):
     product_type = "render"
     icon = "eye"
 
-    def create(self, product_name, instance_data, pre_create_data):
+    write_profiles = []
+
+    # Instance attributes the write profiles are filtered by
+    write_profile_keys = {"folderPath", "task", "productName", "productType"}
 
+    def create(self, product_name, instance_data, pre_create_data):
         with lib.undo_chunk("Create Render"):
-            instance = super().create(
+            return super().create(
                 product_name, instance_data, pre_create_data)
 
-            # Set default render output path
-            # TODO: Make this configurable in settings
-            instance_node = instance.transient_data["instance_node"]
-            instance_node.path.value = (
-                "$(AYON_WORKDIR)/renders/silhouette/"
-                f"{product_name}/{product_name}"
-            )
+    def _create_instance(self, instance_node, product_name, instance_data):
+        instance = super()._create_instance(
+            instance_node, product_name, instance_data)
+
+        # Set default render output path
+        # TODO: Make this configurable in settings
+        instance_node.path.value = (
+            "$(AYON_WORKDIR)/renders/silhouette/"
+            f"{product_name}/{product_name}"
+        )
+
+        self._apply_write_profile(instance)
+        return instance
+
+    @lib.undo_chunk("Update instances")
+    def update_instances(self, update_list):
+        super().update_instances(update_list)
+        for created_inst, changes in update_list:
+            # Only re-apply the profile when the matching profile may have
+            # changed, so the artist's changes to the Output node are kept
+            if changes.changed_keys & self.write_profile_keys:
+                self._apply_write_profile(created_inst)
 
     def get_instance_attr_defs(self):
         return lib.collect_animation_defs(self.create_context)
+
+    def _apply_write_profile(self, instance):
+        """Apply the matching write profile to the instance's Output node."""
+        if not self.write_profiles:
+            return
+
+        task_name = instance.get("task")
+        task_type = None
+        if task_name:
+            task_entity = self.create_context.get_task_entity(
+                instance["folderPath"], task_name)
+            if task_entity:
+                task_type = task_entity["taskType"]
+
+        profile = filter_profiles(
+            self.write_profiles,
+            {
+                "product_types": instance["productType"],
+                "product_names": instance["productName"],
+                "task_names": task_name,
+                "task_types": task_type,
+            },
+            logger=self.log
+        )
+        if not profile:
+            return
+
+        properties = lib.get_write_profile_properties(profile)
+        instance_node = instance.transient_data["instance_node"]
+        self.log.debug(
+            f"Applying write profile to {instance_node.label}: {properties}")
+        lib.set_node_properties(instance_node, properties)
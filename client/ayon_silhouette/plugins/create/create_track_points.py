@@ -16,18 +16,22 @@ class CreateTrackPoints(plugin.SilhouetteCreator):
     create_node_type = "TrackerNode"
     valid_node_types = {"TrackerNode", "RotoNode"}
 
+    # Above this number of trackers the export selection lists layers
+    # instead of individual trackers
+    compact_items_threshold = 1000
+
     def get_attr_defs_for_instance(self, instance):
         node = instance.transient_data["instance_node"]
-        items = [
-            {"label": label, "value": tracker.id}
-            for tracker, label in lib.iter_children(node)
-            if isinstance(tracker, fx.Tracker)
-        ]
+        creator_attributes = instance.get("creator_attributes") or {}
+        items = lib.get_child_enum_items(
+            node, fx.Tracker,
+            compact_threshold=self.compact_items_threshold,
+            selected_ids=creator_attributes.get("trackers"))
         if not items:
-            items.append({
+            items = [{
                 "label": "<No trackers found>",
                 "value": None
-            })
+            }]
 
         attr_defs = [
             EnumDef(
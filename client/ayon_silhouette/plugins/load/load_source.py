@@ -1,17 +1,23 @@
 from __future__ import annotations
+import functools
 import os
-from typing import Any, Optional
+from typing import Optional
 
 import fx
 import clique
 
-from ayon_silhouette.api import plugin, lib
+from ayon_silhouette.api import (
+    plugin,
+    lib,
+    loading,
+    media,
+    prefetch,
+    proxies,
+    sources,
+)
 
-from ayon_core.pipeline import Anatomy
 from ayon_core.lib import BoolDef
-from ayon_core.lib.transcoding import (
-    VIDEO_EXTENSIONS, IMAGE_EXTENSIONS, get_oiio_info_for_input
-)
+from ayon_core.lib.transcoding import VIDEO_EXTENSIONS, IMAGE_EXTENSIONS
 
 # Extensions for subimages that can be loaded with multiple parts
 SUBIMAGE_EXTENSIONS: set[str] = {".exr", ".sxr"}
@@ -33,6 +39,24 @@ class SourceLoader(plugin.SilhouetteLoader):
     set_session_frame_range_on_load = False
     set_session_frame_range_on_update = False
 
+    # Prepare the loads in a background thread and create the sources on
+    # the main thread, see `loading.LoadDispatcher`
+    prepare_in_background = False
+
+    # Copy the loaded media to a local cache and remap the source to it
+    prefetch_to_local_cache = False
+    prefetch_cache_size_gb = 100
+
+    # Generate lower resolution proxies in the background and switch the
+    # sources to them once generated
+    generate_proxies = False
+    proxy_scale = "half"
+    proxy_max_workers = 2
+
+    # Reuse an existing source of the same media and part instead of
+    # creating another source, see `sources.SourceIndex`
+    reuse_existing_sources = False
+
     @classmethod
     def get_options(cls, contexts):
         return [
@@ -51,25 +75,50 @@ class SourceLoader(plugin.SilhouetteLoader):
                 label="Set Session Frame Range on Load",
                 default=cls.set_session_frame_range_on_load
             ),
+            BoolDef(
+                "reuse_existing_sources",
+                label="Reuse Existing Sources",
+                default=cls.reuse_existing_sources,
+                tooltip=(
+                    "Reuse a source in the project that already loads the "
+                    "same media instead of creating another source."
+                ),
+            ),
         ]
 
-    @lib.undo_chunk("Load Source")
     def load(self, context, name=None, namespace=None, options=None):
-        project = fx.activeProject()
-        if not project:
+        if not fx.activeProject():
             raise RuntimeError("No active project found.")
+        options = options or {}
 
-        filepath = self.filepath_from_context(context)
+        if self.prepare_in_background and fx.gui:
+            # Resolve the path and probe the media in a background thread
+            # and create the sources on the main thread once prepared
+            loading.get_load_dispatcher().submit(
+                "Load Source",
+                functools.partial(self._prepare, context, options),
+                functools.partial(
+                    self._apply, context, name, namespace, options)
+            )
+            return
 
-        if options.get(
-            "set_session_frame_range_on_load",
-            self.set_session_frame_range_on_load
-        ):
-            self._set_session_frame_range(context)
+        prepared = self._prepare(context, options)
+
+        # Consecutive loads share the selection restore
+        with lib.batched_load("Load Source"):
+            self._apply(context, name, namespace, options, prepared)
+
+    def _prepare(
+        self, context: dict, options: dict
+    ) -> tuple[str, list[str]]:
+        """Return the filepath and part names to load.
+
+        This does not call into `fx` so it can run in a background thread.
+        """
+        filepath = self.filepath_from_context(context)
 
         # A source file may contain multiple parts, such as a left view
         # and a right view in a single EXR.
-        options = options or {}
         load_all_parts = options.get("load_all_parts", True)
 
         # If the file is not an EXR or SXR, we can only load one part so force
@@ -81,60 +130,143 @@ class SourceLoader(plugin.SilhouetteLoader):
         ):
             load_all_parts = False
 
-        # If loading all parts, find the info for the subimages so we can label
-        # them correctly.
-        info: list[dict[str, Any]] = []
-        parts = 1
+        # If loading all parts, find the names of the subimages so we can
+        # label them correctly.
+        part_names: list[str] = []
         if load_all_parts:
             raw_filepath = super().filepath_from_context(context)
-            info = get_oiio_info_for_input(raw_filepath, subimages=True)
-            parts = len(info)
+            part_names = media.get_part_names(raw_filepath)
+        return filepath, part_names
+
+    def _apply(
+        self,
+        context: dict,
+        name: Optional[str],
+        namespace: Optional[str],
+        options: dict,
+        prepared: tuple[str, list[str]]
+    ):
+        """Create the sources in the active project."""
+        project = fx.activeProject()
+        if not project:
+            raise RuntimeError("No active project found.")
 
+        if options.get(
+            "set_session_frame_range_on_load",
+            self.set_session_frame_range_on_load
+        ):
+            self._set_session_frame_range(context)
+
+        index = None
+        if options.get("reuse_existing_sources", self.reuse_existing_sources):
+            index = sources.SourceIndex(project)
+
+        filepath, part_names = prepared
+        parts = max(len(part_names), 1)
         for part in range(parts):
+            data = {
+                "name": str(name),
+                "namespace": str(namespace),
+                "loader": str(self.__class__.__name__),
+                "representation": context["representation"]["id"],
+                "part": part,
+            }
+            existing = index.find(filepath, part) if index else None
+            if existing is not None:
+                sources.add_container(existing, data)
+                continue
+
             source = fx.Source(filepath, part=part)
             part_name = None
             if parts > 1:
                 # Use subimage name as part name
-                part_attribs = info[part].get("attribs", {})
-                part_name = part_attribs.get(
-                    "name", part_attribs.get("oiio:subimage_name", "")
-                )
+                part_name = part_names[part]
 
             # Provide a nice label indicating the product
             source.label = self._get_label(context, part_name=part_name)
             project.addItem(source)
 
             # property.hidden = True  # hide the attribute
-            lib.imprint(source, data={
-                "name": str(name),
-                "namespace": str(namespace),
-                "loader": str(self.__class__.__name__),
-                "representation": context["representation"]["id"],
-            })
+            lib.imprint(source, data=data)
+            self._prefetch(source)
+            self._generate_proxy(context, source)
+
+    def _generate_proxy(self, context: dict, source: fx.Source):
+        if self.generate_proxies and fx.gui:
+            cache = proxies.get_proxy_cache(
+                context["project"]["name"],
+                max_workers=self.proxy_max_workers
+            )
+            proxies.generate_source_proxy(
+                source, cache, scale=self.proxy_scale)
+
+    def _prefetch(self, source: fx.Source):
+        if self.prefetch_to_local_cache and fx.gui:
+            cache = prefetch.get_prefetch_cache(
+                int(self.prefetch_cache_size_gb * 1024 ** 3))
+            prefetch.prefetch_source(source, cache)
 
     def filepath_from_context(self, context):
         # If the media is a sequence of files we need to load it with the
         # frames in the path as in file.[start-end].ext
         if context["representation"]["context"].get("frame"):
-            anatomy = Anatomy(
-                project_name=context["project"]["name"],
-                project_entity=context["project"]
+            return (
+                self._get_sequence_path_from_range(context)
+                or self._get_sequence_path_from_files(context)
             )
-            representation = context["representation"]
-            files = [data["path"] for data in representation["files"]]
-            files = [anatomy.fill_root(file) for file in files]
-
-            collections, _remainder = clique.assemble(
-                files, patterns=[clique.PATTERNS["frames"]]
-            )
-            collection = collections[0]
-            frames = list(collection.indexes)
-            start = str(frames[0]).zfill(collection.padding)
-            end = str(frames[-1]).zfill(collection.padding)
-            return collection.format(f"{{head}}[{start}-{end}]{{tail}}")
 
         return super().filepath_from_context(context)
 
+    def _get_sequence_path_from_range(self, context) -> Optional[str]:
+        """Return sequence path from the version's frame range.
+
+        This avoids resolving and assembling all files of the representation
+        by replacing the first frame in the first file's path with the frame
+        range of the version. Returns None if the frame range does not match
+        the representation's files.
+        """
+        representation = context["representation"]
+        first_frame: str = str(representation["context"]["frame"])
+        path = representation.get("attrib", {}).get("path")
+        attrib = context["version"].get("attrib", {})
+        if not path or "frameStart" not in attrib or "frameEnd" not in attrib:
+            return None
+
+        start = attrib["frameStart"] - (attrib.get("handleStart") or 0)
+        end = attrib["frameEnd"] + (attrib.get("handleEnd") or 0)
+        padding = len(first_frame)
+        if (
+            not first_frame.isdigit()
+            or int(first_frame) != start
+            or len(representation["files"]) != end - start + 1
+        ):
+            return None
+
+        path = lib.get_project_anatomy(context["project"]).fill_root(path)
+        directory, filename = os.path.split(path)
+        head, frame, tail = filename.rpartition(first_frame)
+        if not frame:
+            return None
+        start = str(start).zfill(padding)
+        end = str(end).zfill(padding)
+        return os.path.join(directory, f"{head}[{start}-{end}]{tail}")
+
+    def _get_sequence_path_from_files(self, context) -> str:
+        """Return sequence path by assembling all representation files."""
+        anatomy = lib.get_project_anatomy(context["project"])
+        representation = context["representation"]
+        files = [data["path"] for data in representation["files"]]
+        files = [anatomy.fill_root(file) for file in files]
+
+        collections, _remainder = clique.assemble(
+            files, patterns=[clique.PATTERNS["frames"]]
+        )
+        collection = collections[0]
+        frames = list(collection.indexes)
+        start = str(frames[0]).zfill(collection.padding)
+        end = str(frames[-1]).zfill(collection.padding)
+        return collection.format(f"{{head}}[{start}-{end}]{{tail}}")
+
     def _get_label(
         self, context: dict, part_name: Optional[str] = None
     ) -> str:
@@ -147,14 +279,18 @@ class SourceLoader(plugin.SilhouetteLoader):
 
     @lib.undo_chunk("Update Source")
     def update(self, container, context):
-        # Update filepath
+        # A source reused by multiple containers is updated in place, since
+        # all nodes use the same source, so all its containers are updated
         item = container["_item"]
+        # Discard a previously prefetched local copy of the old version
+        lib.imprint(item, None, key=prefetch.MEDIA_DATA_KEY)
+        lib.imprint(item, None, key=proxies.PROXY_DATA_KEY)
         item.property("path").value = self.filepath_from_context(context)
+        self._prefetch(item)
+        self._generate_proxy(context, item)
 
         # Update representation id
-        data = lib.read(item)
-        data["representation"] = context["representation"]["id"]
-        lib.imprint(item, data)
+        sources.set_representation(item, context["representation"]["id"])
 
         if self.set_session_frame_range_on_update:
             self._set_session_frame_range(context)
@@ -163,6 +299,9 @@ class SourceLoader(plugin.SilhouetteLoader):
     def remove(self, container):
         """Remove all sub containers"""
         item = container["_item"]
+        if sources.release_container(item, container.get("_referenceId")):
+            # The source is still used by another container
+            return
         project = container["_project"]
         project.removeItem(item)
 
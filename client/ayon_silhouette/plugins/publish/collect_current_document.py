@@ -2,6 +2,8 @@ import pyblish.api
 
 import fx
 
+from ayon_silhouette.api import jobs
+
 
 class CollectSilhouetteActiveDocument(pyblish.api.ContextPlugin):
     """Inject the active project and session"""
@@ -19,6 +21,12 @@ class CollectSilhouetteActiveDocument(pyblish.api.ContextPlugin):
         if not session:
             self.log.warning("No active session found.")
 
+        # Stop the background jobs left behind by a previous failed publish
+        jobs.cancel_active_queues()
+
         context.data["silhouetteProject"] = project
         context.data["silhouetteSession"] = session
 
+        # Store the artist's selection so it can be restored after extraction
+        context.data["silhouetteSelection"] = (
+            fx.activeNode(), fx.selection())
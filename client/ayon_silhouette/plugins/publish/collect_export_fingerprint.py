@@ -0,0 +1,120 @@
+import os
+
+import ayon_api
+import pyblish.api
+
+from ayon_core.pipeline.load import get_representation_path_with_anatomy
+from ayon_silhouette.api import fingerprint
+
+
+class CollectExportFingerprint(pyblish.api.InstancePlugin):
+    """Collect a fingerprint of the exported shapes or trackers.
+
+    The fingerprint is stored on the published version. When it matches the
+    fingerprint of the last published version, the extractors reuse that
+    version's files instead of exporting again.
+    """
+
+    label = "Collect Export Fingerprint"
+    # After `CollectAnatomyInstanceData` which collects the `folderEntity`
+    order = pyblish.api.CollectorOrder + 0.499
+    hosts = ["silhouette"]
+    families = ["matteshapes", "trackpoints"]
+
+    settings_category = "silhouette"
+    enabled = False
+
+    def process(self, instance):
+        context = instance.context
+        node = instance.data["transientData"]["instance_node"]
+        objects = instance.data["exportObjects"]
+
+        value = fingerprint.get_objects_fingerprint(
+            objects,
+            session=node.session,
+            settings=self.get_export_inputs(instance)
+        )
+        self.log.debug(f"Export fingerprint: {value}")
+        instance.data["exportFingerprint"] = value
+        instance.data.setdefault("versionData", {})[
+            "silhouetteExportFingerprint"] = value
+
+        previous_files = self.get_previous_files(instance, value)
+        if previous_files:
+            self.log.info(
+                "Export is unchanged since the last version, reusing its "
+                f"files for: {', '.join(sorted(previous_files))}"
+            )
+            instance.data["previousExportFiles"] = previous_files
+
+    def get_export_inputs(self, instance) -> dict:
+        """Return the inputs besides the objects that the extractors read.
+
+        These are the export plug-ins' settings, the instance's frame range
+        and the node the objects are exported from.
+        """
+        node = instance.data["transientData"]["instance_node"]
+        publish_settings = (
+            instance.context.data["project_settings"]["silhouette"]["publish"]
+        )
+        return {
+            "settings": {
+                key: value for key, value in publish_settings.items()
+                if key.endswith(("Shapes", "Track"))
+            },
+            "frameRange": {
+                key: instance.data.get(key) for key in (
+                    "frameStart",
+                    "frameEnd",
+                    "handleStart",
+                    "handleEnd",
+                    "frameStartHandle",
+                    "frameEndHandle",
+                    "fps",
+                )
+            },
+            "node": {
+                "type": node.type,
+                "label": node.label,
+            },
+        }
+
+    def get_previous_files(self, instance, value: str) -> dict:
+        """Return the last version's file path per representation name.
+
+        Returns an empty dict if the last version's fingerprint differs.
+        """
+        context = instance.context
+        project_name = context.data["projectName"]
+        folder_entity = instance.data.get("folderEntity")
+        if not folder_entity:
+            return {}
+
+        version_entity = ayon_api.get_last_version_by_product_name(
+            project_name,
+            instance.data["productName"],
+            folder_entity["id"],
+        )
+        if not version_entity:
+            return {}
+        version_data = version_entity.get("data") or {}
+        if version_data.get("silhouetteExportFingerprint") != value:
+            return {}
+
+        anatomy = context.data["anatomy"]
+        previous_files = {}
+        for repre_entity in ayon_api.get_representations(
+            project_name, version_ids={version_entity["id"]}
+        ):
+            try:
+                path = get_representation_path_with_anatomy(
+                    repre_entity, anatomy)
+            except Exception as exc:
+                self.log.debug(
+                    f"Unable to resolve representation "
+                    f"'{repre_entity['name']}' path: {exc}"
+                )
+                continue
+            if os.path.isfile(path):
+                previous_files[repre_entity["name"]] = path
+        return previous_files
@@ -0,0 +1,69 @@
+import pyblish.api
+import fx
+
+from ayon_silhouette.api import lib
+
+
+class CollectExportObjects(pyblish.api.InstancePlugin):
+    """Collect the shapes or trackers to export for the instance.
+
+    The export set is resolved once here and stored in `exportObjects` so
+    that all extractors of the instance share it, instead of each extractor
+    resolving the ids and walking the node hierarchy again.
+    """
+
+    label = "Collect Export Objects"
+    order = pyblish.api.CollectorOrder - 0.3
+    hosts = ["silhouette"]
+    families = ["matteshapes", "trackpoints"]
+
+    def process(self, instance):
+        node = instance.data["transientData"]["instance_node"]
+        creator_attributes = instance.data.get("creator_attributes", {})
+        families = set(instance.data.get("families", []))
+        families.add(instance.data["productType"])
+
+        if "matteshapes" in families:
+            objects, stale_ids = self.get_shapes(
+                node, creator_attributes.get("shapes"))
+        else:
+            objects, stale_ids = self.get_trackers(
+                node, creator_attributes.get("trackers"))
+
+        if stale_ids:
+            self.log.warning(
+                f"Objects no longer exist on {node.label}: "
+                f"{', '.join(stale_ids)}"
+            )
+        self.log.debug(
+            f"Collected {len(objects)} export objects from {node.label}")
+        instance.data["exportObjects"] = objects
+        instance.data["staleExportIds"] = stale_ids
+
+    def get_shapes(self, node, shape_ids):
+        # Use selection, if any specified, otherwise use all children shapes
+        if shape_ids:
+            # Include parent layers for the selected shapes, otherwise the
+            # layers will be excluded, and hence the structure will be lost
+            return lib.resolve_objects(
+                node, shape_ids, (fx.Shape, fx.Layer),
+                include_parent_layers=True,
+                expand_layers=True
+            )
+
+        allowed_types = (fx.Shape, fx.Layer)
+        return [
+            shape for shape, _label in lib.iter_children(node)
+            if isinstance(shape, allowed_types)
+        ], []
+
+    def get_trackers(self, node, tracker_ids):
+        # Use selection, if any specified, otherwise use all children trackers
+        if tracker_ids:
+            return lib.resolve_objects(
+                node, tracker_ids, (fx.Tracker,), expand_layers=True)
+
+        return [
+            tracker for tracker, _label in lib.iter_children(node)
+            if isinstance(tracker, fx.Tracker)
+        ], []
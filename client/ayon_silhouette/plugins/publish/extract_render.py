@@ -1,6 +1,13 @@
+import concurrent.futures
+import contextlib
+import functools
+import itertools
 import os
+from typing import Any, Dict, List
 
+from ayon_core.lib import get_ffmpeg_tool_args, get_oiio_tool_args
 from ayon_core.pipeline import publish
+from ayon_silhouette.api import jobs, proxies, render
 
 import fx
 from tools.renderer import Renderer
@@ -19,6 +26,30 @@ class SilhouetteExtractRender(publish.Extractor):
     hosts = ["silhouette"]
     families = ["render"]
 
+    settings_category = "silhouette"
+
+    # Maximum number of threads to verify the rendered frames with
+    verify_max_workers = 8
+    # Compute checksums of the rendered frames for the frame manifest
+    verify_checksums = True
+    # Publish the frame manifest as a representation so the frames can be
+    # verified after transfer, see `VerifyPublishedFrames`
+    publish_frame_manifest = True
+
+    # Render directly into the publish staging directory instead of the
+    # output node's path, committing each frame with an atomic rename.
+    render_to_staging_dir = False
+
+    # Render sources that use generated proxies at full resolution
+    render_full_resolution_sources = True
+
+    # Generate review and thumbnail from the rendered frames in the background
+    # while the frames are verified, see `SilhouetteExtractRenderReview`
+    generate_review = False
+    generate_thumbnail = False
+    thumbnail_height = 256
+    review_max_workers = 2
+
     def process(self, instance):
         # TODO: Collect colorspace?
         # TODO: Support alpha + depth channels?
@@ -33,54 +64,359 @@ class SilhouetteExtractRender(publish.Extractor):
         # Render node in the session
         session = instance.context.data["silhouetteSession"]
         renderer = Renderer()
-        finished = renderer.render({
-                "session": session,
-                "nodes": [output_node],
-                # Override frame range
-                # "frames": list(range(start, end+1))
-            },
-            progress=get_progress_handler()
-        )
 
-        if not finished:
-            raise publish.PublishError("Render was cancelled or interrupted.")
+        with contextlib.ExitStack() as stack:
+            if self.render_full_resolution_sources:
+                stack.enter_context(proxies.full_resolution_sources(
+                    instance.context.data["silhouetteProject"]))
 
-        outputs = renderer.outputs
-        if not outputs:
-            raise publish.PublishError("Render generated no outputs.")
+            publish_dir = None
+            on_progress = None
+            if self.render_to_staging_dir:
+                # Render into a temporary folder inside the staging directory
+                # so the frames can be committed with an atomic rename as
+                # soon as they are rendered
+                publish_dir = self.staging_dir(instance)
+                render_dir = os.path.join(
+                    publish_dir, f".{instance.name}_rendering")
+                stack.enter_context(
+                    render.render_path_override(output_node, render_dir))
+                on_progress = render.FrameCommitter(
+                    render_dir, publish_dir).commit_finished
 
-        # Collect all rendered outputs
-        filepaths = []
-        for output in outputs:
-            for frame in range(start, end+1):
-                filepath = output.buildPath(frame)
-                filepaths.append(filepath)
+            progress = render.RenderStatsProgress(
+                get_progress_handler(), on_progress=on_progress)
 
-        # All files must exist. A rendered output may not exist due to
-        # unexpected failures, or if the work range is smaller than the render
-        # range.
-        # TODO: Validate to handle render range out of work range better
-        for filepath in filepaths:
-            if not os.path.exists(filepath):
-                raise publish.PublishError(f"File does not exist: {filepath}")
+            progress.start()
+            try:
+                finished = renderer.render({
+                        "session": session,
+                        "nodes": [output_node],
+                        # Override frame range
+                        # "frames": list(range(start, end+1))
+                    },
+                    progress=progress
+                )
+            finally:
+                progress.stop()
+
+            if not finished:
+                raise publish.PublishError(
+                    "Render was cancelled or interrupted.")
+
+            outputs = renderer.outputs
+            if not outputs:
+                raise publish.PublishError("Render generated no outputs.")
+
+            # Describe all rendered outputs, this must happen before the
+            # render path override is reverted
+            sequences = [
+                render.FrameSequence.from_output(output, start, end)
+                for output in outputs
+            ]
+
+        if publish_dir:
+            # Commit the frames that were not committed during the render
+            for sequence in sequences:
+                render.commit_frames(list(sequence.paths()), publish_dir)
+            sequences = [
+                sequence.relocated(publish_dir) for sequence in sequences
+            ]
+            self.log.debug(f"Committed rendered frames to: {publish_dir}")
 
         # For now assume one output sequence per instance
-        first_filepath = filepaths[0]
-        files = [os.path.basename(path) for path in filepaths]
-        staging_dir = os.path.dirname(first_filepath)
-        ext = os.path.splitext(first_filepath)[-1]
-
-        # Workaround: Single files must not be a list
-        if len(files) == 1:
-            files = files[0]
-
-        representation = {
-            "name": ext.lstrip("."),
-            "ext": ext.lstrip("."),
-            "files": files,
+        sequence = sequences[0]
+        files = sequence.filenames()
+        staging_dir = sequence.directory
+        ext = os.path.splitext(sequence.tail)[-1]
+
+        # Verify the frames and write the sidecar files in the background
+        # so the next instance can already start rendering. These finish
+        # before integration, see `WaitPostProcessing`
+        verification = jobs.submit_post_process(
+            instance,
+            "Verify rendered frames",
+            self._verify_frames,
+            instance.name,
+            sequences,
+            staging_dir,
+            on_done=functools.partial(self._on_frames_verified, instance)
+        )
+
+        review_pool = None
+        if self.generate_review or self.generate_thumbnail:
+            review_pool = self._start_review_jobs(
+                instance, sequence, verification)
+
+        try:
+            jobs.submit_post_process(
+                instance,
+                "Render statistics",
+                self._get_render_stats,
+                instance.name,
+                progress,
+                sequences,
+                staging_dir,
+                on_done=functools.partial(self._on_render_stats, instance)
+            )
+
+            # Workaround: Single files must not be a list
+            if len(files) == 1:
+                files = files[0]
+
+            representation = {
+                "name": ext.lstrip("."),
+                "ext": ext.lstrip("."),
+                "files": files,
+                "stagingDir": staging_dir,
+            }
+            instance.data.setdefault("representations", []).append(
+                representation)
+            if self.publish_frame_manifest:
+                instance.data["frameManifestRepresentation"] = (
+                    representation["name"])
+        except BaseException:
+            # The review extractor does not run on failure, so the review
+            # processes must be stopped here
+            if review_pool is not None:
+                instance.data.pop("silhouetteReviewJobs", None)
+                review_pool.cancel()
+            raise
+
+        self.log.debug(
+            f"Extracted instance '{instance.name}' to: {sequence}")
+
+    def _start_review_jobs(
+        self,
+        instance,
+        sequence: render.FrameSequence,
+        verification: concurrent.futures.Future
+    ):
+        """Start review and thumbnail generation in background processes.
+
+        The jobs are collected by `SilhouetteExtractRenderReview`, which
+        shuts down the returned pool. It only adds the outputs once the
+        `verification` of the rendered frames passed.
+
+        Returns:
+            render.ProcessPool: The pool running the processes.
+
+        """
+        staging_dir = self.staging_dir(instance)
+        pool = render.ProcessPool(max_workers=self.review_max_workers)
+        review_jobs = {
+            "pool": pool,
             "stagingDir": staging_dir,
+            "verification": verification,
         }
-        instance.data.setdefault("representations", []).append(representation)
+        # Stop the processes if the publish is cancelled before the review
+        # extractor runs
+        jobs.get_post_process_queue(instance.context).add_pool(pool)
+        try:
+            self._submit_review_jobs(instance, sequence, pool, review_jobs)
+        except BaseException:
+            pool.cancel()
+            raise
 
-        self.log.debug(
-            f"Extracted instance '{instance.name}' to: {filepaths[0]}")
+        instance.data["silhouetteReviewJobs"] = review_jobs
+        return pool
+
+    def _submit_review_jobs(
+        self,
+        instance,
+        sequence: render.FrameSequence,
+        pool: render.ProcessPool,
+        review_jobs: Dict[str, Any]
+    ):
+        staging_dir = review_jobs["stagingDir"]
+
+        if self.generate_review:
+            filename = f"{instance.name}_review.mp4"
+            fps = instance.data.get("fps", instance.context.data.get("fps"))
+            args = render.get_review_args(
+                get_ffmpeg_tool_args("ffmpeg"),
+                sequence.printf_pattern,
+                start=sequence.ranges[0][0],
+                fps=fps or 25,
+                output_path=os.path.join(staging_dir, filename)
+            )
+            review_jobs["review"] = (filename, pool.submit(args))
+
+        if self.generate_thumbnail:
+            filename = f"{instance.name}_thumbnail.jpg"
+            middle_frame = next(itertools.islice(
+                sequence.frames(), len(sequence) // 2, None))
+            args = render.get_thumbnail_args(
+                get_oiio_tool_args("oiiotool"),
+                sequence.path(middle_frame),
+                height=self.thumbnail_height,
+                output_path=os.path.join(staging_dir, filename)
+            )
+            review_jobs["thumbnail"] = (filename, pool.submit(args))
+
+    def _verify_frames(
+        self,
+        instance_name: str,
+        sequences: List[render.FrameSequence],
+        staging_dir: str
+    ) -> str:
+        """Verify all rendered frames and write the frame manifest.
+
+        All files must exist and be complete. A rendered output may not
+        exist due to unexpected failures, or if the work range is smaller
+        than the render range.
+
+        This runs in a background thread.
+
+        Returns:
+            str: Path to the frame manifest.
+
+        """
+        # TODO: Validate to handle render range out of work range better
+        results = render.verify_frames(
+            render.iter_filepaths_by_frame(sequences),
+            max_workers=self.verify_max_workers,
+            checksum=self.verify_checksums
+        )
+        bad_frames = render.get_bad_frames(results)
+        if bad_frames:
+            for frame_results in results.values():
+                for result in frame_results:
+                    if result.get("error"):
+                        self.log.error(
+                            f"{result['message']}: {result['path']}")
+            labels = {
+                "missing": "Missing frames",
+                "empty": "Empty frames",
+                "invalid": "Invalid or truncated frames",
+            }
+            message = "\n".join(
+                f"{labels.get(error, error)}: "
+                f"{render.format_frame_ranges(frames)}"
+                for error, frames in sorted(bad_frames.items())
+            )
+            raise publish.PublishError(
+                f"Rendered frames failed verification.\n{message}")
+
+        manifest_path = os.path.join(
+            staging_dir, f"{instance_name}_frames.json")
+        render.write_frame_manifest(manifest_path, results)
+        return manifest_path
+
+    def _on_frames_verified(self, instance, manifest_path: str):
+        instance.data["frameManifest"] = manifest_path
+        if self.publish_frame_manifest:
+            instance.data.setdefault("representations", []).append({
+                "name": "frame_manifest",
+                "ext": "json",
+                "files": os.path.basename(manifest_path),
+                "stagingDir": os.path.dirname(manifest_path),
+            })
+
+    def _get_render_stats(
+        self,
+        instance_name: str,
+        progress: render.RenderStatsProgress,
+        sequences: List[render.FrameSequence],
+        staging_dir: str
+    ) -> Dict[str, Any]:
+        """Compute render statistics and write them to a JSON sidecar.
+
+        This runs in a background thread.
+        """
+        frame_times = render.get_frame_times(
+            render.iter_filepaths_by_frame(sequences), progress.start_time)
+        stats = render.compute_render_stats(progress, frame_times)
+
+        sidecar_path = os.path.join(
+            staging_dir, f"{instance_name}_render_stats.json")
+        render.write_render_stats(sidecar_path, stats, frame_times)
+        return stats
+
+    def _on_render_stats(self, instance, stats: Dict[str, Any]):
+        instance.data["renderStats"] = stats
+        if stats["frameTimeMedian"] is not None:
+            peak_memory_label = "peak memory unknown"
+            if stats["peakMemory"] is not None:
+                peak_memory_label = (
+                    f"peak memory {stats['peakMemory'] / (1024 ** 2):.0f} MB"
+                )
+            elif stats["processPeakMemory"] is not None:
+                peak_memory_label = (
+                    "process peak memory "
+                    f"{stats['processPeakMemory'] / (1024 ** 2):.0f} MB"
+                )
+            self.log.info(
+                f"Rendered {stats['frames']} frames in "
+                f"{stats['totalTime']:.1f}s (min "
+                f"{stats['frameTimeMin']:.2f}s, median "
+                f"{stats['frameTimeMedian']:.2f}s, p95 "
+                f"{stats['frameTimeP95']:.2f}s per frame) "
+                f"with {peak_memory_label}."
+            )
+
+
+class SilhouetteExtractRenderReview(publish.Extractor):
+    """Collect review and thumbnail generated in the background.
+
+    The review and thumbnail processes are started by
+    `SilhouetteExtractRender` directly after rendering, so they run while
+    the rendered frames are verified. This waits for the verification and
+    for them to finish and adds their outputs as representations. When the
+    verification fails the processes are cancelled instead.
+    """
+    label = "Render Review"
+    order = publish.Extractor.order + 0.01
+    hosts = ["silhouette"]
+    families = ["render"]
+
+    def process(self, instance):
+        review_jobs = instance.data.pop("silhouetteReviewJobs", None)
+        if not review_jobs:
+            return
+
+        pool: render.ProcessPool = review_jobs["pool"]
+        staging_dir = review_jobs["stagingDir"]
+        representations = instance.data.setdefault("representations", [])
+        try:
+            try:
+                review_jobs["verification"].result()
+            except Exception:
+                # Do not publish a review of frames that failed verification
+                pool.cancel()
+                raise
+
+            if "review" in review_jobs:
+                filename, future = review_jobs["review"]
+                self._wait(future, "review")
+                representations.append({
+                    "name": "h264",
+                    "ext": "mp4",
+                    "files": filename,
+                    "stagingDir": staging_dir,
+                    "tags": ["review"],
+                })
+
+            if "thumbnail" in review_jobs:
+                filename, future = review_jobs["thumbnail"]
+                self._wait(future, "thumbnail")
+                representations.append({
+                    "name": "thumbnail",
+                    "ext": "jpg",
+                    "files": filename,
+                    "stagingDir": staging_dir,
+                    "tags": ["thumbnail"],
+                })
+                instance.data["thumbnailPath"] = os.path.join(
+                    staging_dir, filename)
+        finally:
+            pool.shutdown()
+
+    def _wait(self, future, label: str):
+        try:
+            output = future.result()
+        except Exception as exc:
+            raise publish.PublishError(
+                f"Failed to generate {label}: {exc}") from exc
+        if output:
+            self.log.debug(output)
@@ -1,6 +1,6 @@
 import os
 import contextlib
-from typing import Optional
+from typing import List, Optional
 
 from qtpy import QtWidgets
 import fx
@@ -36,41 +36,27 @@ class ExtractNukeShapes(publish.Extractor,
         filename = "{0}.{1}".format(instance.name, self.extension)
         path = os.path.join(dir_path, filename)
 
-        node = instance.data["transientData"]["instance_node"]
-
-        # Use selection, if any specified, otherwise use all children shapes
-        shape_ids = instance.data.get("creator_attributes", {}).get("shapes")
-        if shape_ids:
-            shapes = [fx.findObject(shape_id) for shape_id in shape_ids]
-
-            # Include parent layers for the selected shapes, otherwise the
-            # layers will be excluded, and hence the structure will be lost
-            layers = set()
-            for shape in shapes:
-                parent = shape.parent
-                while isinstance(parent, fx.Layer):
-                    layers.add(parent)
-                    parent = parent.parent
-            shapes.extend(layers)
+        repre_name = self.override_name or self.extension
+        previous_path = instance.data.get(
+            "previousExportFiles", {}).get(repre_name)
+        if previous_path:
+            # Shapes are unchanged since the last version, see
+            # `CollectExportFingerprint`
+            self.log.debug(f"Reusing unchanged export: {previous_path}")
+            lib.link_or_copy(previous_path, path)
         else:
-            allowed_types = (fx.Shape, fx.Layer)
-            shapes = [
-                shape for shape, _label in lib.iter_children(node)
-                if isinstance(shape, allowed_types)
-            ]
-
-        with lib.maintained_selection():
-            fx.activate(node)
-            fx.select(shapes)
-            with contextlib.ExitStack() as stack:
-                self.log.debug(f"Exporting '{self.io_module}' to: {path}")
-                if self.capture_messageboxes:
-                    stack.enter_context(
-                        lib.capture_messageboxes(self.on_captured_messagebox))
-                fx.io_modules[self.io_module].export(path)
+            node = instance.data["transientData"]["instance_node"]
+            shapes = instance.data["exportObjects"]
+            try:
+                self.export(node, shapes, path)
+            except BaseException:
+                # `RestoreSelection` does not run after a failed extraction
+                lib.restore_selection(
+                    instance.context.data.get("silhouetteSelection"))
+                raise
 
         representation = {
-            "name": self.override_name or self.extension,
+            "name": repre_name,
             "ext": self.extension,
             "files": filename,
             "stagingDir": dir_path,
@@ -81,6 +67,18 @@ class ExtractNukeShapes(publish.Extractor,
 
         self.log.debug(f"Extracted instance '{instance.name}' to: {path}")
 
+    def export(self, node: fx.Node, shapes: List[fx.Object], path: str):
+        """Export the shapes of the node to the path using the IO module."""
+        # The selection is kept for the other formats and restored after
+        # extraction by the `RestoreSelection` plug-in
+        lib.ensure_selection(node, shapes)
+        with contextlib.ExitStack() as stack:
+            self.log.debug(f"Exporting '{self.io_module}' to: {path}")
+            if self.capture_messageboxes:
+                stack.enter_context(
+                    lib.capture_messageboxes(self.on_captured_messagebox))
+            fx.io_modules[self.io_module].export(path)
+
     def on_captured_messagebox(self, messagebox: QtWidgets.QMessageBox):
         pass
 
@@ -1,5 +1,6 @@
 import contextlib
 import os
+from typing import List
 
 from qtpy import QtWidgets
 
@@ -7,6 +8,7 @@ import fx
 
 from ayon_core.pipeline import publish
 from ayon_silhouette.api import lib
+from ayon_silhouette.api import trackers as trackers_api
 
 
 class SilhouetteExtractAfterEffectsTrack(publish.Extractor,
@@ -23,6 +25,14 @@ class SilhouetteExtractAfterEffectsTrack(publish.Extractor,
 
     capture_messageboxes = True
 
+    # Sample and write the tracker keyframes directly instead of using the
+    # IO module, which requires no selection or GUI
+    use_native_exporter = False
+
+    # Also export with the IO module and compare it with the native
+    # exporter's output, using the IO module's output if they differ
+    verify_native_exporter = False
+
     def process(self, instance):
         if not self.is_active(instance.data):
             return
@@ -34,29 +44,29 @@ class SilhouetteExtractAfterEffectsTrack(publish.Extractor,
 
         # Node should be a node that contains 'tracker' children
         node = instance.data["transientData"]["instance_node"]
-
-        # Use selection, if any specified, otherwise use all children shapes
-        tracker_ids = instance.data.get(
-            "creator_attributes", {}).get("trackers")
-        if tracker_ids:
-            trackers = [
-                fx.findObject(tracker_id) for tracker_id in tracker_ids
-            ]
+        trackers = instance.data["exportObjects"]
+        previous_path = instance.data.get(
+            "previousExportFiles", {}).get(self.extension)
+        if previous_path:
+            # Trackers are unchanged since the last version, see
+            # `CollectExportFingerprint`
+            self.log.debug(f"Reusing unchanged export: {previous_path}")
+            lib.link_or_copy(previous_path, path)
         else:
-            trackers = [
-                tracker for tracker, _label in lib.iter_children(node)
-                if isinstance(tracker, fx.Tracker)
-            ]
-
-        with lib.maintained_selection():
-            fx.activate(node)
-            fx.select(trackers)
-            with contextlib.ExitStack() as stack:
-                self.log.debug(f"Exporting '{self.io_module}' to: {path}")
-                if self.capture_messageboxes:
-                    stack.enter_context(
-                        lib.capture_messageboxes(self.on_captured_messagebox))
-                fx.io_modules[self.io_module].export(path)
+            try:
+                if self.use_native_exporter:
+                    self.log.debug(
+                        f"Writing native '{self.io_module}' to: {path}")
+                    self.write_native(path, trackers, node.session)
+                    if self.verify_native_exporter:
+                        self.verify_native(node, trackers, path)
+                else:
+                    self.export(node, trackers, path)
+            except BaseException:
+                # `RestoreSelection` does not run after a failed extraction
+                lib.restore_selection(
+                    instance.context.data.get("silhouetteSelection"))
+                raise
 
         representation = {
             "name": self.extension,
@@ -68,6 +78,52 @@ class SilhouetteExtractAfterEffectsTrack(publish.Extractor,
 
         self.log.debug(f"Extracted instance '{instance.name}' to: {path}")
 
+    def export(self, node: fx.Node, trackers: List[fx.Tracker], path: str):
+        """Export the trackers of the node to the path using the IO module."""
+        # The selection is kept for the other formats and restored after
+        # extraction by the `RestoreSelection` plug-in
+        lib.ensure_selection(node, trackers)
+        with contextlib.ExitStack() as stack:
+            self.log.debug(f"Exporting '{self.io_module}' to: {path}")
+            if self.capture_messageboxes:
+                stack.enter_context(
+                    lib.capture_messageboxes(self.on_captured_messagebox))
+            fx.io_modules[self.io_module].export(path)
+
+    def write_native(
+        self,
+        path: str,
+        trackers: List[fx.Tracker],
+        session: fx.Session
+    ):
+        """Write the trackers without the IO module.
+
+        Like the IO module, the frames of the session's work range are
+        written.
+        """
+        trackers_api.write_after_effects(path, trackers, session)
+
+    def verify_native(
+        self, node: fx.Node, trackers: List[fx.Tracker], path: str
+    ):
+        """Compare the native output with the IO module's output."""
+        root, ext = os.path.splitext(path)
+        io_module_path = f"{root}_io_module{ext}"
+        self.export(node, trackers, io_module_path)
+
+        differences = trackers_api.compare_tracker_files(
+            path, io_module_path)
+        if not differences:
+            os.remove(io_module_path)
+            return
+
+        self.log.warning(
+            f"Native '{self.io_module}' output differs from the IO module's "
+            "output, using the IO module's output instead:\n"
+            + "\n".join(differences)
+        )
+        os.replace(io_module_path, path)
+
     def on_captured_messagebox(self, messagebox: QtWidgets.QMessageBox):
         self.log.debug(f"Detected messagebox: {messagebox.text()}")
         button_texts = [button.text() for button in messagebox.buttons()]
@@ -101,6 +157,11 @@ class SilhouetteExtractNuke5Track(SilhouetteExtractAfterEffectsTrack):
     # or otherwise export as multiple single point tracker nodes
     merge_up_to_four = True
 
+    def write_native(self, path, trackers, session):
+        trackers_api.write_nuke5(
+            path, trackers, session,
+            merge_up_to_four=self.merge_up_to_four)
+
     def on_captured_messagebox(self, messagebox: QtWidgets.QMessageBox):
         self.log.debug(f"Detected messagebox: {messagebox.text()}")
         button_texts = [button.text() for button in messagebox.buttons()]
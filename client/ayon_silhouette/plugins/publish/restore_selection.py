@@ -0,0 +1,21 @@
+import pyblish.api
+
+from ayon_silhouette.api import lib
+
+
+class RestoreSelection(pyblish.api.ContextPlugin):
+    """Restore the selection from before extraction.
+
+    Extractors that export through the Silhouette IO modules change the
+    active node and selection, and leave it for the next extractor of the
+    same instance to avoid re-selecting the same objects per format. An
+    extractor that fails restores the selection itself, since this does not
+    run after a failed extraction.
+    """
+
+    label = "Restore Selection"
+    order = pyblish.api.ExtractorOrder + 0.45
+    hosts = ["silhouette"]
+
+    def process(self, context):
+        lib.restore_selection(context.data.get("silhouetteSelection"))
@@ -16,6 +16,18 @@ class ValidateShapes(pyblish.api.InstancePlugin):
     def process(self, instance):
         # Node should be a node that contains 'shapes' children
         node = instance.data["transientData"]["instance_node"]
+        stale_ids = instance.data.get("staleExportIds")
+        if stale_ids:
+            raise publish.PublishValidationError(
+                "Selected shapes no longer exist on node {0}: {1}".format(
+                    node.label, ", ".join(stale_ids)),
+                description=(
+                    "Some of the shapes selected for export were deleted. "
+                    "Update the instance's shapes selection in the "
+                    "publisher."
+                )
+            )
+
         if not any(
             shape for shape, _label in lib.iter_children(node)
             if isinstance(shape, fx.Shape)
@@ -16,6 +16,18 @@ class ValidateTrackers(pyblish.api.InstancePlugin):
     def process(self, instance):
         # Node should be a node that contains 'tracker' children
         node = instance.data["transientData"]["instance_node"]
+        stale_ids = instance.data.get("staleExportIds")
+        if stale_ids:
+            raise publish.PublishValidationError(
+                "Selected trackers no longer exist on node {0}: {1}".format(
+                    node.label, ", ".join(stale_ids)),
+                description=(
+                    "Some of the trackers selected for export were deleted. "
+                    "Update the instance's trackers selection in the "
+                    "publisher."
+                )
+            )
+
         if not any(
             tracker for tracker, _label in lib.iter_children(node)
             if isinstance(tracker, fx.Tracker)
@@ -0,0 +1,49 @@
+import pyblish.api
+
+from ayon_core.pipeline import publish
+from ayon_silhouette.api import render
+
+
+class VerifyPublishedFrames(pyblish.api.InstancePlugin):
+    """Verify the published rendered frames against the frame manifest.
+
+    The frame manifest stores the size and checksum of each rendered frame,
+    so frames that were truncated or corrupted while they were transferred
+    to the publish location are detected.
+    """
+
+    label = "Verify Published Frames"
+    order = pyblish.api.IntegratorOrder + 0.1
+    hosts = ["silhouette"]
+    families = ["render"]
+
+    def process(self, instance):
+        manifest_path = instance.data.get("frameManifest")
+        representation_name = instance.data.get(
+            "frameManifestRepresentation")
+        if not manifest_path or not representation_name:
+            return
+
+        published_representations = instance.data.get(
+            "published_representations", {})
+        for published in published_representations.values():
+            if published["representation"]["name"] == representation_name:
+                break
+        else:
+            self.log.warning(
+                f"No published representation '{representation_name}' "
+                "found to verify against the frame manifest.")
+            return
+
+        try:
+            mismatches = render.verify_frame_manifest(
+                manifest_path, published["published_files"])
+        except ValueError as exc:
+            raise publish.PublishError(
+                f"Unable to verify the published frames: {exc}") from exc
+
+        if mismatches:
+            raise publish.PublishError(
+                "Published frames do not match the rendered frames:\n"
+                + "\n".join(f"- {filename}" for filename in mismatches))
+        self.log.debug("Published frames match the frame manifest.")
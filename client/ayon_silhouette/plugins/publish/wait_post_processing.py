@@ -0,0 +1,35 @@
+import pyblish.api
+
+from ayon_core.pipeline import publish
+from ayon_silhouette.api import jobs
+
+
+class WaitPostProcessing(pyblish.api.InstancePlugin):
+    """Wait for the instance's background post-processing to finish.
+
+    Extractors submit post-processing like checksums, compression and
+    sidecar files to a thread pool so the next extractor can already start.
+    This waits for those jobs before integration and applies their results
+    in the order they were submitted.
+    """
+
+    label = "Wait Post-Processing"
+    order = pyblish.api.ExtractorOrder + 0.49
+    hosts = ["silhouette"]
+
+    def process(self, instance):
+        queue = instance.context.data.get(jobs.CONTEXT_KEY)
+        if queue is None or not queue.has_jobs(instance):
+            return
+
+        errors = queue.wait(instance)
+        if errors:
+            # The publish fails, so stop the post-processing of the other
+            # instances too
+            queue.cancel()
+            for label, error in errors:
+                self.log.error(f"Post-processing '{label}' failed: {error}")
+            message = "\n".join(
+                f"- {label}: {error}" for label, error in errors)
+            raise publish.PublishError(
+                f"Post-processing failed for '{instance.name}'.\n{message}")
@@ -0,0 +1,94 @@
+from ayon_server.settings import (
+    BaseSettingsModel,
+    SettingsField,
+    task_types_enum,
+)
+
+
+class OutputPropertyModel(BaseSettingsModel):
+    _layout = "compact"
+    name: str = SettingsField("", title="Property")
+    value: str = SettingsField("", title="Value")
+
+
+class RenderWriteProfileModel(BaseSettingsModel):
+    product_types: list[str] = SettingsField(
+        default_factory=list,
+        title="Product types"
+    )
+    product_names: list[str] = SettingsField(
+        default_factory=list,
+        title="Product names"
+    )
+    task_types: list[str] = SettingsField(
+        default_factory=list,
+        title="Task types",
+        enum_resolver=task_types_enum
+    )
+    task_names: list[str] = SettingsField(
+        default_factory=list,
+        title="Task names"
+    )
+    properties: list[OutputPropertyModel] = SettingsField(
+        default_factory=list,
+        title="Output node properties",
+        description=(
+            "Property ids and values to set on the Output node, e.g. the "
+            "EXR compression or write threads. Values are parsed as JSON "
+            "when possible so numbers and booleans can be set, otherwise "
+            "they are set as string."
+        ),
+    )
+
+
+class CreateRenderModel(BaseSettingsModel):
+    write_profiles: list[RenderWriteProfileModel] = SettingsField(
+        default_factory=list,
+        title="Write profiles",
+        description=(
+            "Output node write settings applied when creating or updating "
+            "a render instance. The first matching profile is used."
+        ),
+    )
+
+
+class CreateExportObjectsModel(BaseSettingsModel):
+    compact_items_threshold: int = SettingsField(
+        1000,
+        ge=0,
+        title="Compact selection threshold",
+        description=(
+            "When a node has more objects than this, the export selection "
+            "in the publisher lists the top-level layers instead of every "
+            "object to keep the publisher responsive. Set to zero to "
+            "always list every object."
+        ),
+    )
+
+
+class CreatePluginsModel(BaseSettingsModel):
+    CreateMatteShapes: CreateExportObjectsModel = SettingsField(
+        default_factory=CreateExportObjectsModel,
+        title="Create Matte Shapes",
+    )
+    CreateTrackPoints: CreateExportObjectsModel = SettingsField(
+        default_factory=CreateExportObjectsModel,
+        title="Create Track Points",
+    )
+    CreateRender: CreateRenderModel = SettingsField(
+        default_factory=CreateRenderModel,
+        title="Create Render",
+    )
+
+
+DEFAULT_SILHOUETTE_CREATE_SETTINGS = {
+    "CreateMatteShapes": {
+        "compact_items_threshold": 1000,
+    },
+    "CreateTrackPoints": {
+        "compact_items_threshold": 1000,
+    },
+    "CreateRender": {
+        "write_profiles": [],
+    }
+}
@@ -20,6 +20,84 @@ class SourceLoaderModel(BaseSettingsModel):
             "and duration to the frame range of the loaded source."
         ),
     )
+    prepare_in_background: bool = SettingsField(
+        default=False,
+        title="Prepare Loads in Background",
+        description=(
+            "Resolve the paths and probe the media of the loaded sources in "
+            "background threads, and create the sources once prepared. This "
+            "keeps the UI responsive when loading many sources at once, but "
+            "the sources appear after the loader finished."
+        ),
+    )
+    prefetch_to_local_cache: bool = SettingsField(
+        default=False,
+        title="Prefetch to Local Cache",
+        description=(
+            "Copy the frames of loaded sources to a local cache directory in "
+            "the background and remap the sources to the local copies once "
+            "copied, for smoother playback of media on network storage. The "
+            "local cache defaults to the temp directory and can be set with "
+            "the AYON_SILHOUETTE_PREFETCH_DIR environment variable."
+        ),
+    )
+    prefetch_cache_size_gb: float = SettingsField(
+        default=100,
+        gt=0,
+        title="Local Cache Size Limit (GB)",
+        description=(
+            "The least recently used prefetched media is removed from the "
+            "local cache above this size."
+        ),
+    )
+    reuse_existing_sources: bool = SettingsField(
+        default=False,
+        title="Reuse Existing Sources",
+        description=(
+            "Reuse a source in the project that was loaded before with the "
+            "same media and part instead of creating another source. The "
+            "load is added as an extra container on the existing source. "
+            "Updating any of its containers updates all of them."
+        ),
+    )
+    generate_proxies: bool = SettingsField(
+        default=False,
+        title="Generate Proxies",
+        description=(
+            "Generate lower resolution proxies of loaded sources with "
+            "oiiotool in the background and switch the sources to the "
+            "proxies once generated. Renders switch back to full resolution "
+            "unless disabled in the Extract Render settings."
+        ),
+    )
+    proxy_scale: str = SettingsField(
+        default="half",
+        title="Proxy Scale",
+        enum_resolver=lambda: [
+            {"value": "half", "label": "Half resolution"},
+            {"value": "quarter", "label": "Quarter resolution"},
+        ],
+    )
+    proxy_max_workers: int = SettingsField(
+        default=2,
+        ge=1,
+        title="Proxy Processes",
+        description="Maximum number of proxy processes running at once.",
+    )
+
+
+class ImportLoaderModel(BaseSettingsModel):
+    update_changed_objects_only: bool = SettingsField(
+        default=False,
+        title="Update Changed Objects Only",
+        description=(
+            "On update, import into a scratch node and replace only the "
+            "objects whose content changed in the file, matched by their "
+            "label path. Objects unchanged in the file keep their identity "
+            "and any edits made by the artist."
+        ),
+    )
+
 
 class LoadPluginsModel(BaseSettingsModel):
     # Shapes
@@ -27,11 +105,32 @@ class LoadPluginsModel(BaseSettingsModel):
         default_factory=SourceLoaderModel,
         title="Load Source",
     )
+    ShapesLoader: ImportLoaderModel = SettingsField(
+        default_factory=ImportLoaderModel,
+        title="Load Shapes",
+    )
+    TrackPointsLoader: ImportLoaderModel = SettingsField(
+        default_factory=ImportLoaderModel,
+        title="Load Trackers",
+    )
 
 
 DEFAULT_SILHOUETTE_LOAD_SETTINGS = {
     "SourceLoader": {
         "set_session_frame_range_on_load": False,
         "set_session_frame_range_on_update": False,
-    }
+        "prepare_in_background": False,
+        "prefetch_to_local_cache": False,
+        "prefetch_cache_size_gb": 100,
+        "reuse_existing_sources": False,
+        "generate_proxies": False,
+        "proxy_scale": "half",
+        "proxy_max_workers": 2,
+    },
+    "ShapesLoader": {
+        "update_changed_objects_only": False,
+    },
+    "TrackPointsLoader": {
+        "update_changed_objects_only": False,
+    },
 }
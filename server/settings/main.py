@@ -8,6 +8,7 @@ from .imageio import ImageIOSettings, DEFAULT_IMAGEIO_SETTINGS
 from .templated_workfile_build import (
     TemplatedWorkfileBuildModel
 )
+from .create import CreatePluginsModel, DEFAULT_SILHOUETTE_CREATE_SETTINGS
 from .publish import PublishPluginsModel, DEFAULT_SILHOUETTE_PUBLISH_SETTINGS
 from .load import LoadPluginsModel, DEFAULT_SILHOUETTE_LOAD_SETTINGS
 
@@ -25,6 +26,10 @@ class SilhouetteSettings(BaseSettingsModel):
         default_factory=ImageIOSettings,
         title="Color Management (ImageIO)"
     )
+    create: CreatePluginsModel = SettingsField(
+        title="Create",
+        default_factory=CreatePluginsModel
+    )
     load: LoadPluginsModel = SettingsField(
         title="Load",
         default_factory=LoadPluginsModel
@@ -43,6 +48,7 @@ DEFAULT_VALUES = {
     "ayon_menu": DEFAULT_SILHOUETTE_AYON_MENU_SETTINGS,
     "session": DEFAULT_SILHOUETTE_SESSION_SETTINGS,
     "imageio": DEFAULT_IMAGEIO_SETTINGS,
+    "create": DEFAULT_SILHOUETTE_CREATE_SETTINGS,
     "load": DEFAULT_SILHOUETTE_LOAD_SETTINGS,
     "publish": DEFAULT_SILHOUETTE_PUBLISH_SETTINGS,
     "templated_workfile_build": {
@@ -21,6 +21,120 @@ class BasicEnabledStatesModel(BaseSettingsModel):
     )
 
 
+class CollectExportFingerprintModel(BaseSettingsModel):
+    enabled: bool = SettingsField(
+        False,
+        title="Reuse unchanged exports",
+        description=(
+            "Store a fingerprint of the exported shapes or trackers, their "
+            "keyframes and the export settings on the published version. "
+            "When it matches the last version's fingerprint, its files are "
+            "hardlinked instead of exporting again."
+        ),
+    )
+
+
+class SilhouetteExtractTrackModel(BasicEnabledStatesModel):
+    use_native_exporter: bool = SettingsField(
+        False,
+        title="Use native exporter",
+        description=(
+            "Sample the tracker keyframes for each frame and write the file "
+            "directly instead of using the IO module. This does not require "
+            "a selection or GUI."
+        ),
+    )
+    verify_native_exporter: bool = SettingsField(
+        False,
+        title="Verify native exporter",
+        description=(
+            "Also export with the IO module and compare it with the native "
+            "exporter's output. When they differ a warning is logged and the "
+            "IO module's output is published instead. This exports twice, "
+            "so only enable it to check the native exporter, e.g. after "
+            "updating Silhouette."
+        ),
+    )
+
+
+class SilhouetteExtractRenderModel(BaseSettingsModel):
+    render_to_staging_dir: bool = SettingsField(
+        False,
+        title="Render into staging directory",
+        description=(
+            "Render directly into the publish staging directory instead of "
+            "the output node's path. Each frame is committed with an atomic "
+            "rename as soon as it is rendered. Configure the core custom "
+            "staging dir profiles to place the staging directory on the "
+            "same filesystem as the publish root so integration does not "
+            "transfer the frames across the network again."
+        ),
+    )
+    render_full_resolution_sources: bool = SettingsField(
+        True,
+        title="Render full resolution sources",
+        description=(
+            "Switch sources that use generated proxies back to their full "
+            "resolution media while rendering."
+        ),
+    )
+    verify_max_workers: int = SettingsField(
+        8,
+        ge=1,
+        title="Verification threads",
+        description=(
+            "Maximum number of threads used to verify the rendered frames."
+        ),
+    )
+    verify_checksums: bool = SettingsField(
+        True,
+        title="Compute checksums",
+        description=(
+            "Compute checksums of the rendered frames and store them in the "
+            "frame manifest so the frames can be verified after transfer."
+        ),
+    )
+    publish_frame_manifest: bool = SettingsField(
+        True,
+        title="Publish frame manifest",
+        description=(
+            "Publish the frame manifest as a JSON representation and verify "
+            "the published frames against it after integration."
+        ),
+    )
+    generate_review: bool = SettingsField(
+        False,
+        title="Generate H.264 review",
+        section="Review",
+        description=(
+            "Encode an H.264 review from the rendered frames with ffmpeg in "
+            "the background while the rendered frames are verified."
+        ),
+    )
+    generate_thumbnail: bool = SettingsField(
+        False,
+        title="Generate thumbnail",
+        description=(
+            "Write a downscaled JPEG thumbnail of the middle frame with "
+            "oiiotool in the background."
+        ),
+    )
+    thumbnail_height: int = SettingsField(
+        256,
+        ge=16,
+        title="Thumbnail height",
+    )
+    review_max_workers: int = SettingsField(
+        2,
+        ge=1,
+        title="Review processes",
+        description=(
+            "Maximum number of review and thumbnail processes that run at "
+            "the same time."
+        ),
+    )
+
+
 class SilhouetteExtractWorkfileModel(BaseSettingsModel):
     add_project_sfx: bool = SettingsField(
         False,
@@ -33,6 +147,12 @@ class SilhouetteExtractWorkfileModel(BaseSettingsModel):
 
 
 class PublishPluginsModel(BaseSettingsModel):
+    CollectExportFingerprint: CollectExportFingerprintModel = SettingsField(
+        default_factory=CollectExportFingerprintModel,
+        title="Collect Export Fingerprint",
+        section="Collectors",
+    )
+
     # Shapes
     ExtractNukeShapes: BasicEnabledStatesModel = SettingsField(
         default_factory=BasicEnabledStatesModel,
@@ -57,18 +177,25 @@ class PublishPluginsModel(BaseSettingsModel):
     )
 
     # Trackers
-    SilhouetteExtractAfterEffectsTrack: BasicEnabledStatesModel = (
+    SilhouetteExtractAfterEffectsTrack: SilhouetteExtractTrackModel = (
         SettingsField(
-            default_factory=BasicEnabledStatesModel,
+            default_factory=SilhouetteExtractTrackModel,
             title="Extract After Effects .txt Trackers",
             section="Extract Trackers",
         )
     )
-    SilhouetteExtractNuke5Track: BasicEnabledStatesModel = SettingsField(
-        default_factory=BasicEnabledStatesModel,
+    SilhouetteExtractNuke5Track: SilhouetteExtractTrackModel = SettingsField(
+        default_factory=SilhouetteExtractTrackModel,
         title="Extract Nuke 5 .nk Trackers",
     )
 
+    # Render
+    SilhouetteExtractRender: SilhouetteExtractRenderModel = SettingsField(
+        default_factory=SilhouetteExtractRenderModel,
+        title="Extract Render",
+        section="Extract Render",
+    )
+
     # Workfile
     SilhouetteExtractWorkfile: SilhouetteExtractWorkfileModel = SettingsField(
         default_factory=SilhouetteExtractWorkfileModel,
@@ -78,6 +205,9 @@ class PublishPluginsModel(BaseSettingsModel):
 
 
 DEFAULT_SILHOUETTE_PUBLISH_SETTINGS = {
+    "CollectExportFingerprint": {
+        "enabled": False,
+    },
     "ExtractNukeShapes": {
         "enabled": True,
         "optional": False,
@@ -107,11 +237,26 @@ DEFAULT_SILHOUETTE_PUBLISH_SETTINGS = {
         "enabled": True,
         "optional": False,
         "active": True,
+        "use_native_exporter": False,
+        "verify_native_exporter": False,
     },
     "SilhouetteExtractNuke5Track": {
         "enabled": True,
         "optional": False,
         "active": True,
+        "use_native_exporter": False,
+        "verify_native_exporter": False,
+    },
+    "SilhouetteExtractRender": {
+        "render_to_staging_dir": False,
+        "render_full_resolution_sources": True,
+        "verify_max_workers": 8,
+        "verify_checksums": True,
+        "publish_frame_manifest": True,
+        "generate_review": False,
+        "generate_thumbnail": False,
+        "thumbnail_height": 256,
+        "review_max_workers": 2,
     },
     "SilhouetteExtractWorkfile": {
         "add_project_sfx": False,
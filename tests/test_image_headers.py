@@ -0,0 +1,299 @@
+"""Tests for the minimal image header readers.
+
+The module is loaded directly from its file, since it does not depend on
+Silhouette or AYON unlike the `ayon_silhouette` package itself.
+"""
+import importlib.util
+import os
+import struct
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+API_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "client", "ayon_silhouette", "api"
+)
+MODULE_PATH = os.path.join(API_DIR, "image_headers.py")
+_spec = importlib.util.spec_from_file_location("image_headers", MODULE_PATH)
+image_headers = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(image_headers)
+
+
+def _load_media():
+    """Return the `media` module with a minimal `ayon_core` module.
+
+    The module is loaded as part of a package of the `api` folder for its
+    relative imports, which only depend on the standard library.
+    """
+    package = types.ModuleType("_media_api")
+    package.__path__ = [API_DIR]
+    transcoding = types.ModuleType("ayon_core.lib.transcoding")
+    transcoding.get_oiio_info_for_input = None
+    modules = {
+        "_media_api": package,
+        "ayon_core": types.ModuleType("ayon_core"),
+        "ayon_core.lib": types.ModuleType("ayon_core.lib"),
+        "ayon_core.lib.transcoding": transcoding,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location(
+            "_media_api.media", os.path.join(API_DIR, "media.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+media = _load_media()
+
+
+def _exr_attribute(name: str, attr_type: str, value: bytes) -> bytes:
+    return (
+        name.encode() + b"\x00"
+        + attr_type.encode() + b"\x00"
+        + struct.pack("<i", len(value))
+        + value
+    )
+
+
+def _exr_chlist(channels) -> bytes:
+    value = b""
+    for channel in channels:
+        # Name, pixel type, pLinear + reserved, x and y sampling
+        value += channel.encode() + b"\x00"
+        value += struct.pack("<iBBBBii", 1, 0, 0, 0, 0, 1, 1)
+    return value + b"\x00"
+
+
+def build_exr(
+    width: int = 4,
+    height: int = 3,
+    channels=("B", "G", "R"),
+    truncate: int = 0,
+    zero_offset: bool = False
+) -> bytes:
+    """Return an uncompressed single part scanline EXR."""
+    data_window = struct.pack("<4i", 0, 0, width - 1, height - 1)
+    header = (
+        image_headers.EXR_MAGIC
+        + struct.pack("<i", 2)
+        + _exr_attribute("channels", "chlist", _exr_chlist(channels))
+        + _exr_attribute("compression", "compression", b"\x00")
+        + _exr_attribute("dataWindow", "box2i", data_window)
+        + _exr_attribute("displayWindow", "box2i", data_window)
+        + _exr_attribute("lineOrder", "lineOrder", b"\x00")
+        + b"\x00"
+    )
+
+    # One scanline per chunk without compression, 2 bytes per half pixel
+    line_size = width * len(channels) * 2
+    chunk_size = 8 + line_size
+    first_offset = len(header) + 8 * height
+    offsets = [first_offset + y * chunk_size for y in range(height)]
+    if zero_offset:
+        offsets[-1] = 0
+    chunks = b"".join(
+        struct.pack("<ii", y, line_size) + b"\x00" * line_size
+        for y in range(height)
+    )
+    data = header + struct.pack(f"<{height}Q", *offsets) + chunks
+    return data[:len(data) - truncate]
+
+
+def build_multipart_exr(
+    parts,
+    width: int = 4,
+    height: int = 3,
+    truncate: int = 0
+) -> bytes:
+    """Return an uncompressed multipart scanline EXR.
+
+    Arguments:
+        parts: The `name` and optional `view` attribute of each part.
+
+    """
+    data_window = struct.pack("<4i", 0, 0, width - 1, height - 1)
+    channels = ("B", "G", "R")
+    headers = b""
+    for name, view in parts:
+        headers += (
+            _exr_attribute("channels", "chlist", _exr_chlist(channels))
+            + _exr_attribute("chunkCount", "int", struct.pack("<i", height))
+            + _exr_attribute("compression", "compression", b"\x00")
+            + _exr_attribute("dataWindow", "box2i", data_window)
+            + _exr_attribute("displayWindow", "box2i", data_window)
+            + _exr_attribute("lineOrder", "lineOrder", b"\x00")
+            + _exr_attribute("name", "string", name.encode())
+            + _exr_attribute("type", "string", b"scanlineimage")
+        )
+        if view is not None:
+            headers += _exr_attribute("view", "string", view.encode())
+        headers += b"\x00"
+    # An empty header marks the end of the part headers
+    header = (
+        image_headers.EXR_MAGIC
+        + struct.pack("<i", 2 | image_headers.EXR_FLAG_MULTIPART)
+        + headers
+        + b"\x00"
+    )
+
+    # Multipart chunks start with their part number
+    line_size = width * len(channels) * 2
+    chunk_size = 12 + line_size
+    chunk_count = len(parts) * height
+    first_offset = len(header) + 8 * chunk_count
+    offsets = [first_offset + i * chunk_size for i in range(chunk_count)]
+    chunks = b"".join(
+        struct.pack("<iii", part, y, line_size) + b"\x00" * line_size
+        for part in range(len(parts))
+        for y in range(height)
+    )
+    data = (
+        header + struct.pack(f"<{chunk_count}Q", *offsets) + chunks
+    )
+    return data[:len(data) - truncate]
+
+
+def build_dpx(
+    width: int = 4,
+    height: int = 3,
+    big_endian: bool = True,
+    truncate: int = 0
+) -> bytes:
+    """Return a DPX file with a 10-bit RGB image."""
+    endian = ">" if big_endian else "<"
+    magic = (
+        image_headers.DPX_MAGIC_BIG_ENDIAN if big_endian
+        else image_headers.DPX_MAGIC_LITTLE_ENDIAN
+    )
+    image_offset = 2048
+    image_size = width * height * 4
+    total_size = image_offset + image_size
+
+    header = bytearray(image_offset)
+    header[:4] = magic
+    struct.pack_into(f"{endian}I", header, 4, image_offset)
+    struct.pack_into(f"{endian}I", header, 16, total_size)
+    struct.pack_into(f"{endian}II", header, 772, width, height)
+    data = bytes(header) + b"\x00" * image_size
+    return data[:len(data) - truncate]
+
+
+def write(tmp_path, filename: str, data: bytes) -> str:
+    path = tmp_path / filename
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_read_exr_header(tmp_path):
+    path = write(tmp_path, "image.exr", build_exr(width=4, height=3))
+    header = image_headers.read_image_header(path)
+    assert header["format"] == "exr"
+    assert header["dataWindow"] == [0, 0, 3, 2]
+    assert header["multipart"] is False
+    assert header["parts"][0]["channels"] == ["B", "G", "R"]
+    assert header["parts"][0]["compression"] == 0
+
+
+def test_read_exr_header_truncated(tmp_path):
+    path = write(tmp_path, "image.exr", build_exr(truncate=4))
+    with pytest.raises(image_headers.ImageHeaderError):
+        image_headers.read_image_header(path)
+
+    # The header itself is still readable without the completeness check
+    header = image_headers.read_image_header(path, check_complete=False)
+    assert header["dataWindow"] == [0, 0, 3, 2]
+
+
+def test_read_exr_header_incomplete_offsets(tmp_path):
+    path = write(tmp_path, "image.exr", build_exr(zero_offset=True))
+    with pytest.raises(image_headers.ImageHeaderError):
+        image_headers.read_image_header(path)
+
+
+def test_read_exr_header_invalid_magic(tmp_path):
+    path = write(tmp_path, "image.exr", b"\x00" * 64)
+    with pytest.raises(image_headers.ImageHeaderError):
+        image_headers.read_image_header(path)
+
+
+def test_read_multipart_exr_header(tmp_path):
+    path = write(tmp_path, "image.exr", build_multipart_exr(
+        [("beauty", None), ("left", "left"), ("right", "right")]))
+    header = image_headers.read_image_header(path)
+    assert header["multipart"] is True
+    assert header["dataWindow"] == [0, 0, 3, 2]
+    assert [part["name"] for part in header["parts"]] == [
+        "beauty", "left", "right"]
+    assert [part.get("view") for part in header["parts"]] == [
+        None, "left", "right"]
+    assert header["parts"][1]["channels"] == ["B", "G", "R"]
+
+
+def test_read_multipart_exr_header_truncated(tmp_path):
+    path = write(tmp_path, "image.exr", build_multipart_exr(
+        [("beauty", None), ("depth", None)], truncate=4))
+    with pytest.raises(image_headers.ImageHeaderError):
+        image_headers.read_image_header(path)
+
+    header = image_headers.read_image_header(path, check_complete=False)
+    assert [part["name"] for part in header["parts"]] == ["beauty", "depth"]
+
+
+def test_probe_part_names_exr(tmp_path, monkeypatch):
+    path = write(tmp_path, "image.exr", build_multipart_exr(
+        [("beauty", None), ("left", "left")]))
+    monkeypatch.setattr(media, "probe_part_names_oiio", mock.Mock())
+    assert media.probe_part_names(path) == ["beauty", "left"]
+    media.probe_part_names_oiio.assert_not_called()
+
+
+def test_probe_part_names_single_part_exr(tmp_path, monkeypatch):
+    path = write(tmp_path, "image.exr", build_exr())
+    monkeypatch.setattr(media, "probe_part_names_oiio", mock.Mock())
+    assert media.probe_part_names(path) == [""]
+    media.probe_part_names_oiio.assert_not_called()
+
+
+@pytest.mark.parametrize("filename, data", [
+    ("image.exr", b"\x00" * 64),
+    ("image.exr", build_multipart_exr([("beauty", None)])[:24]),
+    ("image.tif", b"II*\x00"),
+])
+def test_probe_part_names_falls_back_to_oiio(
+    tmp_path, monkeypatch, filename, data
+):
+    path = write(tmp_path, filename, data)
+    probe_oiio = mock.Mock(return_value=["from_oiio"])
+    monkeypatch.setattr(media, "probe_part_names_oiio", probe_oiio)
+    assert media.probe_part_names(path) == ["from_oiio"]
+    probe_oiio.assert_called_once_with(path)
+
+
+@pytest.mark.parametrize("big_endian", [True, False])
+def test_read_dpx_header(tmp_path, big_endian):
+    path = write(
+        tmp_path, "image.dpx",
+        build_dpx(width=4, height=3, big_endian=big_endian))
+    header = image_headers.read_image_header(path)
+    assert header == {"format": "dpx", "dataWindow": [0, 0, 3, 2]}
+
+
+def test_read_dpx_header_truncated(tmp_path):
+    path = write(tmp_path, "image.dpx", build_dpx(truncate=10))
+    with pytest.raises(image_headers.ImageHeaderError):
+        image_headers.read_image_header(path)
+
+
+def test_read_dpx_header_short(tmp_path):
+    path = write(tmp_path, "image.dpx", build_dpx()[:100])
+    with pytest.raises(image_headers.ImageHeaderError):
+        image_headers.read_image_header(path)
+
+
+def test_read_image_header_unsupported(tmp_path):
+    path = write(tmp_path, "image.tif", b"II*\x00")
+    assert image_headers.read_image_header(path) is None
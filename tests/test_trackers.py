@@ -0,0 +1,139 @@
+"""Tests for the native tracker exporters.
+
+The module is loaded directly from its file with a minimal `fx` module,
+which is only available inside Silhouette. The positions are evaluated by
+the fake properties, so the tests cover which frames are sampled and the
+layout of the written files, see the fixtures in `fixtures/trackers`.
+"""
+import collections
+import importlib.util
+import os
+import types
+from unittest import mock
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures", "trackers")
+MODULE_PATH = os.path.join(
+    os.path.dirname(TESTS_DIR),
+    "client", "ayon_silhouette", "api", "trackers.py"
+)
+
+_fx = types.ModuleType("fx")
+_fx.Tracker = object
+_fx.Session = object
+_spec = importlib.util.spec_from_file_location("trackers", MODULE_PATH)
+trackers = importlib.util.module_from_spec(_spec)
+with mock.patch.dict("sys.modules", {"fx": _fx}):
+    _spec.loader.exec_module(trackers)
+
+Point = collections.namedtuple("Point", ["x", "y"])
+
+
+class FakeProperty:
+    """Position property evaluating a function of the frame."""
+
+    def __init__(self, evaluate=None, value=None):
+        self.constant = evaluate is None
+        self.value = value
+        self._evaluate = evaluate
+        self.sampled = []
+
+    def getValue(self, frame):
+        self.sampled.append(frame)
+        return self._evaluate(frame)
+
+
+class FakeTracker:
+    def __init__(self, label, position):
+        self.label = label
+        self._position = position
+
+    def property(self, name):
+        assert name == "position"
+        return self._position
+
+
+class FakeSession:
+    startFrame = 1001
+    workRange = (0, 3)
+    frameRate = 24.0
+    width = 1920
+    height = 1080
+    pixelAspect = 1.0
+
+
+def make_trackers():
+    return [
+        FakeTracker("Track1", FakeProperty(
+            lambda frame: Point(100.0 + frame * 1.5, 200.0 - frame * 0.25))),
+        FakeTracker("Track2", FakeProperty(value=Point(960.0, 540.0))),
+    ]
+
+
+def read_fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+def read_file(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_sample_tracker_evaluates_each_frame():
+    position = FakeProperty(lambda frame: Point(frame * 2.0, -frame))
+    xs, ys = trackers.sample_tracker(FakeTracker("A", position), [0, 1, 5])
+    assert position.sampled == [0, 1, 5]
+    assert xs == [0.0, 2.0, 10.0]
+    assert ys == [0, -1, -5]
+
+
+def test_sample_tracker_constant():
+    position = FakeProperty(value=Point(3.0, 4.0))
+    xs, ys = trackers.sample_tracker(FakeTracker("A", position), [0, 1])
+    assert xs == [3.0, 3.0]
+    assert ys == [4.0, 4.0]
+
+
+def test_frames_default_to_work_range():
+    frames, sample_frames = trackers._get_frames(FakeSession())
+    assert frames == [1001, 1002, 1003, 1004]
+    assert sample_frames == [0, 1, 2, 3]
+
+
+def test_write_after_effects(tmp_path):
+    path = str(tmp_path / "track.txt")
+    trackers.write_after_effects(path, make_trackers(), FakeSession())
+    assert read_file(path) == read_fixture("after_effects.txt")
+
+
+@pytest.mark.parametrize("merge_up_to_four, fixture", [
+    (True, "nuke5_merged.nk"),
+    (False, "nuke5.nk"),
+])
+def test_write_nuke5(tmp_path, merge_up_to_four, fixture):
+    path = str(tmp_path / "track.nk")
+    trackers.write_nuke5(
+        path, make_trackers(), FakeSession(),
+        merge_up_to_four=merge_up_to_four)
+    assert read_file(path) == read_fixture(fixture)
+
+
+def test_compare_tracker_files(tmp_path):
+    golden_path = os.path.join(FIXTURES_DIR, "after_effects.txt")
+    path = tmp_path / "track.txt"
+
+    # Differences in number formatting are ignored
+    path.write_text(
+        read_fixture("after_effects.txt").replace("101.5", "101.50001"),
+        encoding="utf-8")
+    assert trackers.compare_tracker_files(str(path), golden_path) == []
+
+    path.write_text(
+        read_fixture("after_effects.txt").replace("101.5", "102.5"),
+        encoding="utf-8")
+    differences = trackers.compare_tracker_files(str(path), golden_path)
+    assert len(differences) == 1
+    assert "102.5" in differences[0]